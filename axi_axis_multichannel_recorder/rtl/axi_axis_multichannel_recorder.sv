@@ -0,0 +1,231 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+module axi_axis_multichannel_recorder #
+(
+    // Width of data bus in bits
+    parameter AXI_DATA_WIDTH = 32,
+    // Width of the whole address map, one bank per channel
+    parameter AXI_ADDR_WIDTH = 14,
+    parameter DATA_WIDTH = 24,
+    parameter CHANNELS = 2,
+    parameter OPT_TSTRB = 0,
+    parameter OPT_TRIGGER = 1,
+    parameter OPT_COALESCE = 0,
+    parameter IRQ_COUNT_WIDTH = 8,
+    parameter IRQ_TIMEOUT_WIDTH = 16,
+
+    // Address bits selecting a bank, and word address bits within a bank
+    parameter BANK_WIDTH = $clog2(CHANNELS),
+    parameter BANK_ADDR_WIDTH = AXI_ADDR_WIDTH - 2 - BANK_WIDTH
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    input  wire                             enable,
+	input  wire 						    trigger,
+	output wire 						    interrupt,
+
+    input  wire [BANK_ADDR_WIDTH-1:0]       post_trigger,
+    output wire [BANK_ADDR_WIDTH-1:0]       wrap_index,
+    output wire                             captured,
+
+    input  wire [IRQ_COUNT_WIDTH-1:0]       irq_threshold,
+    input  wire [IRQ_TIMEOUT_WIDTH-1:0]     irq_timeout,
+    input  wire                             irq_ack,
+    output wire [IRQ_COUNT_WIDTH-1:0]       irq_pending,
+
+    /*
+     * AXI4-Lite Slave Interface
+     */
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_araddr,
+    input  wire [2:0]                       s_axil_arprot,
+    input  wire                             s_axil_arvalid,
+    output wire                             s_axil_arready,
+
+    output wire [AXI_DATA_WIDTH-1:0]        s_axil_rdata,
+    output wire [1:0]                       s_axil_rresp,
+    output wire                             s_axil_rvalid,
+    input  wire                             s_axil_rready,
+
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_awaddr,
+    input  wire [2:0]                       s_axil_awprot,
+    input  wire                             s_axil_awvalid,
+    output wire                             s_axil_awready,
+
+    input  wire [AXI_DATA_WIDTH-1:0]        s_axil_wdata,
+    input  wire [AXI_DATA_WIDTH/8-1:0]      s_axil_wstrb,
+    input  wire                             s_axil_wvalid,
+    output wire                             s_axil_wready,
+
+    output wire [1:0]                       s_axil_bresp,
+    output wire                             s_axil_bvalid,
+    input  wire                             s_axil_bready,
+
+    /*
+     * AXI4-Stream Slave Interfaces, channel i in bits [i*DATA_WIDTH +: DATA_WIDTH]
+     */
+    input  wire [CHANNELS*DATA_WIDTH-1:0]   s_axis_tdata,
+	input  wire [CHANNELS*DATA_WIDTH/8-1:0] s_axis_tstrb,
+    input  wire [CHANNELS-1:0]              s_axis_tvalid,
+    input  wire [CHANNELS-1:0]              s_axis_tlast,
+    output wire [CHANNELS-1:0]              s_axis_tready
+);
+
+// Channel i is recorded in bank i, at byte addresses
+// [i*2**(BANK_ADDR_WIDTH+2), (i+1)*2**(BANK_ADDR_WIDTH+2)); banks beyond
+// CHANNELS read as zero.
+//
+// The channels are written by a single axis_bram_writer, CHANNELS*DATA_WIDTH
+// bits wide: a sample is only accepted once every channel has one, so sample
+// n of every channel lands at the same address of its bank and the trigger,
+// TLAST (taken from channel 0) and the capture state are common to all.
+
+localparam STRB_WIDTH = DATA_WIDTH/8;
+
+wire [DATA_WIDTH-1:0]                   bram_ina;
+wire [DATA_WIDTH-1:0]                   bram_outa;
+wire [AXI_ADDR_WIDTH-2-1:0]             bram_addra;
+wire [(DATA_WIDTH+7)/8-1:0]             bram_wea;
+wire                                    bram_ena;
+wire                                    bram_clka;
+
+wire [CHANNELS*DATA_WIDTH-1:0]          bram_inb;
+wire [BANK_ADDR_WIDTH-1:0]              bram_addrb;
+wire [CHANNELS*STRB_WIDTH-1:0]          bram_web;
+wire                                    bram_enb;
+wire                                    bram_clkb;
+
+wire [BANK_WIDTH-1:0]                   bank;
+reg  [BANK_WIDTH-1:0]                   read_bank = 0;
+wire [CHANNELS*DATA_WIDTH-1:0]          bank_outa;
+
+wire                                    writer_tvalid;
+wire                                    writer_tready;
+
+
+assign writer_tvalid = &s_axis_tvalid;
+assign s_axis_tready = {CHANNELS{writer_tvalid && writer_tready}};
+
+assign bank = bram_addra[AXI_ADDR_WIDTH-2-1 -: BANK_WIDTH];
+
+// the bank of the last read, which the BRAM outputs hold
+always_ff @(posedge aclk)
+    if (bram_ena)
+        read_bank <= bank;
+
+assign bram_outa = (read_bank < CHANNELS) ? bank_outa[read_bank*DATA_WIDTH +: DATA_WIDTH] : 0;
+
+
+axi_bram_interface
+#(
+    .AXI_DATA_WIDTH(AXI_DATA_WIDTH),
+    .AXI_ADDR_WIDTH(AXI_ADDR_WIDTH),
+    .BRAM_DATA_WIDTH(DATA_WIDTH)
+) axi_interface (
+    .aclk(aclk), 
+    .aresetn(aresetn), 
+
+    .s_axil_araddr(s_axil_araddr),
+    .s_axil_arprot(s_axil_arprot),
+    .s_axil_arvalid(s_axil_arvalid),
+    .s_axil_arready(s_axil_arready),
+
+    .s_axil_rdata(s_axil_rdata),
+    .s_axil_rresp(s_axil_rresp),
+    .s_axil_rvalid(s_axil_rvalid),
+    .s_axil_rready(s_axil_rready),
+
+    .s_axil_awaddr(s_axil_awaddr),
+    .s_axil_awprot(s_axil_awprot),
+    .s_axil_awvalid(s_axil_awvalid),
+    .s_axil_awready(s_axil_awready),
+
+    .s_axil_wdata(s_axil_wdata),
+    .s_axil_wstrb(s_axil_wstrb),
+    .s_axil_wvalid(s_axil_wvalid),
+    .s_axil_wready(s_axil_wready),
+
+    .s_axil_bresp(s_axil_bresp),
+    .s_axil_bvalid(s_axil_bvalid),
+    .s_axil_bready(s_axil_bready),
+
+    .bram_rddata(bram_outa),
+    .bram_wrdata(bram_ina),
+    .bram_addr(bram_addra),
+    .bram_we(bram_wea),
+    .bram_en(bram_ena),
+    .bram_clk(bram_clka)
+);
+
+axis_bram_writer
+#(
+    .DATA_WIDTH(CHANNELS*DATA_WIDTH),
+    .ADDR_WIDTH(BANK_ADDR_WIDTH),
+    .OPT_TSTRB(OPT_TSTRB),
+    .OPT_TRIGGER(OPT_TRIGGER),
+    .OPT_COALESCE(OPT_COALESCE),
+    .IRQ_COUNT_WIDTH(IRQ_COUNT_WIDTH),
+    .IRQ_TIMEOUT_WIDTH(IRQ_TIMEOUT_WIDTH)
+) bram_writer (
+    .aclk(aclk), 
+    .aresetn(enable & aresetn), 
+
+    .trigger(trigger),
+    .interrupt(interrupt),
+
+    .post_trigger(post_trigger),
+    .wrap_index(wrap_index),
+    .captured(captured),
+
+    .irq_threshold(irq_threshold),
+    .irq_timeout(irq_timeout),
+    .irq_ack(irq_ack),
+    .irq_pending(irq_pending),
+
+    .s_axis_tdata(s_axis_tdata),
+    .s_axis_tstrb(s_axis_tstrb),
+    .s_axis_tvalid(writer_tvalid),
+    .s_axis_tlast(s_axis_tlast[0]),
+    .s_axis_tready(writer_tready),
+
+    .bram_wrdata(bram_inb),
+    .bram_addr(bram_addrb),
+    .bram_we(bram_web),
+    .bram_en(bram_enb),
+    .bram_clk(bram_clkb)
+);
+
+genvar ii;
+generate for (ii = 0; ii < CHANNELS; ii = ii + 1) begin : banks
+    wire select;
+
+    assign select = (bank == ii);
+
+    bram
+    #(
+        .DATA_WIDTH(DATA_WIDTH),
+        .ADDR_WIDTH(BANK_ADDR_WIDTH)
+    ) memory (
+        .clka(bram_clka),
+        .rsta(1'b0),
+        .ina(bram_ina),
+        .outa(bank_outa[ii*DATA_WIDTH +: DATA_WIDTH]),
+        .addra(bram_addra[BANK_ADDR_WIDTH-1:0]),
+        .wea(select ? bram_wea : {STRB_WIDTH{1'b0}}),
+        .ena(bram_ena && select),
+
+        .clkb(bram_clkb),
+        .rstb(1'b0),
+        .inb(bram_inb[ii*DATA_WIDTH +: DATA_WIDTH]),
+        .addrb(bram_addrb),
+        .web(bram_web[ii*STRB_WIDTH +: STRB_WIDTH]),
+        .enb(bram_enb)
+    );
+end endgenerate
+
+endmodule
+
+`default_nettype wire
@@ -0,0 +1,257 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+
+from cocotbext.axi import AxiLiteBus, AxiLiteMaster
+
+from testbench import TestFactory, PackedStreamSource, parameter
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.channels = dut.CHANNELS.value
+        self.bank_size = 2**dut.BANK_ADDR_WIDTH.value
+
+        self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
+        self.source = PackedStreamSource(dut, "s_axis", dut.aclk, self.channels, dut.DATA_WIDTH.value)
+
+        dut.s_axis_tstrb.setimmediatevalue(0)
+
+        dut.enable <= 0
+        dut.trigger <= 0
+        dut.post_trigger <= 0
+
+        dut.irq_threshold <= 0
+        dut.irq_timeout <= 0
+        dut.irq_ack <= 0
+
+    def set_idle_generator(self, generator=None):
+        # every channel idles independently
+        if generator:
+            for ii in range(self.channels):
+                self.source.set_pause_generator(ii, generator())
+
+    def set_backpressure_generator(self, generator=None):
+        if generator:
+            self.axil_master.read_if.r_channel.set_pause_generator(generator())
+
+    def send(self, frames):
+        for ii, frame in enumerate(frames):
+            self.source.send(ii, frame)
+
+    async def read_bank(self, bank):
+        # banks are 2**BANK_ADDR_WIDTH words apart in the address map
+        recorded = []
+        for addr in range(self.bank_size):
+            response = await self.axil_master.read((bank * self.bank_size + addr) * 4, 4)
+            recorded.append(int.from_bytes(response.data, 'little', signed=False))
+        return recorded
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+
+def block_data_channels(channels, length, nbits=16):
+    # the channel number in the top bits, the sample index below
+    index = np.arange(length) % 2**(nbits - 4)
+    return [(ii << (nbits - 4)) | index for ii in range(channels)]
+
+def block_data_random(channels, length, nbits=16):
+    global rng
+    return list(rng.integers(low = 0, high = 2**nbits, size = (channels, length)))
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+
+async def run_test(dut, data_generator=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    data_generator = data_generator or block_data_channels
+
+    dut._log.info(f"param AXI_ADDR_WIDTH = {dut.AXI_ADDR_WIDTH.value}")
+    dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param CHANNELS = {dut.CHANNELS.value}")
+    dut._log.info(f"param OPT_TRIGGER = {dut.OPT_TRIGGER.value}")
+
+    data_width = dut.DATA_WIDTH.value
+    frame_length = tb.bank_size
+
+    await tb.reset()
+
+    dut.enable <= 1
+
+    # the trigger arrives while the channels are at different samples of the
+    # first frame, the next frame of every channel is captured
+    tb.send(data_generator(tb.channels, frame_length, data_width))
+
+    for _ in range(20):
+        await RisingEdge(dut.aclk)
+
+    dut.trigger <= 1
+
+    await tb.source.wait()
+
+    frames = data_generator(tb.channels, frame_length, data_width)
+    tb.send(frames)
+    await tb.source.wait()
+
+    tb.send(data_generator(tb.channels, frame_length, data_width))
+    await tb.source.wait()
+
+    await RisingEdge(dut.aclk)
+    await RisingEdge(dut.aclk)
+
+    for bank in range(tb.channels):
+        assert await tb.read_bank(bank) == list(map(int, frames[bank]))
+
+    # the unused banks of the address map read as zero
+    for bank in range(tb.channels, 2**dut.BANK_WIDTH.value):
+        assert await tb.read_bank(bank) == [0] * tb.bank_size
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+async def run_test_pretrigger(dut, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    data_width = dut.DATA_WIDTH.value
+    bank_size = tb.bank_size
+    post_trigger = bank_size // 2
+    trigger_at = bank_size + bank_size // 3
+
+    stream_data = block_data_channels(tb.channels, 3 * bank_size, data_width)
+
+    dut.post_trigger <= post_trigger
+    await tb.reset()
+
+    dut.enable <= 1
+
+    # samples are accepted on all channels together
+    async def trigger_monitor():
+        accepted = 0
+        while True:
+            await RisingEdge(dut.aclk)
+            if dut.s_axis_tready.value.integer == 2**tb.channels - 1:
+                if dut.trigger.value:
+                    return accepted
+                accepted += 1
+
+            if accepted >= trigger_at:
+                dut.trigger <= 1
+
+    monitor_task = cocotb.fork(trigger_monitor())
+
+    for nn in range(3):
+        tb.send([data[nn*bank_size:(nn+1)*bank_size] for data in stream_data])
+    await tb.source.wait()
+
+    trigger_index = await monitor_task
+    dut.trigger <= 0
+
+    await RisingEdge(dut.aclk)
+    await RisingEdge(dut.aclk)
+
+    last_index = trigger_index + post_trigger
+    wrap_index = int(dut.wrap_index.value)
+
+    assert dut.captured.value
+    assert wrap_index == (last_index + 1) % bank_size
+
+    # one wrap index holds for every bank
+    for bank in range(tb.channels):
+        recorded = await tb.read_bank(bank)
+        window = recorded[wrap_index:] + recorded[:wrap_index]
+        assert window == list(map(int, stream_data[bank][last_index-bank_size+1:last_index+1]))
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+if cocotb.SIM_NAME:
+    # the frame and pre-trigger tests apply to OPT_TRIGGER = 1 and 2 builds
+    if parameter("OPT_TRIGGER") == 1:
+        factory = TestFactory(run_test)
+        factory.add_option("data_generator", [block_data_channels, block_data_random])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+    elif parameter("OPT_TRIGGER") == 2:
+        factory = TestFactory(run_test_pretrigger)
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("data_width", [24, 16])
+@pytest.mark.parametrize("channels", [2, 3, 4])
+@pytest.mark.parametrize("opt_trigger", [1, 2])
+def test_axi_axis_multichannel_recorder(request, data_width, channels, opt_trigger):
+    dut = "axi_axis_multichannel_recorder"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv"),
+        os.path.join(root_dir, "bram", "rtl", "bram.sv"),
+        os.path.join(root_dir, "axi_bram_interface", "rtl", "axi_bram_interface.sv"),
+        os.path.join(root_dir, "axis_bram_writer", "rtl", "axis_bram_writer_trigger.sv")
+    ]
+
+    parameters = dict()
+    parameters["AXI_ADDR_WIDTH"] = 12
+    parameters["DATA_WIDTH"] = data_width
+    parameters["CHANNELS"] = channels
+    parameters["OPT_TRIGGER"] = opt_trigger
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
@@ -9,7 +9,10 @@ module axi_axis_recorder #
     parameter AXI_ADDR_WIDTH = 14,
     parameter DATA_WIDTH = 24,
     parameter OPT_TSTRB = 0,
-    parameter OPT_TRIGGER = 1
+    parameter OPT_TRIGGER = 1,
+    parameter OPT_COALESCE = 0,
+    parameter IRQ_COUNT_WIDTH = 8,
+    parameter IRQ_TIMEOUT_WIDTH = 16
 )
 (
     input  wire                             aclk,
@@ -19,6 +22,15 @@ module axi_axis_recorder #
 	input  wire 						    trigger,
 	output wire 						    interrupt,
 
+    input  wire [AXI_ADDR_WIDTH-2-1:0]      post_trigger,
+    output wire [AXI_ADDR_WIDTH-2-1:0]      wrap_index,
+    output wire                             captured,
+
+    input  wire [IRQ_COUNT_WIDTH-1:0]       irq_threshold,
+    input  wire [IRQ_TIMEOUT_WIDTH-1:0]     irq_timeout,
+    input  wire                             irq_ack,
+    output wire [IRQ_COUNT_WIDTH-1:0]       irq_pending,
+
     /*
      * AXI4-Lite Slave Interface
      */
@@ -116,7 +128,10 @@ axis_bram_writer
     .DATA_WIDTH(DATA_WIDTH),
     .ADDR_WIDTH(AXI_ADDR_WIDTH-2),
     .OPT_TSTRB(OPT_TSTRB),
-    .OPT_TRIGGER(OPT_TRIGGER)
+    .OPT_TRIGGER(OPT_TRIGGER),
+    .OPT_COALESCE(OPT_COALESCE),
+    .IRQ_COUNT_WIDTH(IRQ_COUNT_WIDTH),
+    .IRQ_TIMEOUT_WIDTH(IRQ_TIMEOUT_WIDTH)
 ) bram_writer (
     .aclk(aclk), 
     .aresetn(enable & aresetn), 
@@ -124,6 +139,15 @@ axis_bram_writer
     .trigger(trigger),
     .interrupt(interrupt),
 
+    .post_trigger(post_trigger),
+    .wrap_index(wrap_index),
+    .captured(captured),
+
+    .irq_threshold(irq_threshold),
+    .irq_timeout(irq_timeout),
+    .irq_ack(irq_ack),
+    .irq_pending(irq_pending),
+
     .s_axis_tdata(s_axis_tdata),
     .s_axis_tstrb(s_axis_tstrb),
     .s_axis_tvalid(s_axis_tvalid),
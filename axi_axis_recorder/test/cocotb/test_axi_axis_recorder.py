@@ -1,11 +1,12 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout, Timer
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiStreamFrame, AxiLiteBus, AxiLiteMaster, AxiStreamSource, AxiStreamBus
 from cocotbext.bram import BRAMInterface, SinglePortBRAM
 
+from testbench import TestFactory, StreamCoverage, parameter
+
 import cocotb_test.simulator
 import pytest
 
@@ -25,8 +26,15 @@ class TB:
         self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
         self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
 
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+
         dut.enable <= 0
         dut.trigger <= 0
+        dut.post_trigger <= 0
+
+        dut.irq_threshold <= 0
+        dut.irq_timeout <= 0
+        dut.irq_ack <= 0
 
     def set_idle_generator(self, generator=None):
         if generator:
@@ -72,7 +80,6 @@ def random_pause(f = 0.5):
         yield int(rng.uniform() >= f)
 
 
-@cocotb.test()
 async def run_test(dut, data_generator=None, idle_generator=None, backpressure_generator=None):
     global rng
 
@@ -85,6 +92,7 @@ async def run_test(dut, data_generator=None, idle_generator=None, backpressure_g
     dut._log.info(f"param AXI_DATA_WIDTH = {dut.AXI_DATA_WIDTH.value}")
     dut._log.info(f"param AXI_ADDR_WIDTH = {dut.AXI_ADDR_WIDTH.value}")
     dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param OPT_TRIGGER = {dut.OPT_TRIGGER.value}")
 
     data_width = dut.DATA_WIDTH.value
     frame_length = 2**(dut.AXI_ADDR_WIDTH.value-2)
@@ -126,12 +134,87 @@ async def run_test(dut, data_generator=None, idle_generator=None, backpressure_g
 
 
 
+async def run_test_pretrigger(dut, position="middle", data_generator=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    data_generator = data_generator or block_data_linear
+
+    dut._log.info(f"param OPT_TRIGGER = {dut.OPT_TRIGGER.value}")
+
+    data_width = dut.DATA_WIDTH.value
+    bram_size = 2**(dut.AXI_ADDR_WIDTH.value-2)
+    post_trigger = {"start": bram_size - 1, "middle": bram_size // 2, "end": 0}[position]
+    trigger_at = bram_size + bram_size // 3
+
+    stream_data = list(map(int, data_generator(3 * bram_size, data_width)))
+
+    dut.post_trigger <= post_trigger
+    await tb.reset()
+
+    dut.enable <= 1
+
+    async def trigger_monitor():
+        accepted = 0
+        while True:
+            await RisingEdge(dut.aclk)
+            if dut.s_axis_tvalid.value and dut.s_axis_tready.value:
+                if dut.trigger.value:
+                    return accepted
+                accepted += 1
+
+            if accepted >= trigger_at:
+                dut.trigger <= 1
+
+    monitor_task = cocotb.fork(trigger_monitor())
+
+    for nn in range(3):
+        await tb.source.send(AxiStreamFrame(stream_data[nn*bram_size:(nn+1)*bram_size]))
+    await tb.source.wait()
+
+    trigger_index = await monitor_task
+    dut.trigger <= 0
+
+    await RisingEdge(dut.aclk)
+    await RisingEdge(dut.aclk)
+
+    last_index = trigger_index + post_trigger
+    wrap_index = int(dut.wrap_index.value)
+
+    dut._log.info(f"trigger sample {trigger_index}, wrap index {wrap_index}")
+
+    assert dut.captured.value
+    assert wrap_index == (last_index + 1) % bram_size
+
+    recorded = []
+    for addr in range(bram_size):
+        response = await tb.axil_master.read(addr*4, 4)
+        recorded.append(int.from_bytes(response.data, 'little', signed=False))
+
+    window = recorded[wrap_index:] + recorded[:wrap_index]
+
+    assert window == stream_data[last_index-bram_size+1:last_index+1]
+    assert window[bram_size-1-post_trigger] == stream_data[trigger_index]
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
 if cocotb.SIM_NAME:
-    factory = TestFactory(run_test)
-    factory.add_option("data_generator", [block_data_linear, block_data_random])
-    factory.add_option("idle_generator", [None, cycle_pause, random_pause])
-    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
-    factory.generate_tests()
+    # the frame and pre-trigger tests apply to OPT_TRIGGER = 1 and 2 builds
+    if parameter("OPT_TRIGGER") == 1:
+        factory = TestFactory(run_test)
+        factory.add_option("data_generator", [block_data_linear, block_data_random])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+    elif parameter("OPT_TRIGGER") == 2:
+        factory = TestFactory(run_test_pretrigger)
+        factory.add_option("position", ["start", "middle", "end"])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
 
 
 rng = np.random.default_rng(12345)
@@ -144,7 +227,8 @@ root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 @pytest.mark.parametrize("axi_addr_width", [12, 8])
 @pytest.mark.parametrize("data_width", [24, 16])
-def test_axis_bram_interface(request, axi_addr_width, data_width):
+@pytest.mark.parametrize("opt_trigger", [1, 2])
+def test_axi_axis_recorder(request, axi_addr_width, data_width, opt_trigger):
     dut = "axi_axis_recorder"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -159,6 +243,7 @@ def test_axis_bram_interface(request, axi_addr_width, data_width):
     parameters = dict()
     parameters["AXI_ADDR_WIDTH"] = axi_addr_width
     parameters["DATA_WIDTH"] = data_width
+    parameters["OPT_TRIGGER"] = opt_trigger
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -166,7 +251,7 @@ def test_axis_bram_interface(request, axi_addr_width, data_width):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
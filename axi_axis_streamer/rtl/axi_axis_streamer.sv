@@ -7,7 +7,14 @@ module axi_axis_streamer #
     // Width of data bus in bits
     parameter AXI_DATA_WIDTH = 32,
     parameter AXI_ADDR_WIDTH = 14,
-    parameter DATA_WIDTH = 24
+    parameter DATA_WIDTH = 24,
+    // Read latency of the BRAM in cycles
+    parameter READ_LATENCY = 1,
+    // Play the segments of a descriptor table in the upper half of the
+    // address map instead of frames of frame_length samples
+    parameter OPT_SEQUENCER = 0,
+    // 2**DESCRIPTOR_WIDTH descriptors in the table
+    parameter DESCRIPTOR_WIDTH = 4
 )
 (
     input  wire                             aclk,
@@ -53,6 +60,9 @@ module axi_axis_streamer #
 );
 
 
+// word address bits of the samples, half of the map with OPT_SEQUENCER
+localparam SAMPLE_ADDR_WIDTH = AXI_ADDR_WIDTH - 2 - (OPT_SEQUENCER ? 1 : 0);
+
 wire [DATA_WIDTH-1:0]           bram_ina;
 wire [DATA_WIDTH-1:0]           bram_outa;
 wire [AXI_ADDR_WIDTH-2-1:0]     bram_addra;
@@ -62,19 +72,142 @@ wire                            bram_clka;
 
 wire [DATA_WIDTH-1:0]           bram_inb;
 wire [DATA_WIDTH-1:0]           bram_outb;
-wire [AXI_ADDR_WIDTH-2-1:0]     bram_addrb;
+wire [SAMPLE_ADDR_WIDTH-1:0]    bram_addrb;
 wire [(DATA_WIDTH+7)/8-1:0]     bram_web;
 wire                            bram_enb;
 wire                            bram_clkb;
 
+wire [DATA_WIDTH-1:0]           sample_outa;
+reg  [(DATA_WIDTH+7)/8-1:0]     sample_wea;
+
+reg  [SAMPLE_ADDR_WIDTH-1:0]    seq_addr_next;
+reg                             seq_addr_last;
+wire                            seq_addr_issue;
+
 
 assign bram_inb = {DATA_WIDTH{1'b0}};
 
+
+generate if (OPT_SEQUENCER) begin: SEQUENCER
+
+    localparam DESCRIPTORS = 2**DESCRIPTOR_WIDTH;
+
+    // Descriptor i is the words 4*i to 4*i+3 of the table: the start address
+    // of its segment, the length in samples (0 for the whole memory), the
+    // number of repeats after the first play and the index of the next
+    // descriptor. DATA_WIDTH has to hold a sample address.
+    reg  [DATA_WIDTH-1:0]           table_words [4*DESCRIPTORS-1:0];
+    wire                            table_select;
+    wire [DESCRIPTOR_WIDTH+2-1:0]   table_addr;
+    reg  [READ_LATENCY-1:0]         table_read = 0;
+    reg  [DATA_WIDTH-1:0]           table_rddata [READ_LATENCY-1:0];
+
+    wire                            running;
+    wire [DESCRIPTOR_WIDTH-1:0]     load;
+    wire                            end_of_play;
+    wire                            end_of_segment;
+
+    // the descriptor played, and the position in its segment
+    reg  [SAMPLE_ADDR_WIDTH-1:0]    start = 0;
+    reg  [SAMPLE_ADDR_WIDTH-1:0]    final_offset = 0;
+    reg  [DATA_WIDTH-1:0]           repeats = 0;
+    reg  [DESCRIPTOR_WIDTH-1:0]     next = 0;
+    reg  [SAMPLE_ADDR_WIDTH-1:0]    offset = 0;
+    reg  [DATA_WIDTH-1:0]           plays = 0;
+
+    initial begin
+        for (int kk = 0; kk < 4*DESCRIPTORS; kk++)
+            table_words[kk] = {DATA_WIDTH{1'b0}};
+
+        for (int kk = 0; kk < READ_LATENCY; kk++)
+            table_rddata[kk] = {DATA_WIDTH{1'b0}};
+    end
+
+    assign table_select = bram_addra[AXI_ADDR_WIDTH-2-1];
+    assign table_addr = bram_addra[DESCRIPTOR_WIDTH+2-1:0];
+
+    always_ff @(posedge aclk)
+        if (bram_ena && table_select)
+            for (int kk = 0; kk < DATA_WIDTH; kk++)
+                if (bram_wea[kk/8])
+                    table_words[table_addr][kk] <= bram_ina[kk];
+
+    // table reads with the latency of the BRAM, whose output they replace
+    always_ff @(posedge aclk) begin
+        if (bram_ena) begin
+            table_read[0] <= table_select;
+            table_rddata[0] <= table_words[table_addr];
+        end
+
+        for (int kk = 1; kk < READ_LATENCY; kk++) begin
+            table_read[kk] <= table_read[kk-1];
+            table_rddata[kk] <= table_rddata[kk-1];
+        end
+    end
+
+    assign bram_outa = table_read[READ_LATENCY-1] ? table_rddata[READ_LATENCY-1] : sample_outa;
+
+    always_comb
+        sample_wea = table_select ? 0 : bram_wea;
+
+    // The table is read combinationally, so the first address of the next
+    // segment is ready in the cycle the last one of the current is issued
+    // and segments follow each other without bubbles. While disabled the
+    // sequencer holds descriptor 0.
+    assign running = enable && aresetn;
+    assign load = running ? next : 0;
+    assign end_of_play = (offset == final_offset);
+    assign end_of_segment = end_of_play && (plays == repeats);
+
+    always_comb
+        if (!running || end_of_segment)
+            seq_addr_next = table_words[4*load][SAMPLE_ADDR_WIDTH-1:0];
+        else if (end_of_play)
+            seq_addr_next = start;
+        else
+            seq_addr_next = bram_addrb + 1;
+
+    always_comb
+        seq_addr_last = end_of_play;
+
+    always_ff @(posedge aclk)
+        if (!running || (seq_addr_issue && end_of_segment)) begin
+            start <= table_words[4*load][SAMPLE_ADDR_WIDTH-1:0];
+            final_offset <= table_words[4*load+1][SAMPLE_ADDR_WIDTH-1:0] - 1;
+            repeats <= table_words[4*load+2];
+            next <= table_words[4*load+3][DESCRIPTOR_WIDTH-1:0];
+            offset <= 0;
+            plays <= 0;
+        end else if (seq_addr_issue) begin
+            if (end_of_play) begin
+                offset <= 0;
+                plays <= plays + 1;
+            end else begin
+                offset <= offset + 1;
+            end
+        end
+
+end else begin: NO_SEQUENCER
+
+    assign bram_outa = sample_outa;
+
+    always_comb
+        sample_wea = bram_wea;
+
+    always_comb
+        seq_addr_next = {SAMPLE_ADDR_WIDTH{1'b0}};
+
+    always_comb
+        seq_addr_last = 1'b0;
+
+end endgenerate
+
 axi_bram_interface
 #(
     .AXI_DATA_WIDTH(AXI_DATA_WIDTH),
     .AXI_ADDR_WIDTH(AXI_ADDR_WIDTH),
-    .BRAM_DATA_WIDTH(DATA_WIDTH)
+    .BRAM_DATA_WIDTH(DATA_WIDTH),
+    .READ_LATENCY(READ_LATENCY)
 ) axi_interface (
     .aclk(aclk), 
     .aresetn(aresetn), 
@@ -114,12 +247,18 @@ axi_bram_interface
 axis_bram_reader
 #(
     .DATA_WIDTH(DATA_WIDTH),
-    .ADDR_WIDTH(AXI_ADDR_WIDTH-2)
+    .ADDR_WIDTH(SAMPLE_ADDR_WIDTH),
+    .READ_LATENCY(READ_LATENCY),
+    .OPT_EXTERNAL_ADDRESS(OPT_SEQUENCER)
 ) bram_reader (
     .aclk(aclk), 
     .aresetn(enable & aresetn), 
 
-    .limit(frame_length),
+    .limit(frame_length[SAMPLE_ADDR_WIDTH-1:0]),
+
+    .addr_next(seq_addr_next),
+    .addr_last(seq_addr_last),
+    .addr_issue(seq_addr_issue),
 
     .m_axis_tdata(m_axis_tdata),
     .m_axis_tvalid(m_axis_tvalid),
@@ -136,14 +275,15 @@ axis_bram_reader
 bram
 #(
     .DATA_WIDTH(DATA_WIDTH),
-    .ADDR_WIDTH(AXI_ADDR_WIDTH-2)
+    .ADDR_WIDTH(SAMPLE_ADDR_WIDTH),
+    .READ_LATENCY(READ_LATENCY)
 ) bram_inst (
     .clka(bram_clka),
     .rsta(1'b0),
     .ina(bram_ina),
-    .outa(bram_outa),
-    .addra(bram_addra),
-    .wea(bram_wea),
+    .outa(sample_outa),
+    .addra(bram_addra[SAMPLE_ADDR_WIDTH-1:0]),
+    .wea(sample_wea),
     .ena(bram_ena),
 
     .clkb(bram_clkb),
@@ -1,11 +1,12 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout, Timer
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiLiteBus, AxiLiteMaster, AxiStreamSink, AxiStreamBus
 from cocotbext.bram import BRAMInterface, SinglePortBRAM
 
+from testbench import TestFactory, StreamCoverage, Throughput, parameter
+
 import cocotb_test.simulator
 import pytest
 
@@ -25,6 +26,9 @@ class TB:
         self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
         self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
 
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+        self.m_axis_throughput = Throughput(dut, "m_axis", dut.aclk)
+
         dut.enable <= 0
         dut.frame_length <= 0
 
@@ -63,6 +67,36 @@ def block_data_random(frame_length, nbits=16):
     high = 2**(nbits)
     return rng.integers(low = low, high = high, size = frame_length)
 
+def random_descriptors(count, memory_size, max_length=40, max_repeats=2):
+    """Descriptors (start, length, repeats, next) of random segments, each
+    followed by the next one and the last looping back to descriptor 1.
+    Descriptor 0 plays a single sample and descriptor 1 wraps around the end
+    of the memory."""
+    global rng
+    descriptors = []
+    for index in range(count):
+        start = int(rng.integers(memory_size))
+        length = int(rng.integers(1, max_length + 1))
+        repeats = int(rng.integers(max_repeats + 1))
+        descriptors.append([start, length, repeats, index + 1])
+
+    descriptors[0][1] = 1
+    descriptors[1][0] = memory_size - 3
+    descriptors[1][1] = max(descriptors[1][1], 7)
+    descriptors[-1][3] = 1
+    return [tuple(descriptor) for descriptor in descriptors]
+
+def sequence_frames(descriptors, bram_data):
+    """Frames played by the sequencer, one per play of a segment."""
+    memory_size = len(bram_data)
+    index = 0
+    while True:
+        start, length, repeats, next_index = descriptors[index]
+        frame = bram_data[(start + np.arange(length or memory_size)) % memory_size]
+        for _ in range(repeats + 1):
+            yield frame
+        index = next_index
+
 def cycle_pause():
     return itertools.cycle([1, 1, 1, 0])
 
@@ -72,7 +106,6 @@ def random_pause(f = 0.5):
         yield int(rng.uniform() >= f)
 
 
-@cocotb.test()
 async def run_test(dut, data_generator=None, idle_generator=None, backpressure_generator=None):
     global rng
 
@@ -85,6 +118,7 @@ async def run_test(dut, data_generator=None, idle_generator=None, backpressure_g
     dut._log.info(f"param AXI_DATA_WIDTH = {dut.AXI_DATA_WIDTH.value}")
     dut._log.info(f"param AXI_ADDR_WIDTH = {dut.AXI_ADDR_WIDTH.value}")
     dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param OPT_SEQUENCER = {dut.OPT_SEQUENCER.value}")
 
     data_width = dut.DATA_WIDTH.value
     bram_size = 2**(dut.AXI_ADDR_WIDTH.value-2)
@@ -111,13 +145,72 @@ async def run_test(dut, data_generator=None, idle_generator=None, backpressure_g
         await RisingEdge(dut.aclk)
 
 
+async def run_test_sequencer(dut, idle_generator=None, backpressure_generator=None):
+    global rng
+
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    dut._log.info(f"param OPT_SEQUENCER = {dut.OPT_SEQUENCER.value}")
+    dut._log.info(f"param DESCRIPTOR_WIDTH = {dut.DESCRIPTOR_WIDTH.value}")
+
+    data_width = dut.DATA_WIDTH.value
+    # samples in the lower half of the address map, descriptors in the upper
+    memory_size = 2**(dut.AXI_ADDR_WIDTH.value-3)
+    table_offset = 2**(dut.AXI_ADDR_WIDTH.value-1)
+    bram_data = block_data_random(memory_size, data_width)
+    descriptors = random_descriptors(min(6, 2**dut.DESCRIPTOR_WIDTH.value), memory_size)
+
+    await tb.reset()
+
+    for addr in range(memory_size):
+        await tb.axil_master.write(addr*4, struct.pack("<I", bram_data[addr]))
+
+    for index, descriptor in enumerate(descriptors):
+        for word, value in enumerate(descriptor):
+            await tb.axil_master.write(table_offset + (4*index + word)*4, struct.pack("<I", value))
+
+    for index, descriptor in enumerate(descriptors):
+        for word, value in enumerate(descriptor):
+            response = await tb.axil_master.read(table_offset + (4*index + word)*4, 4)
+            assert int.from_bytes(response.data, 'little', signed=False) == value
+
+    dut.enable <= 1
+    await RisingEdge(dut.aclk)
+
+    # twice around the loop of descriptors
+    frames = sequence_frames(descriptors, bram_data)
+    count = sum(repeats + 1 for _, _, repeats, _ in descriptors)
+    count += sum(repeats + 1 for _, _, repeats, _ in descriptors[1:])
+
+    for _ in range(count):
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 100, "us")
+        assert np.all(recv_frame.tdata == next(frames))
+
+    # segments follow each other without bubbles
+    if backpressure_generator is None:
+        assert tb.m_axis_throughput.beats_per_clock == 1.0
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
 
 if cocotb.SIM_NAME:
-    factory = TestFactory(run_test)
-    factory.add_option("data_generator", [block_data_linear, block_data_random])
-    factory.add_option("idle_generator", [None, cycle_pause, random_pause])
-    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
-    factory.generate_tests()
+    # the single buffer and sequencer tests apply to builds without and
+    # with OPT_SEQUENCER
+    if not parameter("OPT_SEQUENCER"):
+        factory = TestFactory(run_test)
+        factory.add_option("data_generator", [block_data_linear, block_data_random])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+    else:
+        factory = TestFactory(run_test_sequencer)
+        factory.add_option("idle_generator", [None, cycle_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
 
 
 rng = np.random.default_rng(12345)
@@ -128,9 +221,11 @@ rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
 root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 
+@pytest.mark.parametrize("read_latency", [1, 2])
 @pytest.mark.parametrize("axi_addr_width", [12, 10])
 @pytest.mark.parametrize("data_width", [16, 24])
-def test_axi_axis_streamer(request, axi_addr_width, data_width):
+@pytest.mark.parametrize("opt_sequencer", [False, True])
+def test_axi_axis_streamer(request, axi_addr_width, data_width, read_latency, opt_sequencer):
     dut = "axi_axis_streamer"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -145,6 +240,8 @@ def test_axi_axis_streamer(request, axi_addr_width, data_width):
     parameters = dict()
     parameters["AXI_ADDR_WIDTH"] = axi_addr_width
     parameters["DATA_WIDTH"] = data_width
+    parameters["READ_LATENCY"] = read_latency
+    parameters["OPT_SEQUENCER"] = int(opt_sequencer)
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -152,7 +249,7 @@ def test_axi_axis_streamer(request, axi_addr_width, data_width):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
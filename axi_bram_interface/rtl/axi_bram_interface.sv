@@ -7,7 +7,9 @@ module axi_bram_interface #
     // Width of data bus in bits
     parameter AXI_DATA_WIDTH = 32,
     parameter AXI_ADDR_WIDTH = 12,
-    parameter BRAM_DATA_WIDTH = 24
+    parameter BRAM_DATA_WIDTH = 24,
+    // Read latency of the BRAM in cycles
+    parameter READ_LATENCY = 1
 )
 (
     input  wire                             aclk,
@@ -52,7 +54,13 @@ module axi_bram_interface #
 );
 
 reg [AXI_DATA_WIDTH-1:0]        rdata_buf;
-reg                             rdata_buf_valid;
+reg                             rstall_prev = 1'b0;
+
+// the reads issued in the last READ_LATENCY cycles, and whether one of
+// them is waiting for its data
+reg [READ_LATENCY-1:0]          read_pipe = 0;
+wire [READ_LATENCY:0]           reads;
+reg                             read_pending = 1'b0;
 
 wire                            bstall;
 wire                            rstall;
@@ -67,21 +75,27 @@ wire [AXI_ADDR_WIDTH-2-1:0]     bram_rdaddr;
 assign bstall = s_axil_bvalid && !s_axil_bready;
 assign rstall = s_axil_rvalid && !s_axil_rready;
 
-assign read_eligible  = s_axil_arvalid & !s_axil_arready & !rstall;
+assign read_eligible  = s_axil_arvalid & !s_axil_arready & !rstall & !read_pending;
 assign write_eligible = s_axil_awvalid & !s_axil_awready & s_axil_wvalid & !s_axil_wready & !bstall;
 
+assign reads = {read_pipe, read_eligible};
+
 assign bram_wraddr = s_axil_awaddr[AXI_ADDR_WIDTH-1:2];
 assign bram_rdaddr = s_axil_araddr[AXI_ADDR_WIDTH-1:2];
 
 always_ff @(posedge aclk) begin
     s_axil_arready <= aresetn & read_eligible;
-    s_axil_rvalid <= aresetn & (read_eligible | rstall);
+    s_axil_rvalid <= aresetn & (reads[READ_LATENCY-1] | rstall);
+    read_pipe <= aresetn ? reads[READ_LATENCY-1:0] : 0;
+    read_pending <= aresetn & (read_pending | read_eligible) & !reads[READ_LATENCY-1];
 
     s_axil_awready <= aresetn & write_eligible & !read_eligible;
     s_axil_wready <= aresetn & write_eligible & !read_eligible;
     s_axil_bvalid <= aresetn & ((write_eligible & !read_eligible) | bstall);
 
-    if (!rstall)
+    // the read data is only on the BRAM output in the first cycle of RVALID
+    rstall_prev <= rstall;
+    if (!rstall_prev)
         rdata_buf <= bram_rddata;
 end
 
@@ -98,7 +112,7 @@ always_comb begin
         bram_we = 0;
     end
 
-    if (!rstall)
+    if (!rstall_prev)
         s_axil_rdata = bram_rddata;
     else
         s_axil_rdata = rdata_buf;
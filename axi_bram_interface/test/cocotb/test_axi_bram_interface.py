@@ -1,10 +1,10 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout, Timer
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiLiteBus, AxiLiteMaster
-from cocotbext.bram import BRAMInterface, SinglePortBRAM
+
+from testbench import TestFactory, PipelinedBRAM, Throughput
 
 import cocotb_test.simulator
 import pytest
@@ -23,7 +23,8 @@ class TB:
         cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
 
         self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
-        self.bram = SinglePortBRAM(BRAMInterface(dut))
+        self.bram = PipelinedBRAM(dut, dut.aclk, latency=dut.READ_LATENCY.value)
+        self.ar_throughput = Throughput(dut, "s_axil", dut.aclk, valid="arvalid", ready="arready")
 
     def set_idle_generator(self, generator=None):
         if generator:
@@ -79,6 +80,7 @@ async def run_test_read(dut, n_reads = 200, data_generator=None, idle_generator=
     
     dut._log.info(f"param AXI_DATA_WIDTH = {dut.AXI_DATA_WIDTH.value}")
     dut._log.info(f"param AXI_ADDR_WIDTH = {dut.AXI_ADDR_WIDTH.value}")
+    dut._log.info(f"param READ_LATENCY = {dut.READ_LATENCY.value}")
 
     bram_size = 2**(dut.AXI_ADDR_WIDTH.value-2)
     bram_data = data_generator(bram_size)
@@ -92,6 +94,11 @@ async def run_test_read(dut, n_reads = 200, data_generator=None, idle_generator=
         response = await tb.axil_master.read(addr*4, 4)
         assert int.from_bytes(response.data, 'little', signed=False) == bram_data[addr]
 
+    # a read address is accepted in the cycle after ARVALID, whatever the
+    # read latency
+    if idle_generator is None and backpressure_generator is None:
+        assert tb.ar_throughput.valid_cycles == 2 * n_reads
+
     for _ in range(100):
         await RisingEdge(dut.aclk)
 
@@ -192,8 +199,9 @@ rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
 root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 
+@pytest.mark.parametrize("read_latency", [1, 2])
 @pytest.mark.parametrize("axi_addr_width", [12, 16])
-def test_axis_bram_interface(request, axi_addr_width):
+def test_axis_bram_interface(request, axi_addr_width, read_latency):
     dut = "axi_bram_interface"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -204,6 +212,7 @@ def test_axis_bram_interface(request, axi_addr_width):
 
     parameters = dict()
     parameters["AXI_ADDR_WIDTH"] = axi_addr_width
+    parameters["READ_LATENCY"] = read_latency
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -211,7 +220,7 @@ def test_axis_bram_interface(request, axi_addr_width):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
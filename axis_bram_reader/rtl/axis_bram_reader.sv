@@ -6,7 +6,11 @@ module axis_bram_reader #
 (
     // Width of data bus in bits
     parameter DATA_WIDTH = 16,
-	parameter ADDR_WIDTH = 12
+	parameter ADDR_WIDTH = 12,
+    // Read latency of the BRAM in cycles
+    parameter READ_LATENCY = 1,
+    // Addresses given by an external sequencer instead of 0 to limit-1
+    parameter OPT_EXTERNAL_ADDRESS = 0
 )
 (
     input  wire                         aclk,
@@ -14,6 +18,16 @@ module axis_bram_reader #
 
     input  wire [ADDR_WIDTH-1:0]        limit,
 
+    /*
+     * External address sequence (OPT_EXTERNAL_ADDRESS)
+     */
+    // address read after bram_addr, or the first address during reset
+    input  wire [ADDR_WIDTH-1:0]        addr_next,
+    // bram_addr is the last address of a packet
+    input  wire                         addr_last,
+    // bram_addr is read, and the sequence advances to addr_next
+    output wire                         addr_issue,
+
     /*
      * AXI-Stream master interface
      */
@@ -33,41 +47,56 @@ module axis_bram_reader #
 );
 
 
-    wire m_axis_valid;
+    localparam COUNT_WIDTH = $clog2(READ_LATENCY+1);
+
+    wire issue;
     wire last;
-    wire stall;
+    wire pop;
+    wire arrived;
+    wire bypass;
 
 
 	reg  [ADDR_WIDTH-1:0] bram_addr_next = 0;
     reg  [ADDR_WIDTH-1:0] internal_limit = 0;
-    reg  [DATA_WIDTH-1:0] rddata_buf = 0;
-    reg  tvalid_next = 1'b0;
-    reg  stall_prev = 1'b0;
 
-	assign m_axis_valid = m_axis_tvalid && m_axis_tready;
-    assign last = aresetn && (bram_addr == internal_limit);
-    assign stall = m_axis_tvalid && !m_axis_tready;
-	
+    reg  [READ_LATENCY-1:0] valid_pipe = 0;
+    reg  [READ_LATENCY-1:0] last_pipe = 0;
+    // beats read but not output yet, in flight or buffered
+    reg  [COUNT_WIDTH-1:0] outstanding = 0;
+
+    // the beats arriving while the output is stalled, at most READ_LATENCY
+    reg  [DATA_WIDTH-1:0] rddata_buf [READ_LATENCY-1:0];
+    reg  [READ_LATENCY-1:0] last_buf = 0;
+    reg  [COUNT_WIDTH-1:0] buf_count = 0;
+    reg  [COUNT_WIDTH-1:0] rd_ptr = 0;
+    reg  [COUNT_WIDTH-1:0] wr_ptr = 0;
+
+    assign pop = m_axis_tvalid && m_axis_tready;
+    assign issue = aresetn && (outstanding < READ_LATENCY + pop);
+    assign last = aresetn && (OPT_EXTERNAL_ADDRESS ? addr_last : bram_addr == internal_limit);
+    assign addr_issue = issue;
+    assign arrived = valid_pipe[READ_LATENCY-1];
+    assign bypass = (buf_count == 0);
+
+    integer i;
     initial begin
-        m_axis_tdata <= {DATA_WIDTH{1'b0}};
-        m_axis_tvalid <= 1'b0;
-        m_axis_tlast <= 1'b0;
-
         bram_addr <= {ADDR_WIDTH{1'b0}};
         bram_we <= 0;
         bram_en <= 1'b0;
         bram_clk <= 1'b0;
-    end
 
-    always_ff @(posedge aclk)
-        stall_prev <= stall;
+        for (i = 0; i < READ_LATENCY; i = i + 1)
+            rddata_buf[i] = {DATA_WIDTH{1'b0}};
+    end
 
     always_ff @(posedge aclk)
         if (bram_addr == 0)
             internal_limit <= limit - 1;
 
 	always_comb
-		if (!aresetn)
+		if (OPT_EXTERNAL_ADDRESS)
+			bram_addr_next = addr_next;
+		else if (!aresetn)
 			bram_addr_next = {ADDR_WIDTH{1'b0}};
 		else if (last)
 			bram_addr_next = {ADDR_WIDTH{1'b0}};
@@ -75,36 +104,54 @@ module axis_bram_reader #
 			bram_addr_next = bram_addr + 1;
 
 	always_ff @(posedge aclk)
-		if (!aresetn)
-			bram_addr <= {ADDR_WIDTH{1'b0}};
-		else if (!stall)
+		if (!aresetn || issue)
 			bram_addr <= bram_addr_next;
-    
+
+    // the read data of the address issued READ_LATENCY cycles ago
     always_ff @(posedge aclk)
-        if (!aresetn)
-            rddata_buf <= {DATA_WIDTH{1'b0}};
-        else if (!stall_prev)
-            rddata_buf <= bram_rddata;
+        if (!aresetn) begin
+            valid_pipe <= 0;
+            last_pipe <= 0;
+        end else begin
+            valid_pipe <= (valid_pipe << 1) | issue;
+            last_pipe <= (last_pipe << 1) | last;
+        end
 
-	always_comb
-		if (!aresetn)
-			m_axis_tdata = {DATA_WIDTH{1'b0}};
-		else if (stall_prev)
-			m_axis_tdata = rddata_buf;
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            outstanding <= 0;
         else
-            m_axis_tdata = bram_rddata;
+            outstanding <= outstanding + issue - pop;
 
-	always_ff @(posedge aclk)
-        m_axis_tvalid <= aresetn;
-
-	always_ff @(posedge aclk)
-        tvalid_next <= aresetn;
+    // arriving beats go straight to the output unless older beats wait
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            buf_count <= 0;
+            rd_ptr <= 0;
+            wr_ptr <= 0;
+        end else begin
+            if (arrived && !(bypass && m_axis_tready)) begin
+                rddata_buf[wr_ptr] <= bram_rddata;
+                last_buf[wr_ptr] <= last_pipe[READ_LATENCY-1];
+                wr_ptr <= (wr_ptr == READ_LATENCY - 1) ? 0 : wr_ptr + 1;
+            end
+
+            if (!bypass && m_axis_tready)
+                rd_ptr <= (rd_ptr == READ_LATENCY - 1) ? 0 : rd_ptr + 1;
+
+            buf_count <= buf_count + (arrived && !(bypass && m_axis_tready)) - (!bypass && m_axis_tready);
+        end
 
-	always_ff @(posedge aclk)
-        if (!aresetn)
-            m_axis_tlast <= 1'b0;
-        else if (!stall)
-            m_axis_tlast <= last;
+	always_comb
+		if (bypass) begin
+            m_axis_tdata = bram_rddata;
+            m_axis_tlast = last_pipe[READ_LATENCY-1];
+            m_axis_tvalid = arrived;
+        end else begin
+			m_axis_tdata = rddata_buf[rd_ptr];
+            m_axis_tlast = last_buf[rd_ptr];
+            m_axis_tvalid = 1'b1;
+        end
 
 	always_comb
         bram_we = 0;
@@ -1,10 +1,10 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
-from cocotbext.bram import BRAMInterface, SinglePortBRAM
+
+from testbench import TestFactory, StreamCoverage, StreamSoak, PipelinedBRAM, Throughput, repeat_frame
 
 import cocotb_test.simulator
 import pytest
@@ -16,13 +16,18 @@ import numpy as np
 
 
 class TB:
-    def __init__(self, dut):
+    def __init__(self, dut, drivers=True):
         self.dut = dut
 
         cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
 
-        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
-        self.bram = SinglePortBRAM(BRAMInterface(dut))
+        # soak runs drive the interfaces themselves
+        if drivers:
+            self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
+
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+        self.m_axis_throughput = Throughput(dut, "m_axis", dut.aclk)
+        self.bram = PipelinedBRAM(dut, dut.aclk, latency=dut.READ_LATENCY.value)
 
     def set_pause_generator(self, generator=None):
         if generator:
@@ -68,6 +73,7 @@ async def run_test(dut, nblocks=1, data_generator=None, pause_generator=None):
     
     dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
     dut._log.info(f"param ADDR_WIDTH = {dut.ADDR_WIDTH.value}")
+    dut._log.info(f"param READ_LATENCY = {dut.READ_LATENCY.value}")
 
     frame_length = 2**(dut.ADDR_WIDTH.value)
     frame_data = data_generator(frame_length)
@@ -83,10 +89,34 @@ async def run_test(dut, nblocks=1, data_generator=None, pause_generator=None):
         
         assert np.all(recv_frame.tdata == frame_data)
 
+    # one beat per clock whatever the read latency
+    if pause_generator is None:
+        assert tb.m_axis_throughput.beats_per_clock == 1.0
+
     for _ in range(100):
         await RisingEdge(dut.aclk)
 
 
+async def run_test_soak(dut, limit=0, data_generator=None, pause_generator=None):
+    tb = TB(dut, drivers=False)
+
+    data_generator = data_generator or (lambda x: np.full(x, 10))
+
+    # a limit of 0 reads the whole memory
+    frame_length = limit or 2**(dut.ADDR_WIDTH.value)
+    frame_data = data_generator(frame_length)
+    tb.bram.set_contents(dict(zip(range(frame_length), map(int, frame_data))))
+
+    dut.limit <= limit
+    await tb.reset()
+
+    # the reader loops over the memory, one frame per pass
+    soak = StreamSoak(dut, dut.aclk, source=None)
+    await soak.run(
+        expected=repeat_frame(frame_data % 2**dut.DATA_WIDTH.value),
+        backpressure_generator=pause_generator and pause_generator())
+
+
 if cocotb.SIM_NAME:
     factory = TestFactory(run_test)
     factory.add_option("nblocks", [1, 4])
@@ -94,6 +124,12 @@ if cocotb.SIM_NAME:
     factory.add_option("pause_generator", [None, cycle_pause, random_pause])
     factory.generate_tests()
 
+    factory = TestFactory(run_test_soak)
+    factory.add_option("limit", [0, 100])
+    factory.add_option("data_generator", [block_data_linear, block_data_random])
+    factory.add_option("pause_generator", [None, random_pause])
+    factory.generate_tests()
+
 rng = np.random.default_rng(12345)
 
 
@@ -102,9 +138,10 @@ rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
 root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 
+@pytest.mark.parametrize("read_latency", [1, 2])
 @pytest.mark.parametrize("data_width", [16, 32])
 @pytest.mark.parametrize("addr_width", [8, 12])
-def test_axis_bram_reader(request, data_width, addr_width):
+def test_axis_bram_reader(request, data_width, addr_width, read_latency):
     dut = "axis_bram_reader"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -116,6 +153,7 @@ def test_axis_bram_reader(request, data_width, addr_width):
     parameters = dict()
     parameters["DATA_WIDTH"] = data_width
     parameters["ADDR_WIDTH"] = addr_width
+    parameters["READ_LATENCY"] = read_latency
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -123,7 +161,7 @@ def test_axis_bram_reader(request, data_width, addr_width):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
@@ -8,7 +8,10 @@ module axis_bram_writer #
     parameter DATA_WIDTH = 16,
 	parameter ADDR_WIDTH = 12,
 	parameter OPT_TSTRB = 0,
-    parameter OPT_TRIGGER = 0
+    parameter OPT_TRIGGER = 0,
+    parameter OPT_COALESCE = 0,
+    parameter IRQ_COUNT_WIDTH = 8,
+    parameter IRQ_TIMEOUT_WIDTH = 16
 )
 (
     input  wire                         aclk,
@@ -17,6 +20,21 @@ module axis_bram_writer #
 	input  wire 						trigger,
 	output reg							interrupt,
 
+    /*
+     * Pre-trigger capture (OPT_TRIGGER == 2)
+     */
+    input  wire [ADDR_WIDTH-1:0]        post_trigger,
+    output wire [ADDR_WIDTH-1:0]        wrap_index,
+    output wire                         captured,
+
+    /*
+     * Interrupt coalescing (OPT_COALESCE == 1)
+     */
+    input  wire [IRQ_COUNT_WIDTH-1:0]   irq_threshold,
+    input  wire [IRQ_TIMEOUT_WIDTH-1:0] irq_timeout,
+    input  wire                         irq_ack,
+    output wire [IRQ_COUNT_WIDTH-1:0]   irq_pending,
+
     /*
      * AXI-Stream slave interface
      */
@@ -43,6 +61,7 @@ module axis_bram_writer #
 	reg  [ADDR_WIDTH-1:0] bram_addr_next;
 
 	wire active;
+	wire frame_done;
 
 	generate if (OPT_TSTRB == 1) begin
 		assign strb = {WSTRB_WIDTH{1'b0}};
@@ -64,7 +83,7 @@ module axis_bram_writer #
 	always_ff @(posedge aclk)
 		if (!aresetn)
 			bram_addr_next <= {ADDR_WIDTH{1'b0}};
-		else if (active && s_axis_valid && s_axis_tlast)
+		else if (active && s_axis_valid && s_axis_tlast && OPT_TRIGGER != 2)
 			bram_addr_next <= {ADDR_WIDTH{1'b0}};
 		else if (active && s_axis_valid)
 			bram_addr_next <= bram_addr_next + 1;
@@ -85,12 +104,126 @@ module axis_bram_writer #
 		end
 	end
 		
-	always_ff @(posedge aclk)
-        interrupt <= s_axis_valid & s_axis_tlast & aresetn;
+    generate if (OPT_COALESCE == 0) begin
+        always_ff @(posedge aclk)
+            interrupt <= frame_done & aresetn;
+
+        assign irq_pending = {IRQ_COUNT_WIDTH{1'b0}};
+    end else begin
+        // Frames are counted in `pending`; the interrupt is raised once
+        // `irq_threshold` frames are pending, or `irq_timeout` cycles after
+        // the oldest pending frame completed (0 disables the timeout).
+        // The interrupt is held until a rising edge on `irq_ack`, which
+        // also clears the pending count.
+        reg  [IRQ_COUNT_WIDTH-1:0]      pending;
+        reg  [IRQ_COUNT_WIDTH-1:0]      pending_next;
+        reg  [IRQ_TIMEOUT_WIDTH-1:0]    timer;
+        reg                             previous_ack;
+
+        wire pulse_ack;
+        wire threshold_hit;
+        wire timeout_hit;
+
+        assign pulse_ack = irq_ack & !previous_ack;
+
+        assign threshold_hit = (pending_next != 0) && (pending_next >= irq_threshold);
+        assign timeout_hit = (irq_timeout != 0) && (pending != 0) && (timer >= irq_timeout);
+
+        assign irq_pending = pending;
+
+        always_ff @(posedge aclk)
+            previous_ack <= irq_ack;
+
+        always_comb
+            if (pulse_ack)
+                pending_next = {{(IRQ_COUNT_WIDTH-1){1'b0}}, frame_done};
+            else if (frame_done && !(&pending))
+                pending_next = pending + 1;
+            else
+                pending_next = pending;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                pending <= {IRQ_COUNT_WIDTH{1'b0}};
+            else
+                pending <= pending_next;
+
+        always_ff @(posedge aclk)
+            if (!aresetn || pulse_ack || interrupt || pending == 0)
+                timer <= {IRQ_TIMEOUT_WIDTH{1'b0}};
+            else
+                timer <= timer + 1;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                interrupt <= 1'b0;
+            else if (pulse_ack)
+                interrupt <= 1'b0;
+            else if (threshold_hit || timeout_hit)
+                interrupt <= 1'b1;
+    end endgenerate
 
 
     generate if (OPT_TRIGGER == 0) begin
         assign active = 1'b1;
+        assign frame_done = s_axis_valid & s_axis_tlast;
+
+        assign wrap_index = {ADDR_WIDTH{1'b0}};
+        assign captured = 1'b0;
+    end else if (OPT_TRIGGER == 2) begin
+        // Circular pre-trigger capture: samples are written continuously,
+        // wrapping around the whole memory and ignoring TLAST. The first
+        // sample at or after a trigger pulse is the trigger sample; after
+        // `post_trigger` further samples writing stops until reset.
+        // `wrap_index` then points to the oldest sample in memory.
+        reg  previous_trigger;
+        wire pulse_trigger;
+        reg  internal_trigger;
+        reg  triggered;
+        reg  frozen;
+        reg  [ADDR_WIDTH-1:0] post_count;
+
+        wire trigger_sample;
+        wire last;
+
+        assign pulse_trigger = trigger & !previous_trigger;
+        assign trigger_sample = (internal_trigger | pulse_trigger) & !triggered;
+        assign last = triggered ? (post_count == post_trigger) : (trigger_sample && post_trigger == 0);
+
+        assign active = !frozen;
+        assign frame_done = active & s_axis_valid & last;
+
+        assign wrap_index = bram_addr_next;
+        assign captured = frozen;
+
+        always_ff @(posedge aclk)
+            previous_trigger <= trigger;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                internal_trigger <= 1'b0;
+            else if (trigger_sample && s_axis_valid)
+                internal_trigger <= 1'b0;
+            else if (pulse_trigger && !triggered)
+                internal_trigger <= 1'b1;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                triggered <= 1'b0;
+            else if (trigger_sample && s_axis_valid)
+                triggered <= 1'b1;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                post_count <= {ADDR_WIDTH{1'b0}};
+            else if (active && s_axis_valid && (triggered || trigger_sample))
+                post_count <= post_count + 1;
+
+        always_ff @(posedge aclk)
+            if (!aresetn)
+                frozen <= 1'b0;
+            else if (frame_done)
+                frozen <= 1'b1;
     end else begin
         reg  previous_trigger;
         wire pulse_trigger;
@@ -103,6 +236,10 @@ module axis_bram_writer #
         assign pulse_trigger = trigger & !previous_trigger;
         assign primed = (internal_trigger | pulse_trigger) & first_sample;
         assign active = primed | running;
+        assign frame_done = s_axis_valid & s_axis_tlast;
+
+        assign wrap_index = {ADDR_WIDTH{1'b0}};
+        assign captured = 1'b0;
 
         always_ff @(posedge aclk)
             previous_trigger <= trigger;
@@ -1,12 +1,13 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout
-from cocotb.regression import TestFactory
 from cocotb_bus.bus import Bus
 
 from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
 from cocotbext.bram import BRAMInterface, SinglePortBRAM
 
+from testbench import TestFactory, StreamCoverage
+
 import cocotb_test.simulator
 import pytest
 
@@ -23,8 +24,14 @@ class TB:
         cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
 
         self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
         self.bram = SinglePortBRAM(BRAMInterface(dut))
 
+        dut.irq_threshold <= 0
+        dut.irq_timeout <= 0
+        dut.irq_ack <= 0
+
     def set_idle_generator(self, generator=None):
         if generator:
             self.source.set_pause_generator(generator())
@@ -73,6 +80,94 @@ async def run_test(dut, nblocks=1, data_generator=None, idle_generator=None):
             await RisingEdge(dut.aclk)
 
 
+@cocotb.test()
+async def run_test_coalesce(dut, nframes=32, frame_length=16, threshold=4, timeout=64, arrival_generator=None):
+    tb = TB(dut)
+
+    arrival_generator = arrival_generator or (lambda: itertools.repeat(0))
+
+    dut._log.info(f"param OPT_COALESCE = {dut.OPT_COALESCE.value}")
+
+    opt_coalesce = dut.OPT_COALESCE.value
+
+    dut.irq_threshold <= threshold
+    dut.irq_timeout <= timeout
+
+    await tb.reset()
+
+    completions = []
+    irqs = []
+    done = False
+
+    async def monitor():
+        cycle = 0
+        reported = 0
+        ack = False
+
+        while not done:
+            await RisingEdge(dut.aclk)
+            cycle += 1
+
+            if dut.s_axis_tvalid.value and dut.s_axis_tready.value and dut.s_axis_tlast.value:
+                completions.append(cycle)
+
+            if not opt_coalesce:
+                if dut.interrupt.value:
+                    irqs.append((cycle, 1))
+                continue
+
+            if ack:
+                # irq_pending still holds the count cleared by this acknowledge
+                pending = int(dut.irq_pending.value)
+                assert pending == len(completions) - reported - (completions[-1] == cycle)
+
+                reported += pending
+                dut.irq_ack <= 0
+                ack = False
+            elif dut.interrupt.value:
+                unreported = [c for c in completions[reported:] if c < cycle]
+                assert unreported, "interrupt without pending frames"
+
+                latency = cycle - unreported[0]
+                assert len(unreported) >= threshold or latency > timeout
+                assert latency <= timeout + 2
+
+                irqs.append((cycle, len(unreported)))
+                dut.irq_ack <= 1
+                ack = True
+
+    monitor_task = cocotb.fork(monitor())
+
+    gaps = arrival_generator()
+    for nn in range(nframes):
+        frame_data = block_data_linear(frame_length)
+        await tb.source.send(AxiStreamFrame(list(map(int, frame_data))))
+        await tb.source.wait()
+
+        for _ in range(next(gaps)):
+            await RisingEdge(dut.aclk)
+
+    for _ in range(timeout + 100):
+        await RisingEdge(dut.aclk)
+
+    done = True
+    await monitor_task
+
+    dut._log.info(f"{len(completions)} frames, {len(irqs)} interrupts")
+
+    assert len(completions) == nframes
+
+    if not opt_coalesce:
+        assert len(irqs) == nframes
+        assert all(irq - frame == 1 for frame, (irq, _) in zip(completions, irqs))
+    elif arrival_generator is arrival_sparse:
+        delay = 1 if threshold <= 1 else timeout + 2
+        assert len(irqs) == nframes
+        assert all(irq - frame == delay for frame, (irq, _) in zip(completions, irqs))
+    else:
+        assert len(irqs) == nframes // threshold
+
+
 def block_data_linear(frame_length):
     return np.arange(frame_length)
 
@@ -90,6 +185,12 @@ def random_pause(f = 0.5):
     while True:
         yield int(rng.uniform() >= f)
 
+def arrival_bursty():
+    return itertools.cycle([0] * 7 + [400])
+
+def arrival_sparse():
+    return itertools.repeat(400)
+
 if cocotb.SIM_NAME:
     factory = TestFactory(run_test)
     factory.add_option("nblocks", [1, 4])
@@ -97,6 +198,12 @@ if cocotb.SIM_NAME:
     factory.add_option("idle_generator", [None, cycle_pause, random_pause])
     factory.generate_tests()
 
+    factory = TestFactory(run_test_coalesce)
+    factory.add_option("threshold", [1, 4])
+    factory.add_option("timeout", [64, 256])
+    factory.add_option("arrival_generator", [arrival_bursty, arrival_sparse])
+    factory.generate_tests()
+
 rng = np.random.default_rng(12345)
 
 
@@ -108,7 +215,8 @@ root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 @pytest.mark.parametrize("data_width", [16, 32])
 @pytest.mark.parametrize("addr_width", [8, 12])
 @pytest.mark.parametrize("opt_tstrb", [False, True])
-def test_axis_bram_writer(request, data_width, addr_width, opt_tstrb):
+@pytest.mark.parametrize("opt_coalesce", [False, True])
+def test_axis_bram_writer(request, data_width, addr_width, opt_tstrb, opt_coalesce):
     dut = "axis_bram_writer"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -121,6 +229,7 @@ def test_axis_bram_writer(request, data_width, addr_width, opt_tstrb):
     parameters["DATA_WIDTH"] = data_width
     parameters["ADDR_WIDTH"] = addr_width
     parameters["OPT_TSTRB"] = int(opt_tstrb)
+    parameters["OPT_COALESCE"] = int(opt_coalesce)
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -128,7 +237,7 @@ def test_axis_bram_writer(request, data_width, addr_width, opt_tstrb):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
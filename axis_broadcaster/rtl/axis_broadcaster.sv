@@ -0,0 +1,163 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+module axis_broadcaster #
+(
+    // Width of data bus in bits
+    parameter DATA_WIDTH = 16,
+    parameter OUTPUTS = 2,
+    // Slack per output, 2**ADDR_WIDTH beats, with OPT_DROP also the longest
+    // frame
+    parameter ADDR_WIDTH = 4,
+    // Drop the frames for an output whose FIFO fills up instead of stalling
+    parameter OPT_DROP = 0,
+    parameter COUNT_WIDTH = 32
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    // frames dropped per output, output i in bits [i*COUNT_WIDTH +: COUNT_WIDTH]
+    output reg  [OUTPUTS*COUNT_WIDTH-1:0]   drop_count,
+
+    /*
+     * AXI-Stream slave interface
+     */
+    input  wire [DATA_WIDTH-1:0]            s_axis_tdata,
+    input  wire                             s_axis_tvalid,
+    input  wire                             s_axis_tlast,
+    output wire                             s_axis_tready,
+
+    /*
+     * AXI-Stream master interfaces, output i in bits [i*DATA_WIDTH +: DATA_WIDTH]
+     */
+    output reg  [OUTPUTS*DATA_WIDTH-1:0]    m_axis_tdata,
+    output reg  [OUTPUTS-1:0]               m_axis_tvalid,
+    output reg  [OUTPUTS-1:0]               m_axis_tlast,
+    input  wire [OUTPUTS-1:0]               m_axis_tready
+);
+
+localparam FIFO_DEPTH = 2**ADDR_WIDTH;
+
+wire [OUTPUTS-1:0]          full;
+wire                        s_axis_valid;
+
+assign s_axis_valid = s_axis_tvalid && s_axis_tready;
+
+// without OPT_DROP a beat is accepted once every output has room for it, so
+// an output only stalls the input when its consumer falls FIFO_DEPTH beats
+// behind
+generate if (OPT_DROP) begin
+    assign s_axis_tready = aresetn;
+end else begin
+    assign s_axis_tready = aresetn && !(|full);
+end endgenerate
+
+// With OPT_DROP an output only forwards whole frames, as axis_packet_fifo in
+// store-and-forward mode: the frame being written lives between wr_ptr and
+// wr_ptr_frame, and is rolled back if the FIFO fills up before its TLAST, so
+// a slow output loses whole frames and never truncated or merged ones.
+genvar ii;
+generate for (ii = 0; ii < OUTPUTS; ii = ii + 1) begin : output_fifo
+    reg  [DATA_WIDTH:0]     memory [FIFO_DEPTH-1:0];
+    reg  [ADDR_WIDTH:0]     wr_ptr = 0;
+    reg  [ADDR_WIDTH:0]     wr_ptr_frame = 0;
+    reg  [ADDR_WIDTH:0]     rd_ptr = 0;
+    reg                     dropping = 1'b0;
+    reg  [COUNT_WIDTH-1:0]  drops = 0;
+
+    wire [ADDR_WIDTH:0]     wr_ptr_visible;
+    wire                    empty;
+    wire                    drop;
+    wire                    write;
+    wire                    read;
+
+    assign wr_ptr_visible = OPT_DROP ? wr_ptr : wr_ptr_frame;
+
+    assign full[ii] = (wr_ptr_frame[ADDR_WIDTH] != rd_ptr[ADDR_WIDTH]) &&
+                      (wr_ptr_frame[ADDR_WIDTH-1:0] == rd_ptr[ADDR_WIDTH-1:0]);
+    assign empty = (wr_ptr_visible == rd_ptr);
+
+    assign drop = OPT_DROP && s_axis_valid && !dropping && full[ii];
+    assign write = s_axis_valid && !dropping && !drop;
+    assign read = m_axis_tvalid[ii] && m_axis_tready[ii];
+
+    always_ff @(posedge aclk)
+        if (write)
+            memory[wr_ptr_frame[ADDR_WIDTH-1:0]] <= {s_axis_tlast, s_axis_tdata};
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            dropping <= 1'b0;
+        else if (s_axis_valid && s_axis_tlast)
+            dropping <= 1'b0;
+        else if (drop)
+            dropping <= 1'b1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            wr_ptr_frame <= 0;
+        else if (s_axis_valid && s_axis_tlast && (dropping || drop))
+            wr_ptr_frame <= wr_ptr;
+        else if (write)
+            wr_ptr_frame <= wr_ptr_frame + 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            wr_ptr <= 0;
+        else if (write && s_axis_tlast)
+            wr_ptr <= wr_ptr_frame + 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            rd_ptr <= 0;
+        else if (read)
+            rd_ptr <= rd_ptr + 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            drops <= 0;
+        else if (s_axis_valid && s_axis_tlast && (dropping || drop))
+            drops <= drops + 1;
+
+    always_comb begin
+        m_axis_tdata[ii*DATA_WIDTH +: DATA_WIDTH] = memory[rd_ptr[ADDR_WIDTH-1:0]][DATA_WIDTH-1:0];
+        m_axis_tlast[ii] = memory[rd_ptr[ADDR_WIDTH-1:0]][DATA_WIDTH];
+        m_axis_tvalid[ii] = !empty;
+        drop_count[ii*COUNT_WIDTH +: COUNT_WIDTH] = drops;
+    end
+end endgenerate
+
+
+`ifdef FORMAL
+    reg	f_past_valid = 1'b0;
+    always @(posedge aclk)
+        f_past_valid <= 1'b1;
+
+    always @(*)
+        if (!f_past_valid)
+            assume(!aresetn);
+
+    integer f_ii;
+    always @(posedge aclk) begin
+        if (f_past_valid && $past(aresetn)) begin
+            if ($past(s_axis_tvalid && !s_axis_tready)) begin
+                assume(s_axis_tvalid);
+                assume($stable(s_axis_tdata));
+                assume($stable(s_axis_tlast));
+            end
+
+            for (f_ii = 0; f_ii < OUTPUTS; f_ii = f_ii + 1)
+                if ($past(m_axis_tvalid[f_ii] && !m_axis_tready[f_ii])) begin
+                    assert(m_axis_tvalid[f_ii]);
+                    assert($stable(m_axis_tdata[f_ii*DATA_WIDTH +: DATA_WIDTH]));
+                    assert($stable(m_axis_tlast[f_ii]));
+                end
+        end
+    end
+`endif
+
+endmodule
+
+`default_nettype wire
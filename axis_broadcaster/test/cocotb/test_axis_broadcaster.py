@@ -0,0 +1,241 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+
+from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource
+
+from testbench import TestFactory, StreamCoverage, Throughput, PackedStreamSink, field, parameter
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
+        self.sink = PackedStreamSink(dut, "m_axis", dut.aclk, dut.OUTPUTS.value, dut.DATA_WIDTH.value)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.s_axis_throughput = Throughput(dut, "s_axis", dut.aclk)
+
+    def set_idle_generator(self, generator=None):
+        if generator:
+            self.source.set_pause_generator(generator())
+
+    def set_backpressure_generator(self, generator=None):
+        # every output pauses independently
+        if generator:
+            for ii in range(self.sink.channels):
+                self.sink.set_pause_generator(ii, generator())
+
+    def drop_count(self, index):
+        return field(self.dut.drop_count.value, index, self.dut.COUNT_WIDTH.value)
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+    async def send(self, nframes, frame_length):
+        """Send random frames, returning the beats sent as (tdata, tlast)."""
+        data_width = self.dut.DATA_WIDTH.value
+
+        sent = []
+        for nn in range(nframes):
+            frame_data = list(map(int, rng.integers(0, 2**data_width, frame_length)))
+            sent += [(tdata, int(ii == frame_length - 1)) for ii, tdata in enumerate(frame_data)]
+            await self.source.send(AxiStreamFrame(frame_data))
+
+        await self.source.wait()
+        return sent
+
+    async def drain(self, cycles=8):
+        idle = 0
+        while idle < cycles:
+            await RisingEdge(self.dut.aclk)
+            idle = idle + 1 if self.sink.idle() else 0
+
+
+def is_subsequence(received, sent):
+    remaining = iter(sent)
+    return all(any(beat == candidate for candidate in remaining) for beat in received)
+
+def frames(beats):
+    """Split (tdata, tlast) beats into frames, a trailing partial one included."""
+    split = [[]]
+    for beat in beats:
+        split[-1].append(beat)
+        if beat[1]:
+            split.append([])
+    return [frame for frame in split if frame]
+
+
+async def run_test(dut, nframes=32, frame_length=16, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    dut._log.info(f"param OUTPUTS = {dut.OUTPUTS.value}")
+    dut._log.info(f"param ADDR_WIDTH = {dut.ADDR_WIDTH.value}")
+    dut._log.info(f"param OPT_DROP = {dut.OPT_DROP.value}")
+
+    await tb.reset()
+
+    sent = await tb.send(nframes, frame_length)
+    await tb.drain()
+
+    for ii in range(tb.sink.channels):
+        received = tb.sink.beats[ii]
+        dut._log.info(f"output {ii}: {len(received)} beats received, {tb.drop_count(ii)} dropped")
+
+        if dut.OPT_DROP.value:
+            # whole frames are delivered in order, the others are counted
+            assert is_subsequence(frames(received), frames(sent))
+            assert len(frames(received)) + tb.drop_count(ii) == nframes
+        else:
+            assert received == sent
+            assert tb.drop_count(ii) == 0
+
+
+async def run_test_throughput(dut, nframes=64, frame_length=64):
+    tb = TB(dut)
+
+    # the input is valid 3 cycles out of 4, every output pauses for random
+    # bursts within the FIFO slack; with OPT_DROP the outputs forward whole
+    # frames, which share that slack with the frame being written
+    depth = 2**dut.ADDR_WIDTH.value
+    max_burst = depth // 2
+    if dut.OPT_DROP.value:
+        frame_length = max_burst = depth // 4
+    tb.source.set_pause_generator(itertools.cycle([0, 0, 0, 1]))
+    tb.set_backpressure_generator(lambda: random_burst_pause(max_burst))
+
+    await tb.reset()
+
+    sent = await tb.send(nframes, frame_length)
+    await tb.drain()
+
+    # no consumer stalled the input, and every output saw every beat
+    assert tb.s_axis_throughput.beats == len(sent)
+    assert tb.s_axis_throughput.valid_cycles == tb.s_axis_throughput.beats
+
+    for ii in range(tb.sink.channels):
+        assert tb.sink.beats[ii] == sent
+        assert tb.drop_count(ii) == 0
+
+
+async def run_test_drop(dut, nframes=64, frame_length=None):
+    tb = TB(dut)
+
+    # frames that fit in the FIFO next to the one being read
+    frame_length = frame_length or 2**dut.ADDR_WIDTH.value // 2
+
+    # the last output is too slow for a continuous input
+    slow = tb.sink.channels - 1
+    tb.sink.set_pause_generator(slow, random_pause())
+
+    await tb.reset()
+
+    sent = await tb.send(nframes, frame_length)
+    await tb.drain()
+
+    assert tb.s_axis_throughput.beats == len(sent)
+    assert tb.s_axis_throughput.valid_cycles == tb.s_axis_throughput.beats
+
+    # the slow consumer holds back neither the input nor the other outputs
+    for ii in range(slow):
+        assert tb.sink.beats[ii] == sent
+        assert tb.sink.beats_per_clock(ii) == 1.0
+        assert tb.drop_count(ii) == 0
+
+    # the slow output loses whole frames, never truncated or merged ones
+    received = frames(tb.sink.beats[slow])
+    dut._log.info(f"slow output: {len(received)} frames received, {tb.drop_count(slow)} dropped")
+    assert tb.drop_count(slow) > 0
+    assert all(len(frame) == frame_length and frame[-1][1] for frame in received)
+    assert is_subsequence(received, frames(sent))
+    assert len(received) + tb.drop_count(slow) == nframes
+
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+def random_burst_pause(max_burst, period=64):
+    global rng
+    while True:
+        burst = int(rng.integers(1, max_burst + 1))
+        start = int(rng.integers(0, period - burst + 1))
+        yield from [0] * start + [1] * burst + [0] * (period - burst - start)
+
+if cocotb.SIM_NAME:
+    factory = TestFactory(run_test)
+    factory.add_option("frame_length", [1, 16])
+    factory.add_option("idle_generator", [None, random_pause])
+    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+    factory.generate_tests()
+
+    factory = TestFactory(run_test_throughput)
+    factory.generate_tests()
+
+    if parameter("OPT_DROP"):
+        factory = TestFactory(run_test_drop)
+        factory.generate_tests()
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("outputs", [2, 3])
+@pytest.mark.parametrize("opt_drop", [False, True])
+def test_axis_broadcaster(request, outputs, opt_drop):
+    dut = "axis_broadcaster"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv")
+    ]
+
+    parameters = dict()
+    parameters["DATA_WIDTH"] = 16
+    parameters["OUTPUTS"] = outputs
+    parameters["ADDR_WIDTH"] = 4
+    parameters["OPT_DROP"] = int(opt_drop)
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
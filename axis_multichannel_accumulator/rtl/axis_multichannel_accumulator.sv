@@ -6,9 +6,31 @@ module axis_multichannel_accumulator #
 (
     // Width of data bus in bits
     parameter INPUT_DATA_WIDTH = 16,
-    parameter OUTPUT_DATA_WIDTH = 24,
+    // Input samples: 0 real; 1 complex, the real part (I) in the low
+    // INPUT_DATA_WIDTH bits as from axis_real_to_complex, summing their
+    // power I*I + Q*Q; 2 as 1, also summing I and Q
+    parameter OPT_COMPLEX = 0,
+    parameter RATE_WIDTH = 8,
+    // Full precision by default
+    parameter OUTPUT_DATA_WIDTH = (OPT_COMPLEX ? 2 : 1)*INPUT_DATA_WIDTH + RATE_WIDTH,
     parameter CHANNELS = 1024,
-    parameter RATE_WIDTH = 8
+    // Read latency of the accumulator memory in cycles, frames must be
+    // longer than it
+    parameter READ_LATENCY = 1,
+    // Output the results of the last pass through a second memory, so a
+    // slow consumer does not stall the integration
+    parameter OPT_DOUBLE_BUFFER = 0,
+    // Capture the results of a pass on request in a memory read over
+    // AXI4-Lite; 2 also leaves m_axis unused, so no consumer is needed
+    // and the integration never stalls
+    parameter OPT_SNAPSHOT = 0,
+
+    localparam S_WIDTH = (OPT_COMPLEX ? 2 : 1)*INPUT_DATA_WIDTH,
+    // with OPT_COMPLEX == 2 the Q, I and power sums, power in the low bits
+    localparam M_WIDTH = (OPT_COMPLEX == 2 ? 3 : 1)*OUTPUT_DATA_WIDTH,
+    // 32-bit words of a result in the snapshot address map, a power of 2
+    localparam SNAPSHOT_WORDS = 2**$clog2((M_WIDTH + 31)/32),
+    localparam AXI_ADDR_WIDTH = $clog2(CHANNELS) + $clog2(SNAPSHOT_WORDS) + 2
 )
 (
     input  wire                             aclk,
@@ -19,7 +41,7 @@ module axis_multichannel_accumulator #
     /*
      * AXI-Stream slave interface
      */
-    input  wire [INPUT_DATA_WIDTH-1:0]      s_axis_tdata,
+    input  wire [S_WIDTH-1:0]               s_axis_tdata,
     input  wire                             s_axis_tvalid,
     input  wire                             s_axis_tlast,
     output wire                             s_axis_tready,
@@ -27,35 +49,92 @@ module axis_multichannel_accumulator #
     /*
      * AXI-Stream master interface
      */
-    output reg  [OUTPUT_DATA_WIDTH-1:0]     m_axis_tdata,
+    output reg  [M_WIDTH-1:0]               m_axis_tdata,
     output reg                              m_axis_tvalid,
     output reg                              m_axis_tlast,
-    input  wire                             m_axis_tready
+    input  wire                             m_axis_tready,
+
+    /*
+     * Snapshot of the results (OPT_SNAPSHOT)
+     */
+    // a rising edge captures the next complete pass
+    input  wire                             snapshot,
+    // the snapshot holds a complete pass, until the next rising edge
+    output wire                             snapshot_valid,
+
+    /*
+     * AXI4-Lite slave interface, reading the snapshot
+     */
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_araddr,
+    input  wire [2:0]                       s_axil_arprot,
+    input  wire                             s_axil_arvalid,
+    output wire                             s_axil_arready,
+
+    output wire [31:0]                      s_axil_rdata,
+    output wire [1:0]                       s_axil_rresp,
+    output wire                             s_axil_rvalid,
+    input  wire                             s_axil_rready,
+
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_awaddr,
+    input  wire [2:0]                       s_axil_awprot,
+    input  wire                             s_axil_awvalid,
+    output wire                             s_axil_awready,
+
+    input  wire [31:0]                      s_axil_wdata,
+    input  wire [3:0]                       s_axil_wstrb,
+    input  wire                             s_axil_wvalid,
+    output wire                             s_axil_wready,
+
+    output wire [1:0]                       s_axil_bresp,
+    output wire                             s_axil_bvalid,
+    input  wire                             s_axil_bready
 );
 
     localparam ADDR_WIDTH = $clog2(CHANNELS);
+    // sums of real samples, I or Q, and of the power
     localparam ACC_WIDTH = INPUT_DATA_WIDTH + RATE_WIDTH;
+    localparam POWER_WIDTH = 2*INPUT_DATA_WIDTH + RATE_WIDTH;
+    localparam MEM_WIDTH = (OPT_COMPLEX == 0) ? ACC_WIDTH :
+                           (OPT_COMPLEX == 1) ? POWER_WIDTH : POWER_WIDTH + 2*ACC_WIDTH;
 
     reg [RATE_WIDTH-1:0] counter = {RATE_WIDTH{1'b0}};
 
-    reg [ACC_WIDTH-1:0] memory [CHANNELS-1:0];
+    reg [MEM_WIDTH-1:0] memory [CHANNELS-1:0];
     
     reg [ADDR_WIDTH-1:0] mem_rdaddr = {ADDR_WIDTH{1'b0}};
-    reg [ACC_WIDTH-1:0] mem_rddata = {ACC_WIDTH{1'b0}};
+    reg [MEM_WIDTH-1:0] mem_rddata;
 
     reg mem_write = 0;
-    reg [ADDR_WIDTH-1:0] mem_wraddr = {ADDR_WIDTH{1'b0}};
-    reg [ACC_WIDTH-1:0] mem_wrdata = {ACC_WIDTH{1'b0}};
-
-    reg [INPUT_DATA_WIDTH-1:0] input_data = {INPUT_DATA_WIDTH{1'b0}};
-    reg counter_zero_dly = 0;
+    reg [ADDR_WIDTH-1:0] mem_wraddr;
+    reg [MEM_WIDTH-1:0] mem_wrdata = {MEM_WIDTH{1'b0}};
+
+    // the input beat as the terms added to the memory
+    wire [MEM_WIDTH-1:0] term;
+    reg [MEM_WIDTH-1:0] input_data;
+    reg counter_zero_dly;
+
+    // the input beats in the memory read pipeline, beat i at stage i+1
+    reg [MEM_WIDTH-1:0] mem_rdpipe [READ_LATENCY-1:0];
+    reg [MEM_WIDTH-1:0] data_pipe [READ_LATENCY-1:0];
+    reg [ADDR_WIDTH-1:0] addr_pipe [READ_LATENCY-1:0];
+    reg [READ_LATENCY-1:0] valid_pipe = 0;
+    reg [READ_LATENCY-1:0] last_pipe = 0;
+    reg [READ_LATENCY-1:0] output_pipe = 0;
+    reg [READ_LATENCY-1:0] zero_pipe = 0;
+    wire [READ_LATENCY:0] valid_chain;
+
+    // results of the last pass, to m_axis or the output memory
+    reg [M_WIDTH-1:0] acc_tdata;
+    reg acc_tvalid;
+    reg acc_tlast;
+    wire acc_tready;
 
     wire buf_valid;
-    wire [INPUT_DATA_WIDTH-1:0] buf_data;
+    wire [S_WIDTH-1:0] buf_data;
     wire buf_last;
 
     wire s_axis_valid;
-    wire signed [ACC_WIDTH-1:0] sum_wire;
+    wire [MEM_WIDTH-1:0] sum_wire;
     wire last;
     wire stall;
 
@@ -63,16 +142,21 @@ module axis_multichannel_accumulator #
     initial begin
         for (i=0;i<CHANNELS;i=i+1)
             memory[i] = 0;
+        for (i=0;i<READ_LATENCY;i=i+1) begin
+            mem_rdpipe[i] = 0;
+            data_pipe[i] = 0;
+            addr_pipe[i] = 0;
+        end
     end
 
     assign s_axis_valid = buf_valid && !stall && aresetn;
-    assign sum_wire = $signed(mem_rddata) + ACC_WIDTH'($signed(input_data));
     assign last = (counter == (rate - 1));
-    assign stall = m_axis_tvalid && !m_axis_tready;
+    assign stall = acc_tvalid && !acc_tready;
+    assign valid_chain = {valid_pipe, buf_valid};
 
     axis_skid_buffer 
     #(
-        .DATA_WIDTH(INPUT_DATA_WIDTH)
+        .DATA_WIDTH(S_WIDTH)
     ) buffer (   
         .aclk(aclk), 
         .aresetn(aresetn), 
@@ -88,15 +172,82 @@ module axis_multichannel_accumulator #
         .m_axis_tready(!stall)
     );
 
+    // the pipeline only advances when the output is not stalled
     always @(posedge aclk)
-        counter_zero_dly <= (counter == 0);
+        if (!stall) begin
+            mem_rdpipe[0] <= memory[mem_rdaddr];
+            data_pipe[0] <= term;
+            addr_pipe[0] <= mem_rdaddr;
+            for (i=1;i<READ_LATENCY;i=i+1) begin
+                mem_rdpipe[i] <= mem_rdpipe[i-1];
+                data_pipe[i] <= data_pipe[i-1];
+                addr_pipe[i] <= addr_pipe[i-1];
+            end
+
+            valid_pipe <= valid_chain[READ_LATENCY-1:0];
+            last_pipe <= (last_pipe << 1) | buf_last;
+            output_pipe <= (output_pipe << 1) | (last && buf_valid);
+            zero_pipe <= (zero_pipe << 1) | (counter == 0);
+        end
+
+    always @(*) begin
+        mem_rddata = mem_rdpipe[READ_LATENCY-1];
+        input_data = data_pipe[READ_LATENCY-1];
+        acc_tlast = last_pipe[READ_LATENCY-1];
+        counter_zero_dly = zero_pipe[READ_LATENCY-1];
+        mem_wraddr = addr_pipe[READ_LATENCY-1];
+    end
 
     always @(*)
         if (counter_zero_dly) 
-            mem_wrdata = ACC_WIDTH'($signed(input_data));
+            mem_wrdata = input_data;
         else
             mem_wrdata = sum_wire;
 
+    // the terms are computed as the beat enters the pipeline, and summed
+    // field by field at its end
+    generate if (OPT_COMPLEX == 0) begin : real_input
+        assign term = MEM_WIDTH'($signed(buf_data));
+        assign sum_wire = mem_rddata + input_data;
+
+        always @(*)
+            acc_tdata = OUTPUT_DATA_WIDTH'($signed(sum_wire));
+    end else begin : complex_input
+        wire signed [INPUT_DATA_WIDTH-1:0] in_i;
+        wire signed [INPUT_DATA_WIDTH-1:0] in_q;
+        wire signed [2*INPUT_DATA_WIDTH-1:0] i_squared;
+        wire signed [2*INPUT_DATA_WIDTH-1:0] q_squared;
+        wire [POWER_WIDTH-1:0] power;
+
+        assign in_i = buf_data[INPUT_DATA_WIDTH-1:0];
+        assign in_q = buf_data[2*INPUT_DATA_WIDTH-1:INPUT_DATA_WIDTH];
+        assign i_squared = in_i * in_i;
+        assign q_squared = in_q * in_q;
+        assign power = i_squared + q_squared;
+
+        assign sum_wire[POWER_WIDTH-1:0] = mem_rddata[POWER_WIDTH-1:0] + input_data[POWER_WIDTH-1:0];
+
+        if (OPT_COMPLEX == 1) begin
+            assign term = power;
+
+            always @(*)
+                acc_tdata = OUTPUT_DATA_WIDTH'(sum_wire);
+        end else begin
+            assign term = {ACC_WIDTH'(in_q), ACC_WIDTH'(in_i), power};
+
+            for (genvar jj = 0; jj < 2; jj = jj + 1)
+                assign sum_wire[POWER_WIDTH + jj*ACC_WIDTH +: ACC_WIDTH] =
+                    mem_rddata[POWER_WIDTH + jj*ACC_WIDTH +: ACC_WIDTH] + input_data[POWER_WIDTH + jj*ACC_WIDTH +: ACC_WIDTH];
+
+            always @(*)
+                acc_tdata = {
+                    OUTPUT_DATA_WIDTH'($signed(sum_wire[POWER_WIDTH + ACC_WIDTH +: ACC_WIDTH])),
+                    OUTPUT_DATA_WIDTH'($signed(sum_wire[POWER_WIDTH +: ACC_WIDTH])),
+                    OUTPUT_DATA_WIDTH'(sum_wire[POWER_WIDTH-1:0])
+                };
+        end
+    end endgenerate
+
     always @(posedge aclk) begin
         if (!aresetn) begin
             mem_rdaddr <= {ADDR_WIDTH{1'b0}};
@@ -112,45 +263,190 @@ module axis_multichannel_accumulator #
     always @(posedge aclk) begin
         if (!aresetn) begin
             counter <= 0;
-        end else if (buf_last && !stall) begin
+        end else if (buf_valid && buf_last && !stall) begin
             if (last)
                 counter <= 0;
             else
                 counter <= counter + 1;
         end
     end
-    
-    always @(posedge aclk)
-        if (!stall)
-            input_data <= buf_data;
-
-    always @(posedge aclk)
-        if (!stall)
-            m_axis_tlast <= buf_last;
 
     always @(*)
-        m_axis_tdata = sum_wire;
+        acc_tvalid = output_pipe[READ_LATENCY-1];
 
+    // each beat is written back once, as it reaches the end of the pipeline
     always @(posedge aclk)
-        if (stall || (last && buf_valid))
-            m_axis_tvalid <= 1'b1;
-        else
-            m_axis_tvalid <= 1'b0;
-
-    always @(posedge aclk)
-        mem_wraddr <= mem_rdaddr;
-
-    always @(posedge aclk)
-        mem_write <= buf_valid && !stall;
-
-    always @(posedge aclk)
-        if (!stall)
-            mem_rddata <= memory[mem_rdaddr];    
+        mem_write <= valid_chain[READ_LATENCY-1] && !stall;
     
     always @(posedge aclk)
         if (mem_write)
             memory[mem_wraddr] <= mem_wrdata;
 
+    // the results drain from the output memory while the next pass is
+    // integrated; only a consumer slower than the integration stalls it
+    generate if (OPT_SNAPSHOT == 2) begin : snapshot_only
+        assign acc_tready = 1'b1;
+
+        always @(*) begin
+            m_axis_tdata = {M_WIDTH{1'b0}};
+            m_axis_tvalid = 1'b0;
+            m_axis_tlast = 1'b0;
+        end
+    end else if (OPT_DOUBLE_BUFFER) begin : output_memory
+        wire [M_WIDTH-1:0] out_tdata;
+        wire out_tvalid;
+        wire out_tlast;
+
+        axis_packet_fifo
+        #(
+            .DATA_WIDTH(M_WIDTH),
+            .ADDR_WIDTH(ADDR_WIDTH),
+            .OPT_STORE_FORWARD(0)
+        ) fifo (
+            .aclk(aclk),
+            .aresetn(aresetn),
+
+            .frame_count(),
+            .frame_drop(),
+
+            .s_axis_tdata(acc_tdata),
+            .s_axis_tvalid(acc_tvalid),
+            .s_axis_tlast(acc_tlast),
+            .s_axis_tready(acc_tready),
+
+            .m_axis_tdata(out_tdata),
+            .m_axis_tvalid(out_tvalid),
+            .m_axis_tlast(out_tlast),
+            .m_axis_tready(m_axis_tready)
+        );
+
+        always @(*) begin
+            m_axis_tdata = out_tdata;
+            m_axis_tvalid = out_tvalid;
+            m_axis_tlast = out_tlast;
+        end
+    end else begin
+        assign acc_tready = m_axis_tready;
+
+        always @(*) begin
+            m_axis_tdata = acc_tdata;
+            m_axis_tvalid = acc_tvalid;
+            m_axis_tlast = acc_tlast;
+        end
+    end endgenerate
+
+    // The results of the pass after a snapshot request are written, from
+    // its first channel to its TLAST, to a memory that then holds them while
+    // the integration goes on. The host reads them over AXI4-Lite, the result
+    // of channel c in the SNAPSHOT_WORDS words from byte offset
+    // 4*SNAPSHOT_WORDS*c, zero-extended; writes are ignored.
+    generate if (OPT_SNAPSHOT) begin : snapshot_memory
+        localparam WORD_BITS = $clog2(SNAPSHOT_WORDS);
+
+        reg [M_WIDTH-1:0] results [CHANNELS-1:0];
+        reg [32*SNAPSHOT_WORDS-1:0] results_rddata = 0;
+        reg [AXI_ADDR_WIDTH-2-1:0] results_rdaddr = 0;
+
+        wire [31:0] bram_rddata;
+        wire [AXI_ADDR_WIDTH-2-1:0] bram_addr;
+        wire bram_en;
+
+        reg snapshot_prev = 1'b0;
+        reg armed = 1'b0;
+        reg captured = 1'b0;
+        reg capturing = 1'b0;
+        wire capture;
+
+        initial
+            for (int kk = 0; kk < CHANNELS; kk++)
+                results[kk] = 0;
+
+        assign snapshot_valid = captured;
+        assign capture = acc_tvalid && acc_tready && (capturing || (armed && mem_wraddr == 0));
+
+        always @(posedge aclk) begin
+            snapshot_prev <= snapshot;
+
+            if (!aresetn) begin
+                armed <= 1'b0;
+                capturing <= 1'b0;
+                captured <= 1'b0;
+            end else if (snapshot && !snapshot_prev) begin
+                armed <= 1'b1;
+                capturing <= 1'b0;
+                captured <= 1'b0;
+            end else if (capture) begin
+                armed <= 1'b0;
+                capturing <= !acc_tlast;
+                captured <= acc_tlast;
+            end
+        end
+
+        always @(posedge aclk)
+            if (capture)
+                results[mem_wraddr] <= acc_tdata;
+
+        always @(posedge aclk)
+            if (bram_en) begin
+                results_rddata <= results[ADDR_WIDTH'(bram_addr >> WORD_BITS)];
+                results_rdaddr <= bram_addr;
+            end
+
+        assign bram_rddata = results_rddata[(results_rdaddr % SNAPSHOT_WORDS)*32 +: 32];
+
+        axi_bram_interface
+        #(
+            .AXI_DATA_WIDTH(32),
+            .AXI_ADDR_WIDTH(AXI_ADDR_WIDTH),
+            .BRAM_DATA_WIDTH(32),
+            .READ_LATENCY(1)
+        ) axi_interface (
+            .aclk(aclk),
+            .aresetn(aresetn),
+
+            .s_axil_araddr(s_axil_araddr),
+            .s_axil_arprot(s_axil_arprot),
+            .s_axil_arvalid(s_axil_arvalid),
+            .s_axil_arready(s_axil_arready),
+
+            .s_axil_rdata(s_axil_rdata),
+            .s_axil_rresp(s_axil_rresp),
+            .s_axil_rvalid(s_axil_rvalid),
+            .s_axil_rready(s_axil_rready),
+
+            .s_axil_awaddr(s_axil_awaddr),
+            .s_axil_awprot(s_axil_awprot),
+            .s_axil_awvalid(s_axil_awvalid),
+            .s_axil_awready(s_axil_awready),
+
+            .s_axil_wdata(s_axil_wdata),
+            .s_axil_wstrb(s_axil_wstrb),
+            .s_axil_wvalid(s_axil_wvalid),
+            .s_axil_wready(s_axil_wready),
+
+            .s_axil_bresp(s_axil_bresp),
+            .s_axil_bvalid(s_axil_bvalid),
+            .s_axil_bready(s_axil_bready),
+
+            .bram_rddata(bram_rddata),
+            .bram_wrdata(),
+            .bram_addr(bram_addr),
+            .bram_we(),
+            .bram_en(bram_en),
+            .bram_clk()
+        );
+    end else begin
+        assign snapshot_valid = 1'b0;
+        assign s_axil_arready = 1'b0;
+        assign s_axil_rdata = 32'b0;
+        assign s_axil_rresp = 2'b00;
+        assign s_axil_rvalid = 1'b0;
+        assign s_axil_awready = 1'b0;
+        assign s_axil_wready = 1'b0;
+        assign s_axil_bresp = 2'b00;
+        assign s_axil_bvalid = 1'b0;
+    end endgenerate
+
 
     // assign m_axis_tdata = sum_wire;
 
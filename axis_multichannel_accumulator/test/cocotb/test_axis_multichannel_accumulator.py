@@ -0,0 +1,349 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, with_timeout
+
+from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
+from cocotbext.axi import AxiLiteBus, AxiLiteMaster
+
+from testbench import TestFactory, StreamCoverage, Throughput, parameter
+from models import MultichannelAccumulator
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
+        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
+        self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+        self.s_axis_throughput = Throughput(dut, "s_axis", dut.aclk)
+        self.m_axis_throughput = Throughput(dut, "m_axis", dut.aclk)
+
+        dut.snapshot <= 0
+
+    def set_idle_generator(self, generator=None):
+        if generator:
+            self.source.set_pause_generator(generator())
+
+    def set_backpressure_generator(self, generator=None):
+        if generator:
+            self.sink.set_pause_generator(generator())
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+    async def read_snapshot(self, channels, words):
+        # the result of a channel in `words` 32-bit words, least significant first
+        values = []
+        for channel in range(channels):
+            value = 0
+            for word in range(words):
+                response = await self.axil_master.read((channel * words + word) * 4, 4)
+                value |= int.from_bytes(response.data, 'little', signed=False) << (32 * word)
+            values.append(value)
+        return np.array(values)
+
+
+#@cocotb.test()
+async def run_test(dut, nblocks=1, rate=4, block_size=8, block_data_gen=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+    dut.rate <= rate
+
+    block_data_gen = block_data_gen or (lambda x, y: np.full((y, x), 10))
+    
+    model = MultichannelAccumulator(rate, dut.CHANNELS.value, dut.INPUT_DATA_WIDTH.value,
+        dut.OUTPUT_DATA_WIDTH.value, dut.RATE_WIDTH.value)
+
+    await tb.reset()
+
+    for nn in range(nblocks):
+        block_data = block_data_gen(block_size, rate)
+        block_last = np.arange(rate * block_size) % block_size == block_size - 1
+        expected_output, _ = model.process(block_data.reshape(-1), block_last)
+
+        for ii in range(rate):
+            test_frame = AxiStreamFrame(list(map(int, block_data[ii])))
+            await tb.source.send(test_frame)
+
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 250, 'us')
+
+        for _ in range(100):
+            await RisingEdge(dut.aclk)
+
+        recv_data = np.array(recv_frame.tdata)
+
+        dut._log.info(f"RX Frame Length = {len(recv_frame.tdata)}")
+        assert len(recv_frame.tdata) == block_size
+        assert np.all(recv_data == expected_output)
+
+    # the input is never stalled by the memory read latency
+    if idle_generator is None and backpressure_generator is None:
+        assert tb.s_axis_throughput.beats_per_clock == 1.0
+
+async def run_test_double_buffer(dut, nblocks=4, rate=8, block_size=128, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_backpressure_generator(backpressure_generator)
+    dut.rate <= rate
+
+    model = MultichannelAccumulator(rate, dut.CHANNELS.value, dut.INPUT_DATA_WIDTH.value,
+        dut.OUTPUT_DATA_WIDTH.value, dut.RATE_WIDTH.value)
+
+    await tb.reset()
+
+    block_data = block_data_random(block_size, rate * nblocks)
+    block_last = np.arange(block_data.size) % block_size == block_size - 1
+    expected_output, _ = model.process(block_data.reshape(-1), block_last)
+
+    # the whole integration is queued so the source never idles
+    for frame in block_data:
+        await tb.source.send(AxiStreamFrame(list(map(int, frame))))
+
+    for nn in range(nblocks):
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 250, 'us')
+        assert np.all(np.array(recv_frame.tdata) == expected_output[nn*block_size:(nn+1)*block_size])
+
+    # the slow consumer drains a spectrum within an integration, so no
+    # input beat waited for TREADY
+    assert tb.s_axis_throughput.beats == block_data.size
+    assert tb.s_axis_throughput.valid_cycles == tb.s_axis_throughput.beats
+
+async def run_test_complex(dut, nblocks=2, rate=4, block_size=64, complex_data_gen=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+    dut.rate <= rate
+
+    opt_complex = dut.OPT_COMPLEX.value
+
+    complex_data_gen = complex_data_gen or complex_data_random
+
+    input_width = dut.INPUT_DATA_WIDTH.value
+    output_width = dut.OUTPUT_DATA_WIDTH.value
+    model = MultichannelAccumulator(rate, dut.CHANNELS.value, input_width,
+        output_width, dut.RATE_WIDTH.value, opt_complex)
+
+    await tb.reset()
+
+    # I in the low half of TDATA, Q in the high half
+    real, imag = complex_data_gen(block_size, rate * nblocks, input_width)
+    block_data = (real % 2**input_width) | ((imag % 2**input_width) << input_width)
+    block_last = np.arange(block_data.size) % block_size == block_size - 1
+    expected_output, _ = model.process(block_data.reshape(-1), block_last)
+
+    for frame in block_data:
+        await tb.source.send(AxiStreamFrame(list(map(int, frame))))
+
+    for nn in range(nblocks):
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 250, 'us')
+        assert len(recv_frame.tdata) == block_size
+
+        # with OPT_COMPLEX = 2 the power, I and Q sums from the low bits up
+        if opt_complex == 2:
+            recv_data = np.array([[(int(beat) >> (ii * output_width)) & (2**output_width - 1) for ii in range(3)]
+                for beat in recv_frame.tdata])
+        else:
+            recv_data = np.array(list(map(int, recv_frame.tdata)))
+
+        assert np.array_equal(recv_data, expected_output[nn*block_size:(nn+1)*block_size])
+
+    if idle_generator is None and backpressure_generator is None:
+        assert tb.s_axis_throughput.beats_per_clock == 1.0
+
+async def run_test_snapshot(dut, nblocks=16, rate=4, block_size=64, idle_generator=None, backpressure_generator=None):
+    global rng
+
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+    dut.rate <= rate
+
+    output_width = dut.OUTPUT_DATA_WIDTH.value
+    words = 1 << ((output_width + 31) // 32 - 1).bit_length()
+    model = MultichannelAccumulator(rate, dut.CHANNELS.value, dut.INPUT_DATA_WIDTH.value,
+        output_width, dut.RATE_WIDTH.value)
+
+    await tb.reset()
+
+    block_data = block_data_random(block_size, rate * nblocks)
+    block_last = np.arange(block_data.size) % block_size == block_size - 1
+    expected_output, _ = model.process(block_data.reshape(-1), block_last)
+    integrations = expected_output.reshape(nblocks, block_size)
+
+    # the whole run is queued, so the integration goes on while the
+    # snapshot is read
+    for frame in block_data:
+        await tb.source.send(AxiStreamFrame(list(map(int, frame))))
+
+    previous = -1
+    for _ in range(3):
+        # request part way through an integration
+        for _ in range(int(rng.integers(block_size, rate * block_size))):
+            await RisingEdge(dut.aclk)
+
+        # counted at the input, as with OPT_SNAPSHOT = 2 there is no output;
+        # the last frame of integration nn starts at input beat
+        # (nn*rate + rate - 1)*block_size
+        started = max(0, -(-(tb.s_axis_throughput.beats - (rate - 1) * block_size) // (rate * block_size)))
+        dut.snapshot <= 1
+        await RisingEdge(dut.aclk)
+        dut.snapshot <= 0
+
+        await with_timeout(RisingEdge(dut.snapshot_valid), 250, 'us')
+        snapshot = await tb.read_snapshot(block_size, words)
+
+        # a whole integration, and the first to complete after the request
+        matches = [nn for nn in range(nblocks) if np.array_equal(snapshot, integrations[nn])]
+        dut._log.info(f"request after {started} output frames, snapshot of integration {matches}")
+        assert len(matches) == 1
+        assert matches[0] >= started and matches[0] > previous
+        previous = matches[0]
+
+        # held while the next integration completes
+        async def next_integration(beats):
+            while tb.s_axis_throughput.beats < beats:
+                await RisingEdge(dut.aclk)
+            for _ in range(8):
+                await RisingEdge(dut.aclk)
+
+        assert previous + 1 < nblocks
+        await with_timeout(next_integration((previous + 2) * rate * block_size), 250, 'us')
+        assert np.array_equal(await tb.read_snapshot(block_size, words), snapshot)
+        assert dut.snapshot_valid.value
+
+    # the integrations above completed without a consumer
+    if parameter("OPT_SNAPSHOT") == 2:
+        assert tb.m_axis_throughput.beats == 0
+
+def complex_data_random(block_size, rate, nbits=16):
+    return block_data_random(block_size, rate, nbits), block_data_random(block_size, rate, nbits)
+
+def complex_data_full_scale(block_size, rate, nbits=16):
+    # the largest power, testing the bit growth of the power sums
+    full_scale = np.full((rate, block_size), -2**(nbits-1))
+    return full_scale, full_scale
+
+def block_data_linear(block_size, rate):
+    return np.arange(rate * block_size).reshape((rate, block_size))
+
+def block_data_random(block_size, rate, nbits=16):
+    global rng
+    low = -(2**(nbits-1))
+    high = 2**(nbits-1)
+    return rng.integers(low = low, high = high, size = (rate, block_size))
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+def random_heavy_pause():
+    return random_pause(0.25)
+
+if cocotb.SIM_NAME:
+    # the real input tests only apply to OPT_COMPLEX = 0 builds, the
+    # complex input tests to the others; OPT_SNAPSHOT = 2 builds have no
+    # output stream
+    if not parameter("OPT_COMPLEX") and parameter("OPT_SNAPSHOT") != 2:
+        factory = TestFactory(run_test)
+        factory.add_option("rate", [16, 32])
+        factory.add_option("block_size", [64, 128])
+        factory.add_option("block_data_gen", [block_data_linear, block_data_random])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+    elif parameter("OPT_COMPLEX"):
+        factory = TestFactory(run_test_complex)
+        factory.add_option("rate", [1, 4])
+        factory.add_option("complex_data_gen", [complex_data_random, complex_data_full_scale])
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+
+    if parameter("OPT_DOUBLE_BUFFER") and not parameter("OPT_COMPLEX") and parameter("OPT_SNAPSHOT") != 2:
+        factory = TestFactory(run_test_double_buffer)
+        factory.add_option("backpressure_generator", [cycle_pause, random_heavy_pause])
+        factory.generate_tests()
+
+    if parameter("OPT_SNAPSHOT") and not parameter("OPT_COMPLEX"):
+        factory = TestFactory(run_test_snapshot)
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("read_latency", [1, 2])
+@pytest.mark.parametrize("opt_complex, opt_double_buffer, opt_snapshot", [
+    (0, 0, 0),
+    (0, 1, 0),
+    (0, 0, 1),
+    (0, 1, 1),
+    (0, 0, 2),
+    (1, 0, 0),
+    (2, 0, 0),
+])
+def test_axis_multichannel_accumulator(request, read_latency, opt_complex, opt_double_buffer, opt_snapshot):
+    dut = "axis_multichannel_accumulator"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv"),
+        os.path.join(root_dir, "axis_skid_buffer", "rtl", "axis_skid_buffer.sv"),
+        os.path.join(root_dir, "axis_packet_fifo", "rtl", "axis_packet_fifo.sv"),
+        os.path.join(root_dir, "axi_bram_interface", "rtl", "axi_bram_interface.sv"),
+        os.path.join(root_dir, "bram", "rtl", "bram.sv")
+    ]
+
+    parameters = dict()
+    parameters["READ_LATENCY"] = read_latency
+    parameters["OPT_COMPLEX"] = opt_complex
+    parameters["OPT_DOUBLE_BUFFER"] = opt_double_buffer
+    parameters["OPT_SNAPSHOT"] = opt_snapshot
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
@@ -0,0 +1,216 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+module axis_packet_fifo #
+(
+    // Width of data bus in bits
+    parameter DATA_WIDTH = 16,
+    // Depth of the FIFO (2**ADDR_WIDTH beats), in store-and-forward mode
+    // also the longest frame; longer frames are dropped
+    parameter ADDR_WIDTH = 10,
+    parameter OPT_STORE_FORWARD = 1,
+    parameter OPT_DROP = 0
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    output reg  [ADDR_WIDTH:0]              frame_count,
+    output reg                              frame_drop,
+
+    /*
+     * AXI-Stream slave interface
+     */
+    input  wire [DATA_WIDTH-1:0]            s_axis_tdata,
+    input  wire                             s_axis_tvalid,
+    input  wire                             s_axis_tlast,
+    output wire                             s_axis_tready,
+
+    /*
+     * AXI-Stream master interface
+     */
+    output reg  [DATA_WIDTH-1:0]            m_axis_tdata,
+    output reg                              m_axis_tvalid,
+    output reg                              m_axis_tlast,
+    input  wire                             m_axis_tready
+);
+
+// TLAST is stored alongside the data, padded to whole bytes for the BRAM
+// write enables
+localparam MEM_WIDTH = ((DATA_WIDTH + 1 + 7) / 8) * 8;
+localparam WE_WIDTH = MEM_WIDTH / 8;
+
+reg  [ADDR_WIDTH:0]         wr_ptr = 0;
+reg  [ADDR_WIDTH:0]         wr_ptr_frame = 0;
+reg  [ADDR_WIDTH:0]         rd_ptr = 0;
+reg                         dropping = 1'b0;
+reg                         mem_valid = 1'b0;
+
+wire [MEM_WIDTH-1:0]        mem_wrdata;
+wire [MEM_WIDTH-1:0]        mem_rddata;
+wire [ADDR_WIDTH:0]         wr_ptr_visible;
+
+wire                        s_axis_valid;
+wire                        m_axis_valid;
+wire                        full;
+wire                        empty;
+wire                        oversize;
+wire                        drop;
+wire                        write;
+wire                        read;
+wire                        out_ready;
+
+// In store-and-forward mode the read side only sees committed frames; the
+// frame currently being written lives between wr_ptr and wr_ptr_frame.
+assign wr_ptr_visible = OPT_STORE_FORWARD ? wr_ptr : wr_ptr_frame;
+
+assign full = (wr_ptr_frame[ADDR_WIDTH] != rd_ptr[ADDR_WIDTH]) &&
+              (wr_ptr_frame[ADDR_WIDTH-1:0] == rd_ptr[ADDR_WIDTH-1:0]);
+assign empty = (rd_ptr == wr_ptr_visible);
+
+// A frame filling the whole memory on its own can never be committed, so
+// in store-and-forward mode it is dropped instead of stalling forever.
+assign oversize = OPT_STORE_FORWARD && full && (rd_ptr == wr_ptr);
+
+assign s_axis_valid = s_axis_tvalid && s_axis_tready;
+assign m_axis_valid = m_axis_tvalid && m_axis_tready;
+
+generate if (OPT_DROP == 1 && OPT_STORE_FORWARD == 1) begin
+    assign drop = s_axis_valid && !dropping && full;
+    assign s_axis_tready = aresetn;
+end else if (OPT_STORE_FORWARD == 1) begin
+    assign drop = s_axis_valid && !dropping && oversize;
+    assign s_axis_tready = aresetn && (!full || oversize);
+end else begin
+    assign drop = 1'b0;
+    assign s_axis_tready = aresetn && !full;
+end endgenerate
+
+assign write = s_axis_valid && !dropping && !drop;
+
+assign out_ready = !m_axis_tvalid || m_axis_tready;
+assign read = !empty && (!mem_valid || out_ready);
+
+assign mem_wrdata = MEM_WIDTH'({s_axis_tlast, s_axis_tdata});
+
+
+/*
+ * Write side
+ */
+always_ff @(posedge aclk)
+    if (!aresetn)
+        dropping <= 1'b0;
+    else if (s_axis_valid && s_axis_tlast)
+        dropping <= 1'b0;
+    else if (drop)
+        dropping <= 1'b1;
+
+always_ff @(posedge aclk)
+    frame_drop <= aresetn && s_axis_valid && s_axis_tlast && (dropping || drop);
+
+always_ff @(posedge aclk)
+    if (!aresetn)
+        wr_ptr_frame <= 0;
+    else if (s_axis_valid && s_axis_tlast && (dropping || drop))
+        wr_ptr_frame <= wr_ptr;
+    else if (write)
+        wr_ptr_frame <= wr_ptr_frame + 1;
+
+always_ff @(posedge aclk)
+    if (!aresetn)
+        wr_ptr <= 0;
+    else if (write && s_axis_tlast)
+        wr_ptr <= wr_ptr_frame + 1;
+
+always_ff @(posedge aclk)
+    if (!aresetn)
+        frame_count <= 0;
+    else if ((write && s_axis_tlast) && !(m_axis_valid && m_axis_tlast))
+        frame_count <= frame_count + 1;
+    else if (!(write && s_axis_tlast) && (m_axis_valid && m_axis_tlast))
+        frame_count <= frame_count - 1;
+
+
+/*
+ * Read side
+ */
+always_ff @(posedge aclk)
+    if (!aresetn)
+        rd_ptr <= 0;
+    else if (read)
+        rd_ptr <= rd_ptr + 1;
+
+always_ff @(posedge aclk)
+    if (!aresetn)
+        mem_valid <= 1'b0;
+    else if (read)
+        mem_valid <= 1'b1;
+    else if (out_ready)
+        mem_valid <= 1'b0;
+
+always_ff @(posedge aclk)
+    if (!aresetn)
+        m_axis_tvalid <= 1'b0;
+    else if (out_ready)
+        m_axis_tvalid <= mem_valid;
+
+always_ff @(posedge aclk)
+    if (out_ready && mem_valid) begin
+        m_axis_tdata <= mem_rddata[DATA_WIDTH-1:0];
+        m_axis_tlast <= mem_rddata[DATA_WIDTH];
+    end
+
+
+bram
+#(
+    .DATA_WIDTH(MEM_WIDTH),
+    .ADDR_WIDTH(ADDR_WIDTH)
+) memory (
+    .clka(aclk),
+    .rsta(1'b0),
+    .ina(mem_wrdata),
+    .outa(),
+    .addra(wr_ptr_frame[ADDR_WIDTH-1:0]),
+    .wea({WE_WIDTH{1'b1}}),
+    .ena(write),
+
+    .clkb(aclk),
+    .rstb(1'b0),
+    .inb({MEM_WIDTH{1'b0}}),
+    .outb(mem_rddata),
+    .addrb(rd_ptr[ADDR_WIDTH-1:0]),
+    .web({WE_WIDTH{1'b0}}),
+    .enb(read)
+);
+
+
+`ifdef FORMAL
+    reg	f_past_valid = 1'b0;
+    always @(posedge aclk)
+        f_past_valid <= 1'b1;
+
+    always @(*)
+        if (!f_past_valid)
+            assume(!aresetn);
+
+    always @(posedge aclk) begin
+        if (f_past_valid && $past(aresetn)) begin
+            if ($past(s_axis_tvalid && !s_axis_tready)) begin
+                assume(s_axis_tvalid);
+                assume($stable(s_axis_tdata));
+                assume($stable(s_axis_tlast));
+            end
+
+            if ($past(m_axis_tvalid && !m_axis_tready)) begin
+                assert(m_axis_tvalid);
+                assert($stable(m_axis_tdata));
+                assert($stable(m_axis_tlast));
+            end
+        end
+    end
+`endif
+
+endmodule
+
+`default_nettype wire
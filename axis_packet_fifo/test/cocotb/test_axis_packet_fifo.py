@@ -0,0 +1,271 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, with_timeout
+
+from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
+
+from testbench import TestFactory, StreamCoverage
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
+        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
+
+        max_length = min(2**(dut.ADDR_WIDTH.value-1), 64)
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk, max_length=max_length)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk, max_length=max_length)
+
+    def set_idle_generator(self, generator=None):
+        if generator:
+            self.source.set_pause_generator(generator())
+
+    def set_backpressure_generator(self, generator=None):
+        if generator:
+            self.sink.set_pause_generator(generator())
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+
+@cocotb.test()
+async def run_test(dut, nframes=2000, length_generator=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    length_generator = length_generator or frame_length_fixed
+
+    dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param ADDR_WIDTH = {dut.ADDR_WIDTH.value}")
+    dut._log.info(f"param OPT_STORE_FORWARD = {dut.OPT_STORE_FORWARD.value}")
+    dut._log.info(f"param OPT_DROP = {dut.OPT_DROP.value}")
+
+    data_width = dut.DATA_WIDTH.value
+    max_length = min(2**(dut.ADDR_WIDTH.value-1), 64)
+    opt_drop = dut.OPT_DROP.value and dut.OPT_STORE_FORWARD.value
+
+    await tb.reset()
+
+    stats = dict(first_beat=None, last_beat=0, beats=0, drops=0, max_frame_count=0)
+    done = False
+
+    async def monitor():
+        cycle = 0
+        while not done:
+            await RisingEdge(dut.aclk)
+            cycle += 1
+
+            if dut.frame_drop.value:
+                stats["drops"] += 1
+
+            stats["max_frame_count"] = max(stats["max_frame_count"], int(dut.frame_count.value))
+
+            if dut.m_axis_tvalid.value and dut.m_axis_tready.value:
+                if stats["first_beat"] is None:
+                    stats["first_beat"] = cycle
+                stats["last_beat"] = cycle
+                stats["beats"] += 1
+
+    monitor_task = cocotb.fork(monitor())
+
+    frames = []
+    for nn in range(nframes):
+        frame_data = list(map(int, block_data_random(length_generator(max_length), data_width)))
+        frames.append(frame_data)
+        await tb.source.send(AxiStreamFrame(frame_data))
+
+    await tb.source.wait()
+
+    for _ in range(4):
+        await RisingEdge(dut.aclk)
+
+    while int(dut.frame_count.value) != 0:
+        await RisingEdge(dut.aclk)
+
+    for _ in range(4):
+        await RisingEdge(dut.aclk)
+
+    done = True
+    await monitor_task
+
+    received = []
+    while not tb.sink.empty():
+        received.append(list(tb.sink.recv_nowait().tdata))
+
+    cycles = stats["last_beat"] - stats["first_beat"] + 1
+    throughput = stats["beats"] / cycles
+    dut._log.info(f"{len(received)} frames received, {stats['drops']} dropped")
+    dut._log.info(f"{stats['beats']} beats in {cycles} cycles ({throughput:.3f} beats/cycle)")
+    dut._log.info(f"max frame count = {stats['max_frame_count']}")
+
+    assert len(received) + stats["drops"] == nframes
+
+    if opt_drop:
+        # every delivered frame is intact and in order
+        remaining = iter(frames)
+        assert all(any(frame == sent for sent in remaining) for frame in received)
+    else:
+        assert stats["drops"] == 0
+        assert received == frames
+
+    if backpressure_generator is None:
+        assert stats["drops"] == 0
+
+        if idle_generator is None:
+            assert throughput > 0.9
+
+    assert int(dut.frame_count.value) == 0
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+@cocotb.test()
+async def run_test_oversize(dut, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    data_width = dut.DATA_WIDTH.value
+    depth = 2**dut.ADDR_WIDTH.value
+    store_forward = dut.OPT_STORE_FORWARD.value
+
+    await tb.reset()
+
+    drops = 0
+    done = False
+
+    async def monitor():
+        nonlocal drops
+        while not done:
+            await RisingEdge(dut.aclk)
+            if dut.frame_drop.value:
+                drops += 1
+
+    monitor_task = cocotb.fork(monitor())
+
+    # a frame one beat longer than the FIFO between two that fit
+    frames = [list(map(int, block_data_random(length, data_width)))
+        for length in [depth // 2, depth + 1, depth]]
+    for frame_data in frames:
+        await tb.source.send(AxiStreamFrame(frame_data))
+
+    # the oversize frame must not stall the slave interface forever
+    await with_timeout(tb.source.wait(), 200 * depth, 'ns')
+
+    while int(dut.frame_count.value) != 0 or dut.m_axis_tvalid.value:
+        await RisingEdge(dut.aclk)
+
+    for _ in range(4):
+        await RisingEdge(dut.aclk)
+
+    done = True
+    await monitor_task
+
+    received = []
+    while not tb.sink.empty():
+        received.append(list(tb.sink.recv_nowait().tdata))
+
+    if store_forward:
+        assert drops == 1
+        assert received == [frames[0], frames[2]]
+    else:
+        assert drops == 0
+        assert received == frames
+
+
+def frame_length_fixed(max_length):
+    return max_length
+
+def frame_length_random(max_length):
+    global rng
+    return int(rng.integers(low = 1, high = max_length + 1))
+
+def block_data_random(frame_length, nbits=16):
+    global rng
+    low = 0
+    high = 2**(nbits)
+    return rng.integers(low = low, high = high, size = frame_length)
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+if cocotb.SIM_NAME:
+    factory = TestFactory(run_test)
+    factory.add_option("length_generator", [frame_length_fixed, frame_length_random])
+    factory.add_option("idle_generator", [None, random_pause])
+    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+    factory.generate_tests()
+
+    factory = TestFactory(run_test_oversize)
+    factory.add_option("idle_generator", [None, random_pause])
+    factory.add_option("backpressure_generator", [None, cycle_pause])
+    factory.generate_tests()
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("data_width", [16, 32])
+@pytest.mark.parametrize("addr_width", [6, 10])
+@pytest.mark.parametrize("opt_store_forward", [False, True])
+@pytest.mark.parametrize("opt_drop", [False, True])
+def test_axis_packet_fifo(request, data_width, addr_width, opt_store_forward, opt_drop):
+    dut = "axis_packet_fifo"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv"),
+        os.path.join(root_dir, "bram", "rtl", "bram.sv")
+    ]
+
+    parameters = dict()
+    parameters["DATA_WIDTH"] = data_width
+    parameters["ADDR_WIDTH"] = addr_width
+    parameters["OPT_STORE_FORWARD"] = int(opt_store_forward)
+    parameters["OPT_DROP"] = int(opt_drop)
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
@@ -7,7 +7,11 @@ module axis_packetizer #
     // Width of data bus in bits
     parameter DATA_WIDTH = 16,
     parameter COUNTER_WIDTH = 16,
-    parameter OPT_REGISTER = 0
+    parameter LANES = 1,
+    parameter OPT_REGISTER = 0,
+    parameter OPT_HEADER = 0,
+    parameter SEQUENCE_WIDTH = 32,
+    parameter TIMESTAMP_WIDTH = 32
 )
 (
     input  wire                             aclk,
@@ -18,21 +22,45 @@ module axis_packetizer #
     /*
      * AXI-Stream slave interface
      */
-    input  wire [DATA_WIDTH-1:0]            s_axis_tdata,
+    input  wire [LANES*DATA_WIDTH-1:0]      s_axis_tdata,
     input  wire                             s_axis_tvalid,
     output wire                             s_axis_tready,
 
     /*
      * AXI-Stream master interface
      */
-    output reg  [DATA_WIDTH-1:0]            m_axis_tdata,
+    output reg  [LANES*DATA_WIDTH-1:0]      m_axis_tdata,
+    output reg  [LANES-1:0]                 m_axis_tkeep,
     output reg                              m_axis_tvalid,
     output reg                              m_axis_tlast,
     input  wire                             m_axis_tready
 );
 
+// Each beat carries LANES samples, lane 0 in the least significant bits.
+// frame_length and the counter are in samples; on the final beat of a frame
+// TKEEP (one bit per lane) marks the lanes beyond frame_length as null.
+//
+// With OPT_HEADER each frame is preceded by header beats holding the frame
+// sequence number in the low SEQUENCE_WIDTH bits and a free-running cycle
+// counter timestamp above, zero padded to whole beats. The header is sent
+// once the first sample of the frame is available, while the slave interface
+// is stalled, and the timestamp is the cycle it is first presented.
+
+localparam BEAT_WIDTH = LANES*DATA_WIDTH;
+localparam HEADER_BEATS = (SEQUENCE_WIDTH + TIMESTAMP_WIDTH + BEAT_WIDTH - 1) / BEAT_WIDTH;
+
+// the framed payload stream, before the header is inserted
+reg  [BEAT_WIDTH-1:0]       pkt_axis_tdata;
+reg  [LANES-1:0]            pkt_axis_tkeep;
+reg                         pkt_axis_tvalid;
+reg                         pkt_axis_tlast;
+wire                        pkt_axis_tready;
+
 reg  [COUNTER_WIDTH-1:0]    int_frame_length = 0;
 reg  [COUNTER_WIDTH-1:0]    counter = 0;
+wire [COUNTER_WIDTH-1:0]    remaining;
+
+assign remaining = int_frame_length - counter;
 
 always_ff @(posedge aclk)
     if (counter == 0)
@@ -41,29 +69,37 @@ always_ff @(posedge aclk)
 always_ff @(posedge aclk)
     if (!aresetn)
         counter <= 0;
-    else if (m_axis_tvalid && m_axis_tready && m_axis_tlast)
+    else if (pkt_axis_tvalid && pkt_axis_tready && pkt_axis_tlast)
         counter <= 0;
-    else if (m_axis_tvalid && m_axis_tready)
-        counter <= counter + 1;
+    else if (pkt_axis_tvalid && pkt_axis_tready)
+        counter <= counter + LANES;
+
+always_comb
+    pkt_axis_tlast = (remaining < LANES);
+
+genvar ii;
+generate for (ii = 0; ii < LANES; ii = ii + 1) begin
+    always_comb
+        pkt_axis_tkeep[ii] = !pkt_axis_tlast || (ii <= remaining);
+end endgenerate
 
 generate if (OPT_REGISTER == 0) begin : COMBINATORIAL
 
-    assign m_axis_tdata = s_axis_tdata;
-    assign m_axis_tvalid = s_axis_tvalid;
-    assign m_axis_tlast = (counter == int_frame_length);
+    assign pkt_axis_tdata = s_axis_tdata;
+    assign pkt_axis_tvalid = s_axis_tvalid;
 
-    assign s_axis_tready = m_axis_tready;
+    assign s_axis_tready = pkt_axis_tready;
 
 end else begin : REGISTERED
-    wire [DATA_WIDTH-1:0]   buf_tdata;
+    wire [BEAT_WIDTH-1:0]   buf_tdata;
     wire                    buf_tvalid;
     wire                    stall;
 
-    assign stall = m_axis_tvalid && !m_axis_tready;
+    assign stall = pkt_axis_tvalid && !pkt_axis_tready;
 
     axis_skid_buffer 
     #(
-        .DATA_WIDTH(DATA_WIDTH)
+        .DATA_WIDTH(BEAT_WIDTH)
     ) buffer (   
         .aclk(aclk), 
         .aresetn(aresetn), 
@@ -71,18 +107,76 @@ end else begin : REGISTERED
         .s_axis_tdata(s_axis_tdata), 
         .s_axis_tvalid(s_axis_tvalid), 
         .s_axis_tready(s_axis_tready), 
+        .s_axis_tlast(1'b0), 
 
         .m_axis_tdata(buf_tdata),
         .m_axis_tvalid(buf_tvalid),
+        .m_axis_tlast(),
         .m_axis_tready(!stall)
     );
 
     always_ff @(posedge aclk)
-        m_axis_tvalid <= aresetn && (stall || buf_tvalid);
+        pkt_axis_tvalid <= aresetn && (stall || buf_tvalid);
     
     always_ff @(posedge aclk)
         if (!stall)
-            m_axis_tdata <= buf_tdata;
+            pkt_axis_tdata <= buf_tdata;
+
+end endgenerate
+
+
+generate if (OPT_HEADER) begin : HEADER
+    reg  [$clog2(HEADER_BEATS+1)-1:0]   header_index = 0;
+    reg  [SEQUENCE_WIDTH-1:0]           frame_count = 0;
+    reg  [TIMESTAMP_WIDTH-1:0]          cycle_count = 0;
+    reg  [TIMESTAMP_WIDTH-1:0]          timestamp = 0;
+    wire [HEADER_BEATS*BEAT_WIDTH-1:0]  header_word;
+    wire                                header;
+
+    assign header = (header_index < HEADER_BEATS);
+    assign header_word = (HEADER_BEATS*BEAT_WIDTH)'({timestamp, frame_count});
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            cycle_count <= 0;
+        else
+            cycle_count <= cycle_count + 1;
+
+    // held from the cycle the header is first presented until it is sent
+    always_ff @(posedge aclk)
+        if (!(m_axis_tvalid && header))
+            timestamp <= cycle_count + 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            header_index <= 0;
+            frame_count <= 0;
+        end else if (m_axis_tvalid && m_axis_tready) begin
+            if (header)
+                header_index <= header_index + 1;
+            else if (pkt_axis_tlast) begin
+                header_index <= 0;
+                frame_count <= frame_count + 1;
+            end
+        end
+
+    always_comb begin
+        m_axis_tdata = header ? header_word[header_index*BEAT_WIDTH +: BEAT_WIDTH] : pkt_axis_tdata;
+        m_axis_tkeep = header ? {LANES{1'b1}} : pkt_axis_tkeep;
+        m_axis_tlast = !header && pkt_axis_tlast;
+        m_axis_tvalid = pkt_axis_tvalid;
+    end
+
+    assign pkt_axis_tready = m_axis_tready && !header;
+
+end else begin : NO_HEADER
+
+    assign m_axis_tdata = pkt_axis_tdata;
+    assign m_axis_tkeep = pkt_axis_tkeep;
+    assign m_axis_tlast = pkt_axis_tlast;
+    assign m_axis_tvalid = pkt_axis_tvalid;
+
+    assign pkt_axis_tready = m_axis_tready;
 
 end endgenerate
 
@@ -107,6 +201,7 @@ end endgenerate
                 assert(m_axis_tvalid);
                 assert($stable(m_axis_tdata));
                 assert($stable(m_axis_tlast));
+                assert($stable(m_axis_tkeep));
             end
         end
     end
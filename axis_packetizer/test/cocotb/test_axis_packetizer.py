@@ -1,11 +1,13 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
 from cocotbext.bram import BRAMInterface, SinglePortBRAM
 
+from testbench import TestFactory, StreamCoverage, StreamSoak, parameter, sample_chunks, stream_beats
+from models import Packetizer
+
 import cocotb_test.simulator
 import pytest
 
@@ -16,13 +18,19 @@ import numpy as np
 
 
 class TB:
-    def __init__(self, dut):
+    def __init__(self, dut, drivers=True):
         self.dut = dut
 
         cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
 
-        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
-        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
+        # soak runs drive the interfaces themselves
+        if drivers:
+            # one AXI-Stream "byte" per sample lane, matching the per-lane TKEEP
+            self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False, byte_lanes=dut.LANES.value)
+            self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
 
     def set_idle_generator(self, generator=None):
         if generator:
@@ -51,9 +59,13 @@ def block_data_linear(frame_length):
 def block_data_random(frame_length, nbits=16):
     global rng
     low = 0
-    high = 2**(nbits)+1
+    high = 2**(nbits)
     return rng.integers(low = low, high = high, size = frame_length)
 
+def frame_length_random(max_length):
+    global rng
+    return int(rng.integers(low = 1, high = min(max_length, 300) + 1))
+
 def cycle_pause():
     return itertools.cycle([1, 1, 1, 0])
 
@@ -63,7 +75,6 @@ def random_pause(f = 0.5):
         yield int(rng.uniform() >= f)
 
 
-@cocotb.test()
 async def run_test(dut, nblocks=1, frame_length=128, data_generator=None, pause_generator=None, idle_generator=None):
     tb = TB(dut)
     tb.set_idle_generator(idle_generator)
@@ -73,33 +84,192 @@ async def run_test(dut, nblocks=1, frame_length=128, data_generator=None, pause_
     
     dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
     dut._log.info(f"param COUNTER_WIDTH = {dut.COUNTER_WIDTH.value}")
+    dut._log.info(f"param LANES = {dut.LANES.value}")
     dut._log.info(f"param OPT_REGISTER = {dut.OPT_REGISTER.value}")
+    dut._log.info(f"param OPT_HEADER = {dut.OPT_HEADER.value}")
+
+    lanes = dut.LANES.value
 
+    if callable(frame_length):
+        frame_length = frame_length(2**(dut.COUNTER_WIDTH.value))
     frame_length = frame_length or 2**(dut.COUNTER_WIDTH.value)
+    frame_beats = -(-frame_length // lanes)
+
+    dut._log.info(f"frame length = {frame_length} samples ({frame_beats} beats)")
 
     dut.frame_length <= frame_length
     await tb.reset()
 
+    stats = dict(first_beat=None, last_beat=0, beats=0)
+    done = False
+
+    async def monitor():
+        cycle = 0
+        while not done:
+            await RisingEdge(dut.aclk)
+            cycle += 1
+
+            if dut.m_axis_tvalid.value and dut.m_axis_tready.value:
+                if stats["first_beat"] is None:
+                    stats["first_beat"] = cycle
+                stats["last_beat"] = cycle
+                stats["beats"] += 1
+
+    monitor_task = cocotb.fork(monitor())
+
+    # the lanes beyond frame_length in the final input beat are discarded
+    frames = []
     for nn in range(nblocks):
-        frame_data = data_generator(frame_length)
-        
+        frame_data = data_generator(frame_beats * lanes)
+        frames.append(frame_data[:frame_length])
+
         test_frame = AxiStreamFrame(list(map(int, frame_data)))
         await tb.source.send(test_frame)
-        
+
+    for frame_data in frames:
         recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 20, 'ms')
 
+        assert len(recv_frame.tdata) == frame_length
         assert np.all(recv_frame.tdata == frame_data)
 
+    done = True
+    await monitor_task
+
+    cycles = stats["last_beat"] - stats["first_beat"] + 1
+    dut._log.info(f"{stats['beats']} beats in {cycles} cycles")
+
+    assert stats["beats"] == nblocks * frame_beats
+    if pause_generator is None and idle_generator is None:
+        assert cycles == stats["beats"]
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+async def run_test_soak(dut, frame_length=100, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut, drivers=False)
+
+    lanes = dut.LANES.value
+    data_width = dut.DATA_WIDTH.value
+    model = Packetizer(frame_length, lanes)
+
+    dut.frame_length <= frame_length
+    await tb.reset()
+
+    def beat_data(size):
+        samples = rng.integers(0, 2**data_width, size=(size, lanes))
+        return [sum(int(v) << (ii * data_width) for ii, v in enumerate(beat)) for beat in samples]
+
+    def reference(tdata, tlast):
+        tlast, _ = model.process(1)
+        return [(tdata, int(tlast[0]))]
+
+    soak = StreamSoak(dut, dut.aclk)
+    await soak.run(
+        stimulus=stream_beats(sample_chunks(beat_data)),
+        reference=reference,
+        idle_generator=idle_generator and idle_generator(),
+        backpressure_generator=backpressure_generator and backpressure_generator())
+
+
+async def run_test_header(dut, nframes=16, frame_length=20, idle_generator=None, pause_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_pause_generator(pause_generator)
+
+    lanes = dut.LANES.value
+    data_width = dut.DATA_WIDTH.value
+    sequence_width = dut.SEQUENCE_WIDTH.value
+    timestamp_width = dut.TIMESTAMP_WIDTH.value
+
+    # the header is zero padded to whole beats
+    header_beats = -(-(sequence_width + timestamp_width) // (lanes * data_width))
+    frame_beats = -(-frame_length // lanes)
+
+    dut.frame_length <= frame_length
+    await tb.reset()
+
+    stats = dict(first_beat=None, last_beat=0, beats=0, presented=[])
+    done = False
+
+    # the cycle each header is first presented, and the beats sent
+    async def monitor():
+        cycle = 0
+        position = 0
+        while not done:
+            await RisingEdge(dut.aclk)
+            cycle += 1
+
+            if dut.m_axis_tvalid.value and position == 0 and len(stats["presented"]) == stats["beats"] // (header_beats + frame_beats):
+                stats["presented"].append(cycle)
+
+            if dut.m_axis_tvalid.value and dut.m_axis_tready.value:
+                if stats["first_beat"] is None:
+                    stats["first_beat"] = cycle
+                stats["last_beat"] = cycle
+                stats["beats"] += 1
+                position = 0 if dut.m_axis_tlast.value else position + 1
+
+    monitor_task = cocotb.fork(monitor())
+
+    frames = []
+    for nn in range(nframes):
+        frame_data = block_data_random(frame_beats * lanes, data_width)
+        frames.append(frame_data[:frame_length])
+        await tb.source.send(AxiStreamFrame(list(map(int, frame_data))))
+
+    headers = []
+    for frame_data in frames:
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 20, 'ms')
+
+        assert len(recv_frame.tdata) == header_beats * lanes + frame_length
+        assert np.all(recv_frame.tdata[header_beats * lanes:] == frame_data)
+
+        header = sum(int(v) << (ii * data_width) for ii, v in enumerate(recv_frame.tdata[:header_beats * lanes]))
+        headers.append((header % 2**sequence_width, header >> sequence_width))
+
+    done = True
+    await monitor_task
+
+    # consecutive sequence numbers, and timestamps a fixed offset from the
+    # cycle each header was first presented
+    assert [sequence for sequence, _ in headers] == list(range(nframes))
+    assert len({timestamp - cycle for (_, timestamp), cycle in zip(headers, stats["presented"])}) == 1
+
+    cycles = stats["last_beat"] - stats["first_beat"] + 1
+    dut._log.info(f"{stats['beats']} beats in {cycles} cycles")
+
+    # the header beats fill the cycles the slave interface is stalled, so the
+    # master interface still carries a beat every clock
+    assert stats["beats"] == nframes * (header_beats + frame_beats)
+    if pause_generator is None and idle_generator is None:
+        assert cycles == stats["beats"]
+
     for _ in range(100):
         await RisingEdge(dut.aclk)
 
+
 if cocotb.SIM_NAME:
-    factory = TestFactory(run_test)
-    factory.add_option("nblocks", [1, 4])
-    factory.add_option("frame_length", [None, 128])
-    factory.add_option("data_generator", [block_data_linear, block_data_random])
-    factory.add_option("pause_generator", [None, cycle_pause, random_pause])
-    factory.generate_tests()
+    # the frame and soak tests only apply to builds without headers, the
+    # header tests to builds with them
+    if parameter("OPT_HEADER"):
+        factory = TestFactory(run_test_header)
+        factory.add_option("frame_length", [1, 20])
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("pause_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+    else:
+        factory = TestFactory(run_test)
+        factory.add_option("nblocks", [1, 4])
+        factory.add_option("frame_length", [None, 128, frame_length_random])
+        factory.add_option("data_generator", [block_data_linear, block_data_random])
+        factory.add_option("pause_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+
+        factory = TestFactory(run_test_soak)
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
 
 rng = np.random.default_rng(12345)
 
@@ -111,20 +281,25 @@ root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 @pytest.mark.parametrize("data_width", [16, 32])
 @pytest.mark.parametrize("counter_width", [8, 16])
+@pytest.mark.parametrize("lanes", [1, 2, 4, 8])
 @pytest.mark.parametrize("opt_register", [False, True])
-def test_axis_bram_reader(request, data_width, counter_width, opt_register):
-    dut = "axis_bram_reader"
+@pytest.mark.parametrize("opt_header", [False, True])
+def test_axis_packetizer(request, data_width, counter_width, lanes, opt_register, opt_header):
+    dut = "axis_packetizer"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
 
     verilog_sources = [
-        os.path.join(rtl_dir, f"{dut}.sv")
+        os.path.join(rtl_dir, f"{dut}.sv"),
+        os.path.join(root_dir, "axis_skid_buffer", "rtl", "axis_skid_buffer.sv")
     ]
 
     parameters = dict()
     parameters["DATA_WIDTH"] = data_width
     parameters["COUNTER_WIDTH"] = counter_width
+    parameters["LANES"] = lanes
     parameters["OPT_REGISTER"] = int(opt_register)
+    parameters["OPT_HEADER"] = int(opt_header)
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -132,7 +307,7 @@ def test_axis_bram_reader(request, data_width, counter_width, opt_register):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
@@ -6,12 +6,22 @@ module axis_real_to_complex #
 (
     // Width of data bus in bits
     parameter DATA_WIDTH = 16,
-    parameter OPT_REGISTER = 0
+    parameter OPT_REGISTER = 0,
+    // Digital down-converter: NCO mixer and CIC decimator
+    parameter OPT_DDC = 0,
+    parameter PHASE_WIDTH = 32,
+    parameter LUT_WIDTH = 10,
+    parameter NCO_WIDTH = 16,
+    parameter CIC_STAGES = 3,
+    parameter DECIMATION_WIDTH = 8
 )
 (
     input  wire                             aclk,
     input  wire                             aresetn,
 
+    input  wire [PHASE_WIDTH-1:0]           phase_increment,
+    input  wire [DECIMATION_WIDTH-1:0]      decimation,
+
     /*
      * AXI-Stream slave interface
      */
@@ -29,7 +39,220 @@ module axis_real_to_complex #
     input  wire                             m_axis_tready
 );
 
-generate if (OPT_REGISTER == 0) begin : COMBINATORIAL
+// With OPT_DDC the real input is mixed down with a numerically controlled
+// oscillator, I = x*cos(phase) and Q = -x*sin(phase), and decimated by a
+// CIC_STAGES stage CIC filter by `decimation` (0 for 2**DECIMATION_WIDTH),
+// sampled in reset and at the end of each output's window. The phase advances
+// by phase_increment per input sample, and its top LUT_WIDTH bits address a
+// table of NCO_WIDTH bit cosines. The CIC output is scaled by
+// 2**-(CIC_STAGES*clog2(decimation)), a gain of one for powers of two, and
+// TLAST is set if an input of the window had TLAST. The pipeline advances
+// unless the master interface stalls, so the input runs at one beat per clock.
+
+generate if (OPT_DDC) begin : DDC
+    localparam LUT_SIZE = 2**LUT_WIDTH;
+    localparam CIC_WIDTH = DATA_WIDTH + CIC_STAGES*DECIMATION_WIDTH;
+    localparam real PI = 3.14159265358979323846;
+
+    wire [DATA_WIDTH-1:0]   buf_tdata;
+    wire                    buf_tvalid;
+    wire                    buf_tlast;
+    wire                    stall;
+
+    assign stall = m_axis_tvalid && !m_axis_tready;
+
+    axis_skid_buffer
+    #(
+        .DATA_WIDTH(DATA_WIDTH)
+    ) buffer (
+        .aclk(aclk),
+        .aresetn(aresetn),
+
+        .s_axis_tdata(s_axis_tdata),
+        .s_axis_tvalid(s_axis_tvalid),
+        .s_axis_tready(s_axis_tready),
+        .s_axis_tlast(s_axis_tlast),
+
+        .m_axis_tdata(buf_tdata),
+        .m_axis_tvalid(buf_tvalid),
+        .m_axis_tlast(buf_tlast),
+        .m_axis_tready(!stall)
+    );
+
+    // a period of the cosine, -sin(x) = cos(x + pi/2) is read a quarter
+    // period ahead
+    reg signed [NCO_WIDTH-1:0]      nco_table [LUT_SIZE];
+
+    initial
+        for (int jj = 0; jj < LUT_SIZE; jj = jj + 1)
+            nco_table[jj] = $rtoi($floor((2.0**(NCO_WIDTH-1) - 1) * $cos(2.0*PI*jj/LUT_SIZE) + 0.5));
+
+    // input sample and NCO phase
+    reg  [PHASE_WIDTH-1:0]          phase = 0;
+    reg                             in_valid = 0;
+    reg                             in_last = 0;
+    reg  signed [DATA_WIDTH-1:0]    in_sample = 0;
+    reg  [LUT_WIDTH-1:0]            in_index = 0;
+
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            phase <= 0;
+            in_valid <= 0;
+        end else if (!stall) begin
+            in_valid <= buf_tvalid;
+            if (buf_tvalid) begin
+                in_sample <= buf_tdata;
+                in_last <= buf_tlast;
+                in_index <= phase[PHASE_WIDTH-1 -: LUT_WIDTH];
+                phase <= phase + phase_increment;
+            end
+        end
+
+    // NCO table
+    reg                             nco_valid = 0;
+    reg                             nco_last = 0;
+    reg  signed [DATA_WIDTH-1:0]    nco_sample = 0;
+    reg  signed [NCO_WIDTH-1:0]     nco_cos = 0;
+    reg  signed [NCO_WIDTH-1:0]     nco_msin = 0;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            nco_valid <= 0;
+        else if (!stall)
+            nco_valid <= in_valid;
+
+    always_ff @(posedge aclk)
+        if (!stall) begin
+            nco_sample <= in_sample;
+            nco_last <= in_last;
+            nco_cos <= nco_table[in_index];
+            nco_msin <= nco_table[LUT_WIDTH'(in_index + LUT_SIZE/4)];
+        end
+
+    // mixer, the products truncated to DATA_WIDTH bits
+    wire signed [DATA_WIDTH+NCO_WIDTH-1:0]  product_i;
+    wire signed [DATA_WIDTH+NCO_WIDTH-1:0]  product_q;
+    reg                             mix_valid = 0;
+    reg                             mix_last = 0;
+    reg  signed [DATA_WIDTH-1:0]    mix_i = 0;
+    reg  signed [DATA_WIDTH-1:0]    mix_q = 0;
+
+    assign product_i = nco_sample * nco_cos;
+    assign product_q = nco_sample * nco_msin;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            mix_valid <= 0;
+        else if (!stall)
+            mix_valid <= nco_valid;
+
+    always_ff @(posedge aclk)
+        if (!stall) begin
+            mix_last <= nco_last;
+            mix_i <= product_i[NCO_WIDTH-1 +: DATA_WIDTH];
+            mix_q <= product_q[NCO_WIDTH-1 +: DATA_WIDTH];
+        end
+
+    // CIC integrators at the input rate, wrapping in CIC_WIDTH bits
+    reg  signed [CIC_WIDTH-1:0]     integrator_i [CIC_STAGES];
+    reg  signed [CIC_WIDTH-1:0]     integrator_q [CIC_STAGES];
+    reg  [DECIMATION_WIDTH-1:0]     int_decimation = 0;
+    reg  [DECIMATION_WIDTH-1:0]     counter = 0;
+    reg  [$clog2(DECIMATION_WIDTH+1)-1:0] log2_decimation;
+    reg                             window_last = 0;
+    reg                             decimate = 0;
+    reg                             dec_last = 0;
+    reg  [$clog2(CIC_STAGES*DECIMATION_WIDTH+1)-1:0] dec_shift = 0;
+    wire                            window_end;
+
+    assign window_end = mix_valid && (counter == int_decimation);
+
+    // clog2 of the decimation, the bit length of decimation - 1
+    always_comb begin
+        log2_decimation = 0;
+        for (int kk = 0; kk < DECIMATION_WIDTH; kk = kk + 1)
+            if (int_decimation[kk])
+                log2_decimation = kk + 1;
+    end
+
+    always_ff @(posedge aclk)
+        if (!aresetn || (!stall && window_end))
+            int_decimation <= decimation - 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            for (int kk = 0; kk < CIC_STAGES; kk = kk + 1) begin
+                integrator_i[kk] <= 0;
+                integrator_q[kk] <= 0;
+            end
+            counter <= 0;
+            window_last <= 0;
+            decimate <= 0;
+        end else if (!stall) begin
+            decimate <= window_end;
+            if (mix_valid) begin
+                integrator_i[0] <= integrator_i[0] + mix_i;
+                integrator_q[0] <= integrator_q[0] + mix_q;
+                for (int kk = 1; kk < CIC_STAGES; kk = kk + 1) begin
+                    integrator_i[kk] <= integrator_i[kk] + integrator_i[kk-1];
+                    integrator_q[kk] <= integrator_q[kk] + integrator_q[kk-1];
+                end
+
+                counter <= window_end ? 0 : counter + 1;
+                window_last <= !window_end && (window_last || mix_last);
+            end
+        end
+
+    always_ff @(posedge aclk)
+        if (!stall && window_end) begin
+            dec_last <= window_last || mix_last;
+            dec_shift <= CIC_STAGES*log2_decimation;
+        end
+
+    // CIC combs at the output rate, on the integrators after the last input
+    // of the window
+    reg  signed [CIC_WIDTH-1:0]     comb_i [CIC_STAGES+1];
+    reg  signed [CIC_WIDTH-1:0]     comb_q [CIC_STAGES+1];
+    reg  signed [CIC_WIDTH-1:0]     delay_i [CIC_STAGES];
+    reg  signed [CIC_WIDTH-1:0]     delay_q [CIC_STAGES];
+    wire signed [CIC_WIDTH-1:0]     scaled_i;
+    wire signed [CIC_WIDTH-1:0]     scaled_q;
+
+    always_comb begin
+        comb_i[0] = integrator_i[CIC_STAGES-1];
+        comb_q[0] = integrator_q[CIC_STAGES-1];
+        for (int kk = 0; kk < CIC_STAGES; kk = kk + 1) begin
+            comb_i[kk+1] = comb_i[kk] - delay_i[kk];
+            comb_q[kk+1] = comb_q[kk] - delay_q[kk];
+        end
+    end
+
+    assign scaled_i = comb_i[CIC_STAGES] >>> dec_shift;
+    assign scaled_q = comb_q[CIC_STAGES] >>> dec_shift;
+
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            for (int kk = 0; kk < CIC_STAGES; kk = kk + 1) begin
+                delay_i[kk] <= 0;
+                delay_q[kk] <= 0;
+            end
+        end else if (!stall && decimate) begin
+            for (int kk = 0; kk < CIC_STAGES; kk = kk + 1) begin
+                delay_i[kk] <= comb_i[kk];
+                delay_q[kk] <= comb_q[kk];
+            end
+        end
+
+    always_ff @(posedge aclk)
+        m_axis_tvalid <= aresetn && (stall || decimate);
+
+    always_ff @(posedge aclk)
+        if (!stall) begin
+            m_axis_tdata <= {scaled_q[DATA_WIDTH-1:0], scaled_i[DATA_WIDTH-1:0]};
+            m_axis_tlast <= dec_last;
+        end
+
+end else if (OPT_REGISTER == 0) begin : COMBINATORIAL
 
     assign m_axis_tdata = {{DATA_WIDTH{1'b0}}, s_axis_tdata};
     assign m_axis_tvalid = s_axis_tvalid;
@@ -1,10 +1,13 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout
-from cocotb.regression import TestFactory
 
 from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
 
+from testbench import TestFactory, StreamCoverage, StreamSoak, Throughput, parameter, sample_chunks, stream_beats
+from testbench import cached_reference, open_trace, trace_chunks, trace_path
+from models import DownConverter, complex_parts, real_to_complex, to_signed
+
 import cocotb_test.simulator
 import pytest
 
@@ -14,13 +17,22 @@ import numpy as np
 
 
 class TB:
-    def __init__(self, dut):
+    def __init__(self, dut, drivers=True):
         self.dut = dut
 
         cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
 
-        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
-        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False, byte_lanes=2)
+        # soak runs drive the interfaces themselves
+        if drivers:
+            self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False)
+            self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False, byte_lanes=2)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+        self.s_axis_throughput = Throughput(dut, "s_axis", dut.aclk)
+
+        dut.phase_increment.setimmediatevalue(0)
+        dut.decimation.setimmediatevalue(1)
 
     def set_idle_generator(self, generator=None):
         if generator:
@@ -42,20 +54,20 @@ class TB:
         await RisingEdge(self.dut.aclk)
 
 
-@cocotb.test()
 async def run_test(dut, nblocks=1, frame_length=32, data_generator=None, idle_generator=None, backpressure_generator=None):
     tb = TB(dut)
     tb.set_idle_generator(idle_generator)
     tb.set_backpressure_generator(backpressure_generator)
 
     data_generator = data_generator or (lambda x: np.full(x, 10))
-    
+    data_width = dut.DATA_WIDTH.value
+
     await tb.reset()
 
     for nn in range(nblocks):
         frame_data = data_generator(frame_length)
-        imag_data = [0] * frame_length
-        expected_output = [val for pair in zip(frame_data, imag_data) for val in pair]
+        real, imag = complex_parts(real_to_complex(frame_data, data_width), data_width)
+        expected_output = np.stack([real, imag], axis=1).reshape(-1)
 
         test_frame = AxiStreamFrame(list(map(int, frame_data)))
         await tb.source.send(test_frame)
@@ -67,8 +79,7 @@ async def run_test(dut, nblocks=1, frame_length=32, data_generator=None, idle_ge
 
         dut._log.info(f"RX Frame Data = {recv_frame.tdata}")
 
-        recv_data = np.array(recv_frame.tdata)
-        recv_data = ((recv_data & 0xFFFF) ^ 0x8000) - 0x8000
+        recv_data = to_signed(recv_frame.tdata, data_width)
 
         assert len(recv_frame.tdata) == 2 * frame_length
         assert np.all(recv_data == expected_output)
@@ -90,13 +101,129 @@ def random_pause(f = 0.5):
     while True:
         yield int(rng.uniform() >= f)
 
+async def run_test_soak(dut, frame_length=128, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut, drivers=False)
+
+    data_width = dut.DATA_WIDTH.value
+
+    await tb.reset()
+
+    def reference(tdata, tlast):
+        return [(int(real_to_complex(tdata, data_width)), tlast)]
+
+    soak = StreamSoak(dut, dut.aclk)
+    await soak.run(
+        stimulus=stream_beats(sample_chunks(lambda size: rng.integers(0, 2**data_width, size)), frame_length),
+        reference=reference,
+        idle_generator=idle_generator and idle_generator(),
+        backpressure_generator=backpressure_generator and backpressure_generator())
+
+
+async def run_test_trace(dut, frame_length=1024, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut, drivers=False)
+
+    data_width = dut.DATA_WIDTH.value
+    path, key = trace_path()
+    trace = open_trace(path, key)
+
+    dut._log.info(f"trace {path}: {len(trace)} samples")
+
+    def compute():
+        start = 0
+        for chunk in trace_chunks(trace):
+            tlast = np.arange(start, start + len(chunk)) % frame_length == frame_length - 1
+            yield dict(tdata=real_to_complex(chunk, data_width), tlast=tlast)
+            start += len(chunk)
+
+    expected = cached_reference(path, "axis_real_to_complex", dict(key=key, DATA_WIDTH=data_width,
+        frame_length=frame_length), len(trace), compute)
+
+    def expected_beats(size=65536):
+        for n in range(0, len(trace), size):
+            yield from zip(map(int, expected["tdata"][n:n+size]), map(int, expected["tlast"][n:n+size]))
+
+    await tb.reset()
+
+    soak = StreamSoak(dut, dut.aclk)
+    await soak.run(
+        stimulus=stream_beats(trace_chunks(trace, width=data_width), frame_length),
+        expected=expected_beats(),
+        beats=len(trace),
+        idle_generator=idle_generator and idle_generator(),
+        backpressure_generator=backpressure_generator and backpressure_generator())
+
+
+async def run_test_ddc(dut, nframes=8, frame_length=64, phase_increment=0x0c000000, decimation=4,
+        idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    data_width = dut.DATA_WIDTH.value
+    model = DownConverter(phase_increment, decimation, data_width,
+        phase_width=dut.PHASE_WIDTH.value, lut_width=dut.LUT_WIDTH.value, nco_width=dut.NCO_WIDTH.value,
+        stages=dut.CIC_STAGES.value, decimation_width=dut.DECIMATION_WIDTH.value)
+
+    dut._log.info(f"phase increment = {phase_increment:#x}, decimation = {decimation}")
+
+    # the decimation is sampled in reset
+    dut.phase_increment <= phase_increment
+    dut.decimation <= decimation
+    await tb.reset()
+
+    frames = [block_data_random(frame_length, data_width) for _ in range(nframes)]
+    for frame_data in frames:
+        await tb.source.send(AxiStreamFrame(list(map(int, frame_data))))
+
+    # frames a multiple of the decimation keep their TLAST
+    for frame_data in frames:
+        tdata, _ = model.process(frame_data, np.arange(frame_length) == frame_length - 1)
+        real, imag = complex_parts(tdata, data_width)
+
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 100, 'us')
+        recv_data = to_signed(recv_frame.tdata, data_width)
+
+        assert len(recv_frame.tdata) == 2 * frame_length // decimation
+        assert np.all(recv_data == np.stack([real, imag], axis=1).reshape(-1))
+
+    beats_per_clock = tb.s_axis_throughput.beats_per_clock
+    dut._log.info(f"input: {beats_per_clock:.3f} beats per clock")
+
+    # the output rate is a fraction of the input, which runs at full rate
+    # unless the output stalls
+    if idle_generator is None and backpressure_generator is None:
+        assert beats_per_clock == 1.0
+
+
 if cocotb.SIM_NAME:
-    factory = TestFactory(run_test)
-    factory.add_option("frame_length", [64, 128])
-    factory.add_option("data_generator", [block_data_linear, block_data_random])
-    factory.add_option("idle_generator", [None, cycle_pause, random_pause])
-    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
-    factory.generate_tests()
+    # the down-converter tests only apply to OPT_DDC = 1 builds, the frame,
+    # soak and trace tests of the pass-through to the others
+    if parameter("OPT_DDC"):
+        factory = TestFactory(run_test_ddc)
+        factory.add_option("phase_increment", [0x0c000000, 0x2aaaaaab, 0xf0000000])
+        factory.add_option("decimation", [1, 4, 16])
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+    else:
+        factory = TestFactory(run_test)
+        factory.add_option("frame_length", [64, 128])
+        factory.add_option("data_generator", [block_data_linear, block_data_random])
+        factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+        factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+        factory.generate_tests()
+
+        factory = TestFactory(run_test_soak)
+        factory.add_option("idle_generator", [None, random_pause])
+        factory.add_option("backpressure_generator", [None, random_pause])
+        factory.generate_tests()
+
+        # replay of a recorded trace, TRACE=<path>[:<array>]
+        if trace_path():
+            factory = TestFactory(run_test_trace)
+            factory.add_option("idle_generator", [None, random_pause])
+            factory.add_option("backpressure_generator", [None, random_pause])
+            factory.generate_tests()
 
 rng = np.random.default_rng(12345)
 
@@ -108,7 +235,8 @@ root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 @pytest.mark.parametrize("opt_register", [False, True])
 @pytest.mark.parametrize("data_width", [16, 24, 32])
-def test_axis_real_to_complex(request, data_width, opt_register):
+@pytest.mark.parametrize("opt_ddc", [False, True])
+def test_axis_real_to_complex(request, data_width, opt_register, opt_ddc):
     dut = "axis_real_to_complex"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -121,6 +249,7 @@ def test_axis_real_to_complex(request, data_width, opt_register):
     parameters = dict()
     parameters["DATA_WIDTH"] = data_width
     parameters["OPT_REGISTER"] = int(opt_register)
+    parameters["OPT_DDC"] = int(opt_ddc)
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -128,7 +257,7 @@ def test_axis_real_to_complex(request, data_width, opt_register):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
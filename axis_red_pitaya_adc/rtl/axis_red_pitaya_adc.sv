@@ -39,7 +39,7 @@ always_ff @(posedge aclk)
 always_comb
     m_axis_tdata = {{(PAD_WIDTH+1){~adc_reg[ADC_DATA_WIDTH-1]}}, adc_reg[ADC_DATA_WIDTH-2:0]};
 
-always_ff
+always_ff @(posedge aclk)
     m_axis_tvalid <= aresetn;
 
 endmodule
@@ -0,0 +1,105 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+
+from testbench import TestFactory, StreamCoverage, StreamSoak, sample_chunks, stream_beats
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+
+async def run_test_soak(dut, frame_length=64, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+
+    data_width = dut.DATA_WIDTH.value
+
+    await tb.reset()
+
+    # beats and their tlast pass through in order, whatever the stalls
+    def reference(tdata, tlast):
+        return [(tdata, tlast)]
+
+    soak = StreamSoak(dut, dut.aclk)
+    await soak.run(
+        stimulus=stream_beats(sample_chunks(lambda size: rng.integers(0, 2**data_width, size)), frame_length),
+        reference=reference,
+        idle_generator=idle_generator and idle_generator(),
+        backpressure_generator=backpressure_generator and backpressure_generator())
+
+
+if cocotb.SIM_NAME:
+    factory = TestFactory(run_test_soak)
+    factory.add_option("frame_length", [1, 64])
+    factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+    factory.generate_tests()
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("data_width", [16, 32])
+def test_axis_skid_buffer(request, data_width):
+    dut = "axis_skid_buffer"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv")
+    ]
+
+    parameters = dict()
+    parameters["DATA_WIDTH"] = data_width
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
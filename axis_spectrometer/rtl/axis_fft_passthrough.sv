@@ -0,0 +1,41 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+// Stand-in for an FFT core with the same streaming interface: complex
+// samples ({imag, real}) are passed through unchanged, frames are kept intact.
+module axis_fft_passthrough #
+(
+    // Width of a real or imaginary component in bits
+    parameter DATA_WIDTH = 16
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    /*
+     * AXI-Stream slave interface
+     */
+    input  wire [2*DATA_WIDTH-1:0]          s_axis_tdata,
+    input  wire                             s_axis_tvalid,
+    input  wire                             s_axis_tlast,
+    output wire                             s_axis_tready,
+
+    /*
+     * AXI-Stream master interface
+     */
+    output reg  [2*DATA_WIDTH-1:0]          m_axis_tdata,
+    output reg                              m_axis_tvalid,
+    output reg                              m_axis_tlast,
+    input  wire                             m_axis_tready
+);
+
+assign m_axis_tdata = s_axis_tdata;
+assign m_axis_tvalid = s_axis_tvalid;
+assign m_axis_tlast = s_axis_tlast;
+
+assign s_axis_tready = m_axis_tready;
+
+endmodule
+
+`default_nettype wire
@@ -0,0 +1,268 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+// Reference spectrometer pipeline:
+// ADC -> packetizer -> real to complex -> FFT (stand-in) -> accumulator -> recorder
+module axis_spectrometer #
+(
+    parameter ADC_DATA_WIDTH = 14,
+    // Width of a sample on the AXI-Stream links in bits
+    parameter DATA_WIDTH = 16,
+    parameter OUTPUT_DATA_WIDTH = 24,
+    parameter CHANNELS = 1024,
+    parameter RATE_WIDTH = 8,
+    parameter AXI_DATA_WIDTH = 32,
+    parameter OPT_REGISTER = 1,
+    localparam AXI_ADDR_WIDTH = $clog2(CHANNELS) + 2
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    input  wire [ADC_DATA_WIDTH-1:0]        adc_in,
+
+    input  wire [RATE_WIDTH-1:0]            rate,
+
+    input  wire                             enable,
+    input  wire                             trigger,
+    output wire                             interrupt,
+
+    /*
+     * AXI4-Lite Slave Interface
+     */
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_araddr,
+    input  wire [2:0]                       s_axil_arprot,
+    input  wire                             s_axil_arvalid,
+    output wire                             s_axil_arready,
+
+    output wire [AXI_DATA_WIDTH-1:0]        s_axil_rdata,
+    output wire [1:0]                       s_axil_rresp,
+    output wire                             s_axil_rvalid,
+    input  wire                             s_axil_rready,
+
+    input  wire [AXI_ADDR_WIDTH-1:0]        s_axil_awaddr,
+    input  wire [2:0]                       s_axil_awprot,
+    input  wire                             s_axil_awvalid,
+    output wire                             s_axil_awready,
+
+    input  wire [AXI_DATA_WIDTH-1:0]        s_axil_wdata,
+    input  wire [AXI_DATA_WIDTH/8-1:0]      s_axil_wstrb,
+    input  wire                             s_axil_wvalid,
+    output wire                             s_axil_wready,
+
+    output wire [1:0]                       s_axil_bresp,
+    output wire                             s_axil_bvalid,
+    input  wire                             s_axil_bready
+);
+
+localparam COUNTER_WIDTH = $clog2(CHANNELS) + 1;
+
+
+wire [DATA_WIDTH-1:0]           adc_axis_tdata;
+wire                            adc_axis_tvalid;
+wire                            adc_axis_tready;
+
+wire [DATA_WIDTH-1:0]           pkt_axis_tdata;
+wire                            pkt_axis_tvalid;
+wire                            pkt_axis_tlast;
+wire                            pkt_axis_tready;
+
+wire [2*DATA_WIDTH-1:0]         r2c_axis_tdata;
+wire                            r2c_axis_tvalid;
+wire                            r2c_axis_tlast;
+wire                            r2c_axis_tready;
+
+wire [2*DATA_WIDTH-1:0]         fft_axis_tdata;
+wire                            fft_axis_tvalid;
+wire                            fft_axis_tlast;
+wire                            fft_axis_tready;
+
+wire [OUTPUT_DATA_WIDTH-1:0]    acc_axis_tdata;
+wire                            acc_axis_tvalid;
+wire                            acc_axis_tlast;
+wire                            acc_axis_tready;
+
+
+axis_red_pitaya_adc
+#(
+    .ADC_DATA_WIDTH(ADC_DATA_WIDTH),
+    .AXIS_DATA_WIDTH(DATA_WIDTH)
+) adc (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .adc_in(adc_in),
+
+    .m_axis_tdata(adc_axis_tdata),
+    .m_axis_tvalid(adc_axis_tvalid),
+    .m_axis_tready(adc_axis_tready)
+);
+
+axis_packetizer
+#(
+    .DATA_WIDTH(DATA_WIDTH),
+    .COUNTER_WIDTH(COUNTER_WIDTH),
+    .OPT_REGISTER(OPT_REGISTER)
+) packetizer (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .frame_length(COUNTER_WIDTH'(CHANNELS)),
+
+    .s_axis_tdata(adc_axis_tdata),
+    .s_axis_tvalid(adc_axis_tvalid),
+    .s_axis_tready(adc_axis_tready),
+
+    .m_axis_tdata(pkt_axis_tdata),
+    .m_axis_tkeep(),
+    .m_axis_tvalid(pkt_axis_tvalid),
+    .m_axis_tlast(pkt_axis_tlast),
+    .m_axis_tready(pkt_axis_tready)
+);
+
+axis_real_to_complex
+#(
+    .DATA_WIDTH(DATA_WIDTH),
+    .OPT_REGISTER(OPT_REGISTER)
+) real_to_complex (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .phase_increment('0),
+    .decimation('0),
+
+    .s_axis_tdata(pkt_axis_tdata),
+    .s_axis_tvalid(pkt_axis_tvalid),
+    .s_axis_tlast(pkt_axis_tlast),
+    .s_axis_tready(pkt_axis_tready),
+
+    .m_axis_tdata(r2c_axis_tdata),
+    .m_axis_tvalid(r2c_axis_tvalid),
+    .m_axis_tlast(r2c_axis_tlast),
+    .m_axis_tready(r2c_axis_tready)
+);
+
+axis_fft_passthrough
+#(
+    .DATA_WIDTH(DATA_WIDTH)
+) fft (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .s_axis_tdata(r2c_axis_tdata),
+    .s_axis_tvalid(r2c_axis_tvalid),
+    .s_axis_tlast(r2c_axis_tlast),
+    .s_axis_tready(r2c_axis_tready),
+
+    .m_axis_tdata(fft_axis_tdata),
+    .m_axis_tvalid(fft_axis_tvalid),
+    .m_axis_tlast(fft_axis_tlast),
+    .m_axis_tready(fft_axis_tready)
+);
+
+// the accumulator integrates the real part of the FFT output
+axis_multichannel_accumulator
+#(
+    .INPUT_DATA_WIDTH(DATA_WIDTH),
+    .OUTPUT_DATA_WIDTH(OUTPUT_DATA_WIDTH),
+    .CHANNELS(CHANNELS),
+    .RATE_WIDTH(RATE_WIDTH)
+) accumulator (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .rate(rate),
+
+    .s_axis_tdata(fft_axis_tdata[DATA_WIDTH-1:0]),
+    .s_axis_tvalid(fft_axis_tvalid),
+    .s_axis_tlast(fft_axis_tlast),
+    .s_axis_tready(fft_axis_tready),
+
+    .m_axis_tdata(acc_axis_tdata),
+    .m_axis_tvalid(acc_axis_tvalid),
+    .m_axis_tlast(acc_axis_tlast),
+    .m_axis_tready(acc_axis_tready),
+
+    // the results are read through the recorder
+    .snapshot(1'b0),
+    .snapshot_valid(),
+
+    .s_axil_araddr('0),
+    .s_axil_arprot(3'b0),
+    .s_axil_arvalid(1'b0),
+    .s_axil_arready(),
+    .s_axil_rdata(),
+    .s_axil_rresp(),
+    .s_axil_rvalid(),
+    .s_axil_rready(1'b0),
+    .s_axil_awaddr('0),
+    .s_axil_awprot(3'b0),
+    .s_axil_awvalid(1'b0),
+    .s_axil_awready(),
+    .s_axil_wdata(32'b0),
+    .s_axil_wstrb(4'b0),
+    .s_axil_wvalid(1'b0),
+    .s_axil_wready(),
+    .s_axil_bresp(),
+    .s_axil_bvalid(),
+    .s_axil_bready(1'b0)
+);
+
+axi_axis_recorder
+#(
+    .AXI_DATA_WIDTH(AXI_DATA_WIDTH),
+    .AXI_ADDR_WIDTH(AXI_ADDR_WIDTH),
+    .DATA_WIDTH(OUTPUT_DATA_WIDTH),
+    .OPT_TRIGGER(1)
+) recorder (
+    .aclk(aclk),
+    .aresetn(aresetn),
+
+    .enable(enable),
+    .trigger(trigger),
+    .interrupt(interrupt),
+
+    .irq_threshold(8'd0),
+    .irq_timeout(16'd0),
+    .irq_ack(1'b0),
+    .irq_pending(),
+
+    .post_trigger({(AXI_ADDR_WIDTH-2){1'b0}}),
+    .wrap_index(),
+    .captured(),
+
+    .s_axil_araddr(s_axil_araddr),
+    .s_axil_arprot(s_axil_arprot),
+    .s_axil_arvalid(s_axil_arvalid),
+    .s_axil_arready(s_axil_arready),
+
+    .s_axil_rdata(s_axil_rdata),
+    .s_axil_rresp(s_axil_rresp),
+    .s_axil_rvalid(s_axil_rvalid),
+    .s_axil_rready(s_axil_rready),
+
+    .s_axil_awaddr(s_axil_awaddr),
+    .s_axil_awprot(s_axil_awprot),
+    .s_axil_awvalid(s_axil_awvalid),
+    .s_axil_awready(s_axil_awready),
+
+    .s_axil_wdata(s_axil_wdata),
+    .s_axil_wstrb(s_axil_wstrb),
+    .s_axil_wvalid(s_axil_wvalid),
+    .s_axil_wready(s_axil_wready),
+
+    .s_axil_bresp(s_axil_bresp),
+    .s_axil_bvalid(s_axil_bvalid),
+    .s_axil_bready(s_axil_bready),
+
+    .s_axis_tdata(acc_axis_tdata),
+    .s_axis_tstrb({(OUTPUT_DATA_WIDTH/8){1'b0}}),
+    .s_axis_tvalid(acc_axis_tvalid),
+    .s_axis_tlast(acc_axis_tlast),
+    .s_axis_tready(acc_axis_tready)
+);
+
+endmodule
+
+`default_nettype wire
@@ -0,0 +1,284 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+
+from cocotbext.axi import AxiLiteBus, AxiLiteMaster
+
+from testbench import TestFactory, open_trace, trace_path
+from models import Spectrometer, adc_codes, red_pitaya_adc
+
+import cocotb_test.simulator
+import pytest
+
+import collections
+import os
+import os.path
+import time
+import numpy as np
+
+
+# stream links of the pipeline, upstream first, with the core consuming each
+LINKS = [
+    ("adc_axis", "packetizer"),
+    ("pkt_axis", "real_to_complex"),
+    ("r2c_axis", "fft"),
+    ("fft_axis", "accumulator"),
+    ("acc_axis", "recorder"),
+]
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        self.axil_master = AxiLiteMaster(AxiLiteBus.from_prefix(dut, "s_axil"), dut.aclk, dut.aresetn, False)
+
+        dut.adc_in <= 0
+        dut.rate <= 1
+        dut.enable <= 0
+        dut.trigger <= 0
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+
+
+def adc_data_random(nsamples, nbits=14):
+    global rng
+    return rng.integers(low = 0, high = 2**nbits, size = nsamples)
+
+def adc_data_tone(nsamples, nbits=14):
+    global rng
+    n = np.arange(nsamples)
+    amplitude = 2**(nbits-1) - 1
+    tone = amplitude * np.sin(2 * np.pi * 0.0625 * n + rng.uniform(0, 2 * np.pi))
+    return (np.round(tone).astype(np.int64) + 2**(nbits-1)) % 2**nbits
+
+
+# signed ADC samples recorded in TRACE, looped
+def adc_data_trace(nsamples, nbits=14):
+    global trace_position
+    trace = open_trace(*trace_path())
+    indices = (trace_position + np.arange(nsamples)) % len(trace)
+    trace_position += nsamples
+    return adc_codes(trace[indices], nbits)
+
+
+@cocotb.test()
+async def run_test(dut, rate=4, nspectra=None, data_generator=None):
+    tb = TB(dut)
+
+    data_generator = data_generator or adc_data_random
+    nspectra = nspectra or int(os.environ.get("SPECTROMETER_SPECTRA", "8"))
+
+    dut._log.info(f"param ADC_DATA_WIDTH = {dut.ADC_DATA_WIDTH.value}")
+    dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param OUTPUT_DATA_WIDTH = {dut.OUTPUT_DATA_WIDTH.value}")
+    dut._log.info(f"param CHANNELS = {dut.CHANNELS.value}")
+    dut._log.info(f"param OPT_REGISTER = {dut.OPT_REGISTER.value}")
+
+    adc_width = dut.ADC_DATA_WIDTH.value
+    data_width = dut.DATA_WIDTH.value
+    channels = dut.CHANNELS.value
+    # record a spectrum from the middle of the run
+    trigger_spectrum = nspectra // 2
+
+    model = Spectrometer(channels, rate, adc_width, data_width, dut.OUTPUT_DATA_WIDTH.value)
+    # spectra expected from the model, oldest first
+    expected = collections.deque()
+
+    dut.rate <= rate
+    await tb.reset()
+    dut.enable <= 1
+
+    stats = {name: dict(beats=0, stalls=0, idle=0) for name, _ in LINKS}
+    stall_origin = collections.Counter()
+    latency = dict(min=None, max=0, total=0, count=0)
+    state = dict(spectra=0, beat=0, interrupts=0, recorded=None, errors=0)
+
+    # ADC codes driven on adc_in; the ADC register accepts the code driven
+    # on the previous cycle, so only a short history is kept
+    history = collections.deque(maxlen=2)
+    # acceptance cycles of the final frame samples of each spectrum in flight
+    in_flight = collections.deque()
+
+    def samples():
+        while True:
+            yield from map(int, data_generator(4096, adc_width))
+
+    source = samples()
+    wall_start = time.perf_counter()
+    cycle = 0
+    previous_interrupt = 0
+
+    while state["spectra"] < nspectra:
+        code = next(source)
+        dut.adc_in <= code
+        history.append(code)
+
+        await RisingEdge(dut.aclk)
+        cycle += 1
+
+        handshakes = []
+        origin = None
+        for name, consumer in LINKS:
+            valid = getattr(dut, f"{name}_tvalid").value
+            ready = getattr(dut, f"{name}_tready").value
+            if valid and ready:
+                stats[name]["beats"] += 1
+                handshakes.append(name)
+            elif valid:
+                stats[name]["stalls"] += 1
+                origin = consumer
+            else:
+                stats[name]["idle"] += 1
+
+        # backpressure travels upstream, so the most downstream stalled link
+        # names the core that caused it
+        if origin is not None:
+            stall_origin[origin] += 1
+
+        if "adc_axis" in handshakes:
+            sample = int(dut.adc_axis_tdata.value)
+            if sample != red_pitaya_adc(history[0], adc_width, data_width):
+                state["errors"] += 1
+            if model.accumulator.counter == model.accumulator.rate - 1:
+                in_flight.append(cycle)
+            expected.extend(model.process([history[0]]))
+
+        if "acc_axis" in handshakes:
+            spectrum = expected[0]
+            index = state["beat"]
+
+            if index == 0 and dut.trigger.value and state["recorded"] is None:
+                state["recorded"] = spectrum
+            if int(dut.acc_axis_tdata.value) != spectrum[index]:
+                state["errors"] += 1
+            if int(dut.acc_axis_tlast.value) != (index == channels - 1):
+                state["errors"] += 1
+
+            delay = cycle - in_flight.popleft()
+            latency["min"] = delay if latency["min"] is None else min(latency["min"], delay)
+            latency["max"] = max(latency["max"], delay)
+            latency["total"] += delay
+            latency["count"] += 1
+
+            if index == channels - 1:
+                expected.popleft()
+                state["beat"] = 0
+                state["spectra"] += 1
+                if state["spectra"] == trigger_spectrum:
+                    dut.trigger <= 1
+            else:
+                state["beat"] += 1
+
+        interrupt = int(dut.interrupt.value)
+        if interrupt and not previous_interrupt:
+            state["interrupts"] += 1
+        previous_interrupt = interrupt
+
+    wall_time = time.perf_counter() - wall_start
+
+    # the interrupt for the final spectrum follows its last beat
+    for _ in range(4):
+        await RisingEdge(dut.aclk)
+        interrupt = int(dut.interrupt.value)
+        if interrupt and not previous_interrupt:
+            state["interrupts"] += 1
+        previous_interrupt = interrupt
+
+    for name, _ in LINKS:
+        s = stats[name]
+        dut._log.info(f"{name}: {s['beats']} beats, {s['stalls']} stalls, {s['idle']} idle "
+                      f"({s['beats']/cycle:.3f} beats/cycle)")
+
+    dut._log.info(f"stall origin: {dict(stall_origin) or 'none'}")
+    dut._log.info(f"latency: min {latency['min']}, max {latency['max']}, "
+                  f"mean {latency['total']/latency['count']:.1f} cycles")
+    dut._log.info(f"{nspectra} spectra, {cycle} cycles in {wall_time:.1f} s "
+                  f"({cycle/wall_time:.0f} cycles/s)")
+
+    assert state["errors"] == 0
+    assert state["interrupts"] == nspectra
+
+    # the ADC never waits, so the pipeline sustains one sample per cycle
+    assert stats["adc_axis"]["stalls"] == 0
+    assert not stall_origin
+
+    # latency is fixed when nothing stalls
+    assert latency["min"] == latency["max"]
+
+    assert state["recorded"] is not None
+
+    for addr in range(channels):
+        response = await tb.axil_master.read(addr*4, 4)
+        data = int.from_bytes(response.data, 'little', signed=False)
+
+        assert data == state["recorded"][addr]
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+if cocotb.SIM_NAME:
+    factory = TestFactory(run_test)
+    factory.add_option("rate", [1, 4])
+    factory.add_option("data_generator", [adc_data_random, adc_data_tone] + ([adc_data_trace] if trace_path() else []))
+    factory.generate_tests()
+
+
+rng = np.random.default_rng(12345)
+trace_position = 0
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("channels", [64, 256])
+@pytest.mark.parametrize("opt_register", [0, 1])
+def test_axis_spectrometer(request, channels, opt_register):
+    dut = "axis_spectrometer"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv"),
+        os.path.join(rtl_dir, "axis_fft_passthrough.sv"),
+        os.path.join(root_dir, "axis_red_pitaya_adc", "rtl", "axis_red_pitaya_adc.sv"),
+        os.path.join(root_dir, "axis_packetizer", "rtl", "axis_packetizer.sv"),
+        os.path.join(root_dir, "axis_real_to_complex", "rtl", "axis_real_to_complex.sv"),
+        os.path.join(root_dir, "axis_multichannel_accumulator", "rtl", "axis_multichannel_accumulator.sv"),
+        os.path.join(root_dir, "axis_skid_buffer", "rtl", "axis_skid_buffer.sv"),
+        os.path.join(root_dir, "axi_axis_recorder", "rtl", "axi_axis_recorder.sv"),
+        os.path.join(root_dir, "axi_bram_interface", "rtl", "axi_bram_interface.sv"),
+        os.path.join(root_dir, "axis_bram_writer", "rtl", "axis_bram_writer_trigger.sv"),
+        os.path.join(root_dir, "bram", "rtl", "bram.sv")
+    ]
+
+    parameters = dict()
+    parameters["CHANNELS"] = channels
+    parameters["OPT_REGISTER"] = opt_register
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
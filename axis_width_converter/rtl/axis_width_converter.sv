@@ -0,0 +1,178 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+
+module axis_width_converter #
+(
+    // Width of a lane (sample) in bits
+    parameter DATA_WIDTH = 16,
+    // Lanes per beat, one a multiple of the other
+    parameter S_LANES = 1,
+    parameter M_LANES = 4
+)
+(
+    input  wire                             aclk,
+    input  wire                             aresetn,
+
+    /*
+     * AXI-Stream slave interface
+     */
+    input  wire [S_LANES*DATA_WIDTH-1:0]    s_axis_tdata,
+    input  wire [S_LANES-1:0]               s_axis_tkeep,
+    input  wire                             s_axis_tvalid,
+    input  wire                             s_axis_tlast,
+    output wire                             s_axis_tready,
+
+    /*
+     * AXI-Stream master interface
+     */
+    output reg  [M_LANES*DATA_WIDTH-1:0]    m_axis_tdata,
+    output reg  [M_LANES-1:0]               m_axis_tkeep,
+    output reg                              m_axis_tvalid,
+    output reg                              m_axis_tlast,
+    input  wire                             m_axis_tready
+);
+
+// Lane 0 is in the least significant bits and TKEEP has one bit per lane, as
+// in axis_packetizer. Lanes are sent in order, so a frame keeps its samples
+// whatever the ratio; a TLAST beat closes the wide beat being packed, with
+// the lanes beyond it null, and trailing null lanes of a wide beat are not
+// sent on the narrow side.
+
+localparam S_WIDTH = S_LANES*DATA_WIDTH;
+localparam M_WIDTH = M_LANES*DATA_WIDTH;
+
+generate if (M_LANES > S_LANES) begin : UPSIZE
+
+    localparam RATIO = M_LANES / S_LANES;
+    localparam INDEX_WIDTH = $clog2(RATIO);
+
+    reg  [INDEX_WIDTH-1:0]  index = 0;
+    wire                    s_axis_valid;
+    wire                    complete;
+
+    // the wide beat is packed in place in the output register, so the
+    // slave interface only waits while a complete beat is held
+    assign s_axis_tready = aresetn && (!m_axis_tvalid || m_axis_tready);
+    assign s_axis_valid = s_axis_tvalid && s_axis_tready;
+    assign complete = s_axis_tlast || (index == RATIO - 1);
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            index <= 0;
+        else if (s_axis_valid)
+            index <= complete ? 0 : index + 1;
+
+    always_ff @(posedge aclk)
+        if (!aresetn)
+            m_axis_tvalid <= 1'b0;
+        else if (s_axis_valid && complete)
+            m_axis_tvalid <= 1'b1;
+        else if (m_axis_tready)
+            m_axis_tvalid <= 1'b0;
+
+    integer jj;
+    always_ff @(posedge aclk)
+        if (s_axis_valid) begin
+            for (jj = 0; jj < RATIO; jj = jj + 1)
+                if (jj == index) begin
+                    m_axis_tdata[jj*S_WIDTH +: S_WIDTH] <= s_axis_tdata;
+                    m_axis_tkeep[jj*S_LANES +: S_LANES] <= s_axis_tkeep;
+                end else if (index == 0) begin
+                    m_axis_tdata[jj*S_WIDTH +: S_WIDTH] <= 0;
+                    m_axis_tkeep[jj*S_LANES +: S_LANES] <= 0;
+                end
+
+            m_axis_tlast <= s_axis_tlast;
+        end
+
+end else if (S_LANES > M_LANES) begin : DOWNSIZE
+
+    localparam RATIO = S_LANES / M_LANES;
+    localparam INDEX_WIDTH = $clog2(RATIO);
+
+    reg  [S_WIDTH-1:0]      buf_tdata;
+    reg  [S_LANES-1:0]      buf_tkeep;
+    reg                     buf_tlast;
+    reg                     buf_tvalid = 1'b0;
+    reg  [INDEX_WIDTH-1:0]  index = 0;
+    wire                    s_axis_valid;
+    wire                    final_slice;
+
+    // no lane of the wide beat is kept beyond the current slice
+    assign final_slice = !(|(buf_tkeep >> ((index + 1)*M_LANES)));
+
+    assign s_axis_tready = aresetn && (!buf_tvalid || (m_axis_tready && final_slice));
+    assign s_axis_valid = s_axis_tvalid && s_axis_tready;
+
+    always_ff @(posedge aclk)
+        if (!aresetn) begin
+            buf_tvalid <= 1'b0;
+            index <= 0;
+        end else if (s_axis_valid) begin
+            buf_tvalid <= 1'b1;
+            index <= 0;
+        end else if (m_axis_tvalid && m_axis_tready) begin
+            if (final_slice)
+                buf_tvalid <= 1'b0;
+            else
+                index <= index + 1;
+        end
+
+    always_ff @(posedge aclk)
+        if (s_axis_valid) begin
+            buf_tdata <= s_axis_tdata;
+            buf_tkeep <= s_axis_tkeep;
+            buf_tlast <= s_axis_tlast;
+        end
+
+    always_comb begin
+        m_axis_tdata = buf_tdata[index*M_WIDTH +: M_WIDTH];
+        m_axis_tkeep = buf_tkeep[index*M_LANES +: M_LANES];
+        m_axis_tvalid = buf_tvalid;
+        m_axis_tlast = buf_tlast && final_slice;
+    end
+
+end else begin : PASSTHROUGH
+
+    assign m_axis_tdata = s_axis_tdata;
+    assign m_axis_tkeep = s_axis_tkeep;
+    assign m_axis_tvalid = s_axis_tvalid;
+    assign m_axis_tlast = s_axis_tlast;
+
+    assign s_axis_tready = m_axis_tready;
+
+end endgenerate
+
+
+`ifdef FORMAL
+    reg	f_past_valid = 1'b0;
+    always @(posedge aclk)
+        f_past_valid <= 1'b1;
+
+    always @(*)
+        if (!f_past_valid)
+            assume(!aresetn);
+
+    always @(posedge aclk) begin
+        if (f_past_valid && $past(aresetn)) begin
+            if ($past(s_axis_tvalid && !s_axis_tready)) begin
+                assume(s_axis_tvalid);
+                assume($stable(s_axis_tdata));
+                assume($stable(s_axis_tkeep));
+                assume($stable(s_axis_tlast));
+            end
+
+            if ($past(m_axis_tvalid && !m_axis_tready)) begin
+                assert(m_axis_tvalid);
+                assert($stable(m_axis_tdata));
+                assert($stable(m_axis_tkeep));
+                assert($stable(m_axis_tlast));
+            end
+        end
+    end
+`endif
+
+endmodule
+
+`default_nettype wire
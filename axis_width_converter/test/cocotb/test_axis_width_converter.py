@@ -0,0 +1,152 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, with_timeout
+
+from cocotbext.axi import AxiStreamBus, AxiStreamFrame, AxiStreamSource, AxiStreamSink
+
+from testbench import TestFactory, StreamCoverage, Throughput
+
+import cocotb_test.simulator
+import pytest
+
+import itertools
+import os.path
+import numpy as np
+
+
+class TB:
+    def __init__(self, dut):
+        self.dut = dut
+
+        cocotb.fork(Clock(dut.aclk, 10, units="ns").start())
+
+        # one AXI-Stream "byte" per sample lane, matching the per-lane TKEEP
+        self.source = AxiStreamSource(AxiStreamBus.from_prefix(dut, "s_axis"), dut.aclk, dut.aresetn, False, byte_lanes=dut.S_LANES.value)
+        self.sink = AxiStreamSink(AxiStreamBus.from_prefix(dut, "m_axis"), dut.aclk, dut.aresetn, False, byte_lanes=dut.M_LANES.value)
+
+        self.s_axis_coverage = StreamCoverage(dut, "s_axis", dut.aclk)
+        self.m_axis_coverage = StreamCoverage(dut, "m_axis", dut.aclk)
+        self.s_axis_throughput = Throughput(dut, "s_axis", dut.aclk)
+        self.m_axis_throughput = Throughput(dut, "m_axis", dut.aclk)
+
+    def set_idle_generator(self, generator=None):
+        if generator:
+            self.source.set_pause_generator(generator())
+
+    def set_backpressure_generator(self, generator=None):
+        if generator:
+            self.sink.set_pause_generator(generator())
+
+    async def reset(self):
+        self.dut.aresetn.setimmediatevalue(1)
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 0
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+        self.dut.aresetn <= 1
+        await RisingEdge(self.dut.aclk)
+        await RisingEdge(self.dut.aclk)
+
+
+async def run_test(dut, nframes=32, length_generator=None, idle_generator=None, backpressure_generator=None):
+    tb = TB(dut)
+    tb.set_idle_generator(idle_generator)
+    tb.set_backpressure_generator(backpressure_generator)
+
+    length_generator = length_generator or frame_length_random
+
+    dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
+    dut._log.info(f"param S_LANES = {dut.S_LANES.value}")
+    dut._log.info(f"param M_LANES = {dut.M_LANES.value}")
+
+    data_width = dut.DATA_WIDTH.value
+    s_lanes = dut.S_LANES.value
+    m_lanes = dut.M_LANES.value
+
+    await tb.reset()
+
+    frames = []
+    for nn in range(nframes):
+        frame_data = list(map(int, rng.integers(0, 2**data_width, length_generator(s_lanes, m_lanes))))
+        frames.append(frame_data)
+        await tb.source.send(AxiStreamFrame(frame_data))
+
+    for frame_data in frames:
+        recv_frame = await with_timeout(cocotb.fork(tb.sink.recv()), 100, 'us')
+        assert recv_frame.tdata == frame_data
+
+    # every beat is full but the last of a frame, on both sides
+    assert tb.s_axis_throughput.beats == sum(-(-len(frame) // s_lanes) for frame in frames)
+    assert tb.m_axis_throughput.beats == sum(-(-len(frame) // m_lanes) for frame in frames)
+
+    # the narrow side runs at one beat per clock, so the wide side carries a
+    # full beat every ratio clocks
+    if idle_generator is None and backpressure_generator is None:
+        narrow = tb.s_axis_throughput if s_lanes <= m_lanes else tb.m_axis_throughput
+        assert narrow.beats_per_clock == 1.0
+
+    for _ in range(100):
+        await RisingEdge(dut.aclk)
+
+
+def frame_length_random(s_lanes, m_lanes, max_length=64):
+    global rng
+    return int(rng.integers(low = 1, high = max_length + 1))
+
+def frame_length_full(s_lanes, m_lanes):
+    return 4 * max(s_lanes, m_lanes)
+
+def cycle_pause():
+    return itertools.cycle([1, 1, 1, 0])
+
+def random_pause(f = 0.5):
+    global rng
+    while True:
+        yield int(rng.uniform() >= f)
+
+if cocotb.SIM_NAME:
+    factory = TestFactory(run_test)
+    factory.add_option("length_generator", [frame_length_random, frame_length_full])
+    factory.add_option("idle_generator", [None, cycle_pause, random_pause])
+    factory.add_option("backpressure_generator", [None, cycle_pause, random_pause])
+    factory.generate_tests()
+
+rng = np.random.default_rng(12345)
+
+
+tests_dir = os.path.dirname(__file__)
+rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
+root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
+
+
+@pytest.mark.parametrize("data_width", [16, 32])
+@pytest.mark.parametrize("s_lanes,m_lanes", [(1, 2), (1, 4), (2, 4), (2, 2), (2, 1), (4, 1), (4, 2)])
+def test_axis_width_converter(request, data_width, s_lanes, m_lanes):
+    dut = "axis_width_converter"
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    toplevel = dut
+
+    verilog_sources = [
+        os.path.join(rtl_dir, f"{dut}.sv")
+    ]
+
+    parameters = dict()
+    parameters["DATA_WIDTH"] = data_width
+    parameters["S_LANES"] = s_lanes
+    parameters["M_LANES"] = m_lanes
+
+    extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
+
+    sim_build = os.path.join(tests_dir, "sim_build",
+        request.node.name.replace('[', '-').replace(']', ''))
+
+    cocotb_test.simulator.run(
+        python_search=[tests_dir, root_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        parameters=parameters,
+        sim_build=sim_build,
+        extra_env=extra_env,
+    )
@@ -7,6 +7,9 @@ module bram #
     // Width of data bus in bits
     parameter DATA_WIDTH = 32,
     parameter ADDR_WIDTH = 12,
+    // Read latency in cycles, 2 or more adds output registers. Like the
+    // block RAM output register they are not gated by the enable.
+    parameter READ_LATENCY = 1,
     localparam WE_WIDTH = (DATA_WIDTH + 4)/8
 )
 (
@@ -35,11 +38,15 @@ module bram #
 );
 
 reg [DATA_WIDTH-1:0] memory [(2**ADDR_WIDTH)-1:0];
+reg [DATA_WIDTH-1:0] pipe_a [READ_LATENCY-1:0];
+reg [DATA_WIDTH-1:0] pipe_b [READ_LATENCY-1:0];
 genvar ii;
 
 initial begin
-    outa = {DATA_WIDTH{1'b0}};
-    outb = {DATA_WIDTH{1'b0}};
+    for (int ii = 0; ii < READ_LATENCY; ii = ii + 1) begin
+        pipe_a[ii] = {DATA_WIDTH{1'b0}};
+        pipe_b[ii] = {DATA_WIDTH{1'b0}};
+    end
 
     for (int ii = 0; ii < 2**ADDR_WIDTH; ii = ii + 1) begin
         memory[ii] = {DATA_WIDTH{1'b0}};
@@ -49,9 +56,20 @@ end
 always_ff @(posedge clka)
     if (ena)
         if (rsta)
-            outa <= {DATA_WIDTH{1'b0}};
+            pipe_a[0] <= {DATA_WIDTH{1'b0}};
+        else
+            pipe_a[0] <= memory[addra];
+
+generate for (ii = 1; ii < READ_LATENCY; ii = ii + 1) begin
+    always_ff @(posedge clka)
+        if (rsta)
+            pipe_a[ii] <= {DATA_WIDTH{1'b0}};
         else
-            outa <= memory[addra];
+            pipe_a[ii] <= pipe_a[ii-1];
+end endgenerate
+
+always_comb
+    outa = pipe_a[READ_LATENCY-1];
 
 generate for (ii = 0; ii < WE_WIDTH; ii = ii + 1) begin
     always_ff @(posedge clka) begin
@@ -63,9 +81,20 @@ end endgenerate
 always_ff @(posedge clkb)
     if (enb)
         if (rstb)
-            outb <= {DATA_WIDTH{1'b0}};
+            pipe_b[0] <= {DATA_WIDTH{1'b0}};
         else
-            outb <= memory[addrb];
+            pipe_b[0] <= memory[addrb];
+
+generate for (ii = 1; ii < READ_LATENCY; ii = ii + 1) begin
+    always_ff @(posedge clkb)
+        if (rstb)
+            pipe_b[ii] <= {DATA_WIDTH{1'b0}};
+        else
+            pipe_b[ii] <= pipe_b[ii-1];
+end endgenerate
+
+always_comb
+    outb = pipe_b[READ_LATENCY-1];
 
 generate for (ii = 0; ii < WE_WIDTH; ii = ii + 1) begin
     always_ff @(posedge clkb)
@@ -1,12 +1,14 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, with_timeout, Timer
-from cocotb.regression import TestFactory
+
+from testbench import TestFactory
 
 import cocotb_test.simulator
 import pytest
 
 import logging
+import collections
 import itertools
 import os.path
 import numpy as np
@@ -70,8 +72,10 @@ async def run_test_single_clock(dut, n_writes = 500, clock_periods = (10, 10), d
     
     dut._log.info(f"param DATA_WIDTH = {dut.DATA_WIDTH.value}")
     dut._log.info(f"param ADDR_WIDTH = {dut.ADDR_WIDTH.value}")
+    dut._log.info(f"param READ_LATENCY = {dut.READ_LATENCY.value}")
 
     data_width = dut.DATA_WIDTH.value
+    read_latency = dut.READ_LATENCY.value
     we_width = math.ceil(data_width/8)
 
     bram_size = 2**(dut.ADDR_WIDTH.value)
@@ -104,17 +108,23 @@ async def run_test_single_clock(dut, n_writes = 500, clock_periods = (10, 10), d
     for _ in range(20):
         await RisingEdge(dut.clka)
 
+    # one read per cycle, each on the output READ_LATENCY cycles later
     dut.ena <= 1
-    for addr, write in writes.items():
-        data, we = write
-        dut._log.debug(f"Read from {addr:d}")
-
-        dut.addra <= addr
+    pending = collections.deque()
+    for addr, write in list(writes.items()) + [(None, None)] * (read_latency - 1):
+        if addr is not None:
+            dut._log.debug(f"Read from {addr:d}")
+            dut.addra <= addr
+        pending.append(write)
 
         await RisingEdge(dut.clka)
         await Timer(1, units="ns")
 
-        assert mask_we(dut.outa.value, we, we_width) == mask_we(data, we, we_width)
+        if len(pending) == read_latency:
+            write = pending.popleft()
+            if write is not None:
+                data, we = write
+                assert mask_we(dut.outa.value, we, we_width) == mask_we(data, we, we_width)
 
     dut.ena <= 0
 
@@ -138,8 +148,9 @@ rtl_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', 'rtl'))
 root_dir = os.path.abspath(os.path.join(tests_dir, '..', '..', '..'))
 
 
+@pytest.mark.parametrize("read_latency", [1, 2])
 @pytest.mark.parametrize("addr_width", [12, 16])
-def test_bram(request, addr_width):
+def test_bram(request, addr_width, read_latency):
     dut = "bram"
     module = os.path.splitext(os.path.basename(__file__))[0]
     toplevel = dut
@@ -150,6 +161,7 @@ def test_bram(request, addr_width):
 
     parameters = dict()
     parameters["ADDR_WIDTH"] = addr_width
+    parameters["READ_LATENCY"] = read_latency
 
     extra_env = {f'PARAM_{k}': str(v) for k, v in parameters.items()}
 
@@ -157,7 +169,7 @@ def test_bram(request, addr_width):
         request.node.name.replace('[', '-').replace(']', ''))
 
     cocotb_test.simulator.run(
-        python_search=[tests_dir],
+        python_search=[tests_dir, root_dir],
         verilog_sources=verilog_sources,
         toplevel=toplevel,
         module=module,
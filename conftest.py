@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from testbench import dependencies, telemetry
+from testbench.regression import covering_rows, covering_strength, is_nightly
+
+
+def pytest_addoption(parser):
+    parser.addoption("--nightly", action="store_true",
+        help="run the full product of parametrizations and test factory options")
+    parser.addoption("--sim-profile", action="store_true",
+        help="profile every generated cocotb test (see testbench.profiling)")
+    parser.addoption("--changed-since", metavar="REV", default=None,
+        help="only run testbenches whose sources changed since a git revision")
+
+
+def pytest_configure(config):
+    # the simulations inherit the environment, so this also selects the
+    # full TestFactory products
+    if config.getoption("--nightly"):
+        os.environ["REGRESSION"] = "nightly"
+
+    if config.getoption("--sim-profile"):
+        os.environ["PROFILE"] = "1"
+
+    telemetry.run_id()
+
+
+def unaffected_items(items, revision):
+    """Items of testbenches whose sources did not change since `revision`."""
+    affected = dependencies.affected(dependencies.changed_files(revision))
+    return [item for item in items
+            if "cocotb" in str(item.fspath) and os.path.dirname(str(item.fspath)) not in affected]
+
+
+def uncovered_items(items):
+    """Parametrizations outside the covering array of each cocotb entry point."""
+    groups = {}
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is None or "cocotb" not in str(item.fspath):
+            continue
+        key = (item.module.__name__, item.originalname)
+        groups.setdefault(key, []).append(item)
+
+    deselected = []
+    for group in groups.values():
+        names = sorted(group[0].callspec.indices)
+        rows = [tuple(item.callspec.indices[name] for name in names) for item in group]
+        selected = set(covering_rows(rows, covering_strength()))
+        deselected.extend(item for index, item in enumerate(group) if index not in selected)
+
+    return deselected
+
+
+def pytest_collection_modifyitems(config, items):
+    deselected = []
+
+    revision = config.getoption("--changed-since")
+    if revision:
+        deselected.extend(unaffected_items(items, revision))
+
+    if not is_nightly():
+        deselected.extend(uncovered_items(items))
+
+    if deselected:
+        removed = set(map(id, deselected))
+        config.hook.pytest_deselected(items=[item for item in items if id(item) in removed])
+        items[:] = [item for item in items if id(item) not in removed]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+
+    # one record per simulation run by a cocotb entry point
+    if report.when == "call" and telemetry.telemetry_enabled() and "cocotb" in str(item.fspath):
+        callspec = getattr(item, "callspec", None)
+        module = item.module.__name__
+        telemetry.record("pytest", telemetry.core_name(module), f"{module}::{item.originalname}",
+            callspec.params if callspec else {}, os.environ.get("SIM", "icarus"),
+            report.outcome, report.duration)
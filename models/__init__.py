@@ -0,0 +1,15 @@
+"""Bit-accurate NumPy models of the cores in this repository.
+
+The models are vectorized and keep their state between calls, so a stream
+can be processed in chunks of any size. They do not depend on cocotb and
+serve both as scoreboard references in the testbenches and for studies on
+recorded data.
+"""
+
+from .accumulator import MultichannelAccumulator
+from .adc import adc_codes, red_pitaya_adc
+from .fixed import to_signed, to_unsigned
+from .packetizer import Packetizer
+from .real_to_complex import DownConverter, complex_parts, nco_table, real_to_complex
+from .recorder import Recorder
+from .spectrometer import Spectrometer
@@ -0,0 +1,117 @@
+"""Model of axis_multichannel_accumulator."""
+
+import numpy as np
+
+from .fixed import to_signed, to_unsigned
+from .real_to_complex import complex_parts
+
+
+class MultichannelAccumulator:
+    """Output beats of axis_multichannel_accumulator.
+
+    Input frames, delimited by TLAST, are summed channel by channel over
+    `rate` frames in INPUT_DATA_WIDTH + RATE_WIDTH bit accumulators, and the
+    sums are output as a frame of OUTPUT_DATA_WIDTH bit TDATA (truncated, or
+    sign-extended if wider) on the last frame. As in the RTL, the output is
+    the accumulator memory plus the input of the last frame, so with a rate
+    of 1 it is the sum of the last two frames.
+
+    With `opt_complex` the inputs are complex TDATA, as from
+    axis_real_to_complex, and their power I*I + Q*Q is summed unsigned in
+    2*INPUT_DATA_WIDTH + RATE_WIDTH bits. With 2 I and Q are also summed,
+    and the output TDATA are rows of (power, I, Q) fields.
+
+    Frames are at most `channels` long. Samples after the last TLAST of a
+    call are held until their frame ends.
+    """
+
+    def __init__(self, rate, channels=1024, input_width=16, output_width=None, rate_width=8, opt_complex=0):
+        # the RATE_WIDTH bit counter compares with rate - 1
+        self.rate = (rate - 1) % 2**rate_width + 1
+        self.channels = channels
+        self.input_width = input_width
+        self.opt_complex = opt_complex
+
+        # the accumulator width and signedness of each field
+        acc_width = input_width + rate_width
+        power_width = 2 * input_width + rate_width
+        fields = {0: [(acc_width, True)],
+                  1: [(power_width, False)],
+                  2: [(power_width, False), (acc_width, True), (acc_width, True)]}[opt_complex]
+        self.acc_width = np.array([width for width, _ in fields])
+        self.signed = np.array([signed for _, signed in fields])
+        self.output_width = output_width or int(self.acc_width[0])
+
+        self.memory = np.zeros((channels, len(fields)), dtype=np.int64)
+        self.counter = 0
+        self.partial = np.zeros((0, len(fields)), dtype=np.int64)
+
+    def _wrap(self, values):
+        return np.where(self.signed, to_signed(values, self.acc_width), to_unsigned(values, self.acc_width))
+
+    def _terms(self, tdata):
+        # the values summed for each input beat, one column per field
+        if not self.opt_complex:
+            return to_signed(tdata, self.input_width)[:, None]
+
+        real, imag = complex_parts(tdata, self.input_width)
+        power = real * real + imag * imag
+        return np.stack([power] if self.opt_complex == 1 else [power, real, imag], axis=-1)
+
+    def _output(self, values):
+        fields = to_unsigned(self._wrap(values), self.output_width)
+        return fields[:, 0] if len(self.acc_width) == 1 else fields
+
+    def _frame(self, frame):
+        address = np.arange(len(frame)) % self.channels
+        value = self.memory[address] + frame
+
+        output = value if self.counter == self.rate - 1 else None
+        self.memory[address] = self._wrap(frame if self.counter == 0 else value)
+        self.counter = (self.counter + 1) % self.rate
+        return output
+
+    def _frames(self, frames):
+        # vectorized over frames of equal length
+        nframes, length, _ = frames.shape
+        carry = self.memory[:length]
+
+        if self.rate == 1:
+            outputs = frames + np.concatenate([carry[None], frames[:-1]])
+            self.memory[:length] = frames[-1]
+            return outputs
+
+        starts = [0] + list(range(self.rate - self.counter, nframes, self.rate))
+        sums = np.add.reduceat(frames, starts, axis=0)
+        if self.counter:
+            sums[0] += carry
+
+        complete = (self.counter + nframes) // self.rate
+        self.memory[:length] = self._wrap(sums[-1])
+        self.counter = (self.counter + nframes) % self.rate
+        return sums[:complete]
+
+    def process(self, tdata, tlast):
+        """TDATA and TLAST of the output beats for a sequence of input beats."""
+        nfields = len(self.acc_width)
+        data = np.concatenate([self.partial, self._terms(tdata)])
+        ends = np.flatnonzero(tlast) + len(self.partial) + 1
+
+        if not len(ends):
+            self.partial = data
+            return self._output(np.zeros((0, nfields), dtype=np.int64)), np.zeros(0, dtype=np.int64)
+
+        self.partial = data[ends[-1]:]
+        lengths = np.diff(ends, prepend=0)
+
+        if np.all(lengths == lengths[0]) and lengths[0] <= self.channels:
+            outputs = self._frames(data[:ends[-1]].reshape(-1, lengths[0], nfields))
+            values = outputs.reshape(-1, nfields)
+            last = np.tile(np.arange(lengths[0]) == lengths[0] - 1, len(outputs))
+        else:
+            outputs = [self._frame(data[end-length:end]) for end, length in zip(ends, lengths)]
+            outputs = [output for output in outputs if output is not None] or [np.zeros((0, nfields), dtype=np.int64)]
+            values = np.concatenate(outputs)
+            last = np.concatenate([np.arange(len(output)) == len(output) - 1 for output in outputs])
+
+        return self._output(values), last.astype(np.int64)
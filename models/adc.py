@@ -0,0 +1,25 @@
+"""Model of axis_red_pitaya_adc."""
+
+import numpy as np
+
+from .fixed import to_signed, to_unsigned
+
+
+def red_pitaya_adc(codes, adc_width=14, data_width=16):
+    """TDATA of axis_red_pitaya_adc for a sequence of offset binary ADC codes.
+
+    The MSB of the code is inverted, giving the two's complement sample,
+    which is sign-extended to `data_width` bits.
+    """
+    codes = to_unsigned(codes, adc_width)
+    samples = to_signed(codes ^ (1 << (adc_width - 1)), adc_width)
+    return to_unsigned(samples, data_width)
+
+
+def adc_codes(samples, adc_width=14):
+    """Offset binary ADC codes of signed samples, saturated at full scale.
+
+    The inverse of `red_pitaya_adc`, to replay recorded samples.
+    """
+    samples = np.clip(np.asarray(samples, dtype=np.int64), -2**(adc_width-1), 2**(adc_width-1) - 1)
+    return to_unsigned(samples, adc_width) ^ (1 << (adc_width - 1))
@@ -0,0 +1,17 @@
+"""Fixed-width two's complement arithmetic of the HDL, on NumPy arrays.
+
+Widths are limited to 63 bits, the values are held in int64.
+"""
+
+import numpy as np
+
+
+def to_unsigned(values, width):
+    """Bit patterns of `values` truncated to `width` bits."""
+    return np.asarray(values, dtype=np.int64) & ((1 << width) - 1)
+
+
+def to_signed(values, width):
+    """Two's complement values of the low `width` bits of `values`."""
+    values = to_unsigned(values, width)
+    return values - ((values >> (width - 1)) << width)
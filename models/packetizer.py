@@ -0,0 +1,30 @@
+"""Model of axis_packetizer."""
+
+import numpy as np
+
+
+class Packetizer:
+    """TLAST and TKEEP of axis_packetizer at a fixed frame length.
+
+    The data passes unchanged. Each beat carries `lanes` samples and a frame
+    `frame_length` samples; the final beat of a frame has TLAST set and its
+    TKEEP (one bit per lane) clears the lanes beyond the frame length.
+    """
+
+    def __init__(self, frame_length, lanes=1):
+        self.frame_length = frame_length
+        self.lanes = lanes
+        self.frame_beats = -(-frame_length // lanes)
+        self.tail = frame_length - (self.frame_beats - 1) * lanes
+
+        # beats already sent of the current frame
+        self.position = 0
+
+    def process(self, nbeats):
+        """TLAST and TKEEP of the next `nbeats` beats."""
+        index = (self.position + np.arange(nbeats)) % self.frame_beats
+        self.position = (self.position + nbeats) % self.frame_beats
+
+        tlast = (index == self.frame_beats - 1).astype(np.int64)
+        tkeep = np.where(tlast, (1 << self.tail) - 1, (1 << self.lanes) - 1)
+        return tlast, tkeep
@@ -0,0 +1,120 @@
+"""Model of axis_real_to_complex."""
+
+import numpy as np
+
+from .fixed import to_signed, to_unsigned
+
+
+def real_to_complex(tdata, data_width=16):
+    """Complex TDATA of 2*`data_width` bits for real TDATA.
+
+    The real part is in the low half and the imaginary part, zero, in the
+    high half. TLAST passes unchanged.
+    """
+    return to_unsigned(tdata, data_width)
+
+
+def complex_parts(tdata, data_width=16):
+    """Signed real and imaginary parts of complex TDATA."""
+    tdata = np.asarray(tdata, dtype=np.uint64)
+    mask = np.uint64((1 << data_width) - 1)
+
+    real = (tdata & mask).astype(np.int64)
+    imag = ((tdata >> np.uint64(data_width)) & mask).astype(np.int64)
+    return to_signed(real, data_width), to_signed(imag, data_width)
+
+
+def nco_table(lut_width=10, nco_width=16):
+    """Cosine table of the NCO of axis_real_to_complex, rounded to `nco_width` bits."""
+    index = np.arange(2**lut_width)
+    amplitude = 2**(nco_width - 1) - 1
+    return np.floor(amplitude * np.cos(2 * np.pi * index / 2**lut_width) + 0.5).astype(np.int64)
+
+
+class DownConverter:
+    """Complex TDATA and TLAST of axis_real_to_complex with OPT_DDC.
+
+    The real input is mixed with the NCO table, I = x*cos and Q = -x*sin
+    truncated to `data_width` bits, and decimated by `decimation` in a CIC
+    filter of `stages` integrators and combs wrapping in
+    data_width + stages*decimation_width bits. As in the RTL, each integrator
+    adds the previous value of the one before it, and the output is scaled by
+    2**-(stages*clog2(decimation)). TLAST is set if an input of the
+    decimation window had TLAST.
+    """
+
+    def __init__(self, phase_increment, decimation, data_width=16, phase_width=32, lut_width=10,
+                 nco_width=16, stages=3, decimation_width=8):
+        self.phase_increment = phase_increment % 2**phase_width
+        self.decimation = (decimation - 1) % 2**decimation_width + 1
+        self.data_width = data_width
+        self.phase_width = phase_width
+        self.lut_width = lut_width
+        self.nco_width = nco_width
+        self.cic_width = data_width + stages * decimation_width
+        self.shift = stages * (self.decimation - 1).bit_length()
+
+        self.table = nco_table(lut_width, nco_width)
+
+        self.phase = 0
+        self.integrators = np.zeros((stages, 2), dtype=np.int64)
+        self.delays = np.zeros((stages, 2), dtype=np.int64)
+        # input samples and TLAST of the current window
+        self.position = 0
+        self.window_last = False
+
+    def mix(self, tdata):
+        """I and Q of the mixer, one row per input sample."""
+        x = to_signed(tdata, self.data_width)
+        phase = (self.phase + self.phase_increment * np.arange(len(x), dtype=np.int64)) % 2**self.phase_width
+        self.phase = int(self.phase + self.phase_increment * len(x)) % 2**self.phase_width
+
+        index = phase >> (self.phase_width - self.lut_width)
+        cos = self.table[index]
+        msin = self.table[(index + 2**self.lut_width // 4) % 2**self.lut_width]
+
+        # the product shifted down by nco_width - 1 and truncated
+        shift = self.nco_width - 1
+        return to_signed(np.stack([x * cos >> shift, x * msin >> shift], axis=-1), self.data_width)
+
+    def _integrate(self, mixed):
+        # each integrator adds the value of the one before it prior to the
+        # sample; the int64 sums wrap modulo 2**64, which keeps the low
+        # cic_width bits exact
+        values = mixed
+        for stage in range(len(self.integrators)):
+            if stage:
+                values = np.concatenate([self.integrators[stage - 1][None], previous[:-1]])
+            previous = to_signed(self.integrators[stage] + np.cumsum(values, axis=0), self.cic_width)
+            if stage:
+                self.integrators[stage - 1] = last
+            last = previous[-1]
+        self.integrators[-1] = last
+        return previous
+
+    def _window_last(self, tlast, ends):
+        last = np.zeros(len(ends), dtype=np.int64)
+        start = 0
+        for ii, end in enumerate(ends):
+            last[ii] = self.window_last or tlast[start:end+1].any()
+            self.window_last = False
+            start = end + 1
+        self.window_last = self.window_last or bool(tlast[start:].any())
+        return last
+
+    def process(self, tdata, tlast):
+        """TDATA and TLAST of the output beats for a sequence of input beats."""
+        tdata = np.asarray(tdata)
+        tlast = np.asarray(tlast, dtype=bool)
+        ends = np.flatnonzero((self.position + np.arange(len(tdata))) % self.decimation == self.decimation - 1)
+        self.position = (self.position + len(tdata)) % self.decimation
+
+        values = self._integrate(self.mix(tdata))[ends] if len(tdata) else np.zeros((0, 2), dtype=np.int64)
+        for stage in range(len(self.delays)):
+            delayed = np.concatenate([self.delays[stage][None], values[:-1]])
+            if len(values):
+                self.delays[stage] = values[-1]
+            values = to_signed(values - delayed, self.cic_width)
+
+        scaled = to_unsigned(values >> self.shift, self.data_width)
+        return scaled[:, 0] | (scaled[:, 1] << self.data_width), self._window_last(tlast, ends)
@@ -0,0 +1,136 @@
+"""Model of axis_bram_writer, as recorded by axi_axis_recorder."""
+
+import numpy as np
+
+
+class Recorder:
+    """Memory contents written by axis_bram_writer.
+
+    With `opt_trigger` 0 every frame is written from address 0. With 1 only
+    the frames starting after a trigger pulse are, and with 2 samples are
+    written circularly, ignoring TLAST, up to `post_trigger` samples after
+    the first sample at or after a trigger pulse.
+
+    Triggers are given per sample: `trigger[i]` is set if a rising edge of
+    the trigger input was seen after sample i-1 was accepted, up to and
+    including the cycle sample i was accepted. `interrupts` counts the
+    completed frames, i.e. the interrupt pulses without coalescing.
+    """
+
+    def __init__(self, depth, opt_trigger=0, post_trigger=0):
+        self.depth = depth
+        self.opt_trigger = opt_trigger
+        self.post_trigger = post_trigger
+
+        self.memory = np.zeros(depth, dtype=np.int64)
+        self.address = 0
+        self.interrupts = 0
+
+        # OPT_TRIGGER == 1: no frame starts before the first TLAST
+        self.first_sample = False
+        self.armed = False
+        self.running = False
+
+        # OPT_TRIGGER == 2: samples left to write once triggered
+        self.remaining = None
+        self.captured = False
+
+    @property
+    def wrap_index(self):
+        """Address of the oldest sample of a circular capture."""
+        return self.address if self.opt_trigger == 2 else 0
+
+    def window(self):
+        """Memory contents from the oldest sample of a circular capture."""
+        return np.roll(self.memory, -self.wrap_index)
+
+    def _store(self, data, address):
+        # only the last write to each address is kept
+        if len(data) > self.depth:
+            address += len(data) - self.depth
+            data = data[-self.depth:]
+        self.memory[(address + np.arange(len(data))) % self.depth] = data
+
+    def _frames(self, data, tlast):
+        # from self.address, restarting at address 0 after every TLAST
+        ends = np.flatnonzero(tlast) + 1
+        starts = np.concatenate([[0], ends])
+        stops = np.concatenate([ends, [len(data)]])
+
+        self._store(data[:stops[0]], self.address)
+        for start, stop in zip(starts[1:], stops[1:]):
+            self._store(data[start:stop], 0)
+
+        if len(ends):
+            self.address = (len(data) - ends[-1]) % self.depth
+        else:
+            self.address = (self.address + len(data)) % self.depth
+
+    def _triggered_frames(self, data, tlast, trigger):
+        # a frame is captured if it starts after a trigger pulse seen since
+        # the start of the previous frame
+        starts = np.flatnonzero(np.concatenate([[self.first_sample], tlast[:-1]]))
+        ends = np.flatnonzero(tlast)
+        pulses = np.concatenate([[0], np.cumsum(trigger)])
+
+        since = np.concatenate([[0], starts[:-1] + 1])
+        primed = pulses[starts + 1] > pulses[since]
+        if len(starts) and self.armed:
+            primed[0] = True
+
+        if self.running:
+            stop = ends[0] + 1 if len(ends) else len(data)
+            self._frames(data[:stop], tlast[:stop])
+            self.running = not len(ends)
+
+        for start in starts[primed]:
+            following = ends[ends >= start]
+            stop = following[0] + 1 if len(following) else len(data)
+            self.address = 0
+            self._frames(data[start:stop], tlast[start:stop])
+            self.running = not len(following)
+
+        if len(starts):
+            self.armed = bool(pulses[-1] > pulses[starts[-1] + 1])
+        else:
+            self.armed = self.armed or bool(pulses[-1])
+        self.first_sample = bool(tlast[-1])
+
+    def _circular(self, data, trigger):
+        if self.captured:
+            return
+
+        if self.remaining is None:
+            pulses = np.flatnonzero(trigger)
+            if len(pulses):
+                self.remaining = pulses[0] + self.post_trigger + 1
+
+        count = len(data) if self.remaining is None else min(self.remaining, len(data))
+        self._store(data[:count], self.address)
+        self.address = (self.address + count) % self.depth
+
+        if self.remaining is not None:
+            self.remaining -= count
+            if self.remaining == 0:
+                self.captured = True
+                self.interrupts += 1
+
+    def process(self, tdata, tlast=None, trigger=None):
+        """Record a sequence of accepted samples."""
+        data = np.asarray(tdata, dtype=np.int64)
+        tlast = np.zeros(len(data), dtype=bool) if tlast is None else np.asarray(tlast, dtype=bool)
+        trigger = np.zeros(len(data), dtype=bool) if trigger is None else np.asarray(trigger, dtype=bool)
+
+        if not len(data):
+            return
+
+        if self.opt_trigger == 2:
+            self._circular(data, trigger)
+            return
+
+        self.interrupts += int(np.count_nonzero(tlast))
+
+        if self.opt_trigger == 1:
+            self._triggered_frames(data, tlast, trigger)
+        else:
+            self._frames(data, tlast)
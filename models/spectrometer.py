@@ -0,0 +1,36 @@
+"""Model of axis_spectrometer."""
+
+import numpy as np
+
+from .accumulator import MultichannelAccumulator
+from .adc import red_pitaya_adc
+from .packetizer import Packetizer
+from .real_to_complex import real_to_complex
+
+
+class Spectrometer:
+    """Spectra output by the accumulator of axis_spectrometer for ADC codes.
+
+    The chain of the core models: ADC, packetizer framing `channels`
+    samples, real to complex, the pass-through FFT stand-in and the
+    accumulator integrating the real part over `rate` frames.
+    """
+
+    def __init__(self, channels, rate, adc_width=14, data_width=16, output_width=24, rate_width=8):
+        self.channels = channels
+        self.adc_width = adc_width
+        self.data_width = data_width
+
+        self.packetizer = Packetizer(channels)
+        self.accumulator = MultichannelAccumulator(rate, channels, data_width, output_width, rate_width)
+
+    def process(self, codes):
+        """Spectra completed by a sequence of ADC codes, one per row."""
+        tdata = red_pitaya_adc(codes, self.adc_width, self.data_width)
+        tlast, _ = self.packetizer.process(len(tdata))
+
+        # the FFT stand-in passes the complex samples through
+        tdata = real_to_complex(tdata, self.data_width)
+
+        spectra, _ = self.accumulator.process(tdata, tlast)
+        return spectra.reshape(-1, self.channels)
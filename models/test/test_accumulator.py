@@ -0,0 +1,115 @@
+import numpy as np
+
+from models.accumulator import MultichannelAccumulator
+
+
+def reference(frames, rate, channels=1024, input_width=16, output_width=24, rate_width=8):
+    """Sample by sample model of the accumulator memory."""
+    acc_width = input_width + rate_width
+    memory = [0] * channels
+    counter = 0
+    output = []
+
+    for frame in frames:
+        for address, sample in enumerate(frame):
+            sample = (sample + 2**(input_width-1)) % 2**input_width - 2**(input_width-1)
+            value = memory[address] + sample
+            if counter == rate - 1:
+                output.append(value)
+            value = sample if counter == 0 else value
+            memory[address] = (value + 2**(acc_width-1)) % 2**acc_width - 2**(acc_width-1)
+        counter = (counter + 1) % rate
+
+    return [value % 2**output_width for value in output]
+
+
+def stream(frames):
+    tdata = np.concatenate(frames)
+    tlast = np.concatenate([np.arange(len(frame)) == len(frame) - 1 for frame in frames])
+    return tdata, tlast
+
+
+def test_accumulator():
+    rng = np.random.default_rng(1)
+    frames = list(rng.integers(-2**15, 2**15, size=(32, 64)))
+
+    model = MultichannelAccumulator(4)
+    tdata, tlast = model.process(*stream(frames))
+
+    sums = np.sum(np.reshape(frames, (8, 4, 64)), axis=1).reshape(-1)
+    assert np.all(tdata == sums % 2**24)
+    assert np.all(tlast == (np.arange(len(tdata)) % 64 == 63))
+
+
+def test_accumulator_chunks():
+    rng = np.random.default_rng(2)
+    frames = list(rng.integers(-2**15, 2**15, size=(30, 16)))
+    tdata, tlast = stream(frames)
+
+    for rate in [1, 3, 4]:
+        model = MultichannelAccumulator(rate, channels=16)
+        outputs = [model.process(tdata[n:n+37], tlast[n:n+37]) for n in range(0, len(tdata), 37)]
+
+        assert np.concatenate([o[0] for o in outputs]).tolist() == reference(frames, rate, channels=16)
+
+
+def test_accumulator_frame_lengths():
+    rng = np.random.default_rng(3)
+    frames = [rng.integers(-2**15, 2**15, size=n) for n in rng.integers(1, 17, size=40)]
+
+    model = MultichannelAccumulator(3, channels=16)
+    tdata, tlast = model.process(*stream(frames))
+
+    assert tdata.tolist() == reference(frames, 3, channels=16)
+    assert int(tlast.sum()) == 40 // 3
+
+
+def test_accumulator_wraparound():
+    frames = [np.full(4, 2**15 - 1)] * 4
+
+    # accumulated in INPUT + RATE_WIDTH bits, truncated to the output width
+    model = MultichannelAccumulator(4, input_width=16, output_width=16, rate_width=2)
+    tdata, _ = model.process(*stream(frames))
+    assert tdata.tolist() == [(4 * (2**15 - 1)) % 2**16] * 4
+
+    # sign-extended to a wider output
+    model = MultichannelAccumulator(2, input_width=16, output_width=24, rate_width=1)
+    tdata, _ = model.process(*stream([np.full(4, -2**15)] * 2))
+    assert tdata.tolist() == [2**24 - 2**16] * 4
+
+
+def complex_tdata(real, imag, width=16):
+    return (np.asarray(real) % 2**width) | ((np.asarray(imag) % 2**width) << width)
+
+
+def test_accumulator_power():
+    rng = np.random.default_rng(4)
+    real, imag = rng.integers(-2**15, 2**15, size=(2, 24, 32))
+    tdata, tlast = stream(list(complex_tdata(real, imag)))
+
+    # the power of full scale samples needs all 2*16 + 8 bits
+    model = MultichannelAccumulator(6, channels=32, opt_complex=1)
+    power, _ = model.process(tdata, tlast)
+
+    expected = np.sum((real**2 + imag**2).reshape(4, 6, 32), axis=1).reshape(-1)
+    assert model.output_width == 40
+    assert power.tolist() == expected.tolist()
+
+    model = MultichannelAccumulator(2**8, channels=1, opt_complex=1)
+    power, _ = model.process(np.full(2**8, complex_tdata(-2**15, -2**15)), np.ones(2**8))
+    assert power.tolist() == [2**8 * 2**31]
+
+
+def test_accumulator_power_parts():
+    rng = np.random.default_rng(5)
+    real, imag = rng.integers(-2**15, 2**15, size=(2, 30, 16))
+    tdata, tlast = stream(list(complex_tdata(real, imag)))
+
+    model = MultichannelAccumulator(3, channels=16, output_width=40, opt_complex=2)
+    outputs = [model.process(tdata[n:n+37], tlast[n:n+37])[0] for n in range(0, len(tdata), 37)]
+    fields = np.concatenate(outputs)
+
+    sums = lambda values: np.sum(values.reshape(10, 3, 16), axis=1).reshape(-1)
+    assert fields[:, 0].tolist() == sums(real**2 + imag**2).tolist()
+    assert fields[:, 1].tolist() == (sums(real) % 2**40).tolist()
+    assert fields[:, 2].tolist() == (sums(imag) % 2**40).tolist()
@@ -0,0 +1,18 @@
+import numpy as np
+
+from models.adc import adc_codes, red_pitaya_adc
+
+
+def test_red_pitaya_adc():
+    # offset binary: mid-scale is zero, the extremes full scale
+    codes = [0x2000, 0x2001, 0x1fff, 0x0000, 0x3fff]
+    assert red_pitaya_adc(codes, 14, 16).tolist() == [0x0000, 0x0001, 0xffff, 0xe000, 0x1fff]
+    assert red_pitaya_adc(codes, 14, 14).tolist() == [0x0000, 0x0001, 0x3fff, 0x2000, 0x1fff]
+
+
+def test_adc_codes():
+    samples = np.arange(-2**13, 2**13)
+    assert np.all(red_pitaya_adc(adc_codes(samples, 14), 14, 24) == samples % 2**24)
+
+    # saturated at full scale
+    assert adc_codes([-10**6, 10**6], 14).tolist() == [0x0000, 0x3fff]
@@ -0,0 +1,12 @@
+import numpy as np
+
+from models.fixed import to_signed, to_unsigned
+
+
+def test_to_unsigned():
+    assert to_unsigned([-1, 0, 1, 256], 8).tolist() == [255, 0, 1, 0]
+
+
+def test_to_signed():
+    assert to_signed([255, 128, 127, 0, -129], 8).tolist() == [-1, -128, 127, 0, 127]
+    assert np.all(to_signed(to_unsigned(np.arange(-2**15, 2**15), 16), 16) == np.arange(-2**15, 2**15))
@@ -0,0 +1,21 @@
+from models.packetizer import Packetizer
+
+
+def test_packetizer():
+    model = Packetizer(3)
+
+    tlast, tkeep = model.process(4)
+    assert tlast.tolist() == [0, 0, 1, 0]
+    assert tkeep.tolist() == [1, 1, 1, 1]
+
+    # the frame position carries over between calls
+    tlast, _ = model.process(5)
+    assert tlast.tolist() == [0, 1, 0, 0, 1]
+
+
+def test_packetizer_lanes():
+    model = Packetizer(10, lanes=4)
+
+    tlast, tkeep = model.process(6)
+    assert tlast.tolist() == [0, 0, 1, 0, 0, 1]
+    assert tkeep.tolist() == [0xf, 0xf, 0x3, 0xf, 0xf, 0x3]
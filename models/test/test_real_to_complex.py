@@ -0,0 +1,79 @@
+import numpy as np
+
+from models.real_to_complex import DownConverter, complex_parts, nco_table, real_to_complex
+
+
+def test_real_to_complex():
+    tdata = real_to_complex([1, -1, -32768], 16)
+    assert tdata.tolist() == [0x0001, 0xffff, 0x8000]
+
+    real, imag = complex_parts(tdata, 16)
+    assert real.tolist() == [1, -1, -32768]
+    assert imag.tolist() == [0, 0, 0]
+
+
+def test_complex_parts():
+    real, imag = complex_parts([0xffffffff80000000], 32)
+    assert real.tolist() == [-2**31]
+    assert imag.tolist() == [-1]
+
+
+def ideal_down_converter(x, phase_increment, decimation, stages=3, phase_width=32):
+    # the same mixer and CIC in floating point, with the exact phase
+    phase = 2 * np.pi * (phase_increment * np.arange(len(x)) % 2**phase_width) / 2**phase_width
+    values = np.stack([x * np.cos(phase), -x * np.sin(phase)], axis=-1)
+
+    values = np.cumsum(values, axis=0)
+    for _ in range(stages - 1):
+        values = np.cumsum(np.concatenate([np.zeros((1, 2)), values[:-1]]), axis=0)
+    values = values[decimation-1::decimation]
+    for _ in range(stages):
+        values = values - np.concatenate([np.zeros((1, 2)), values[:-1]])
+    return values / 2**(stages * (decimation - 1).bit_length())
+
+
+def test_nco_table():
+    table = nco_table(10, 16)
+    assert table[[0, 256, 512, 768]].tolist() == [32767, 0, -32767, 0]
+
+
+def test_down_converter_dc():
+    # without rotation the I output settles to the input, less the truncation
+    ddc = DownConverter(0, 4)
+    tdata, tlast = ddc.process(np.full(64, 1000), np.arange(64) % 16 == 15)
+    real, imag = complex_parts(tdata)
+
+    assert len(tdata) == 16
+    assert real[-8:].tolist() == [999] * 8
+    assert imag.tolist() == [0] * 16
+    assert tlast.tolist() == [0, 0, 0, 1] * 4
+
+
+def test_down_converter_chunks():
+    rng = np.random.default_rng(1)
+    x = rng.integers(-2**15, 2**15, 1000)
+    tlast = rng.uniform(size=1000) < 0.05
+
+    tdata, last = DownConverter(0x12345678, 5).process(x, tlast)
+
+    ddc = DownConverter(0x12345678, 5)
+    parts = [ddc.process(x[n:n+77], tlast[n:n+77]) for n in range(0, 1000, 77)]
+    assert np.all(np.concatenate([part[0] for part in parts]) == tdata)
+    assert np.all(np.concatenate([part[1] for part in parts]) == last)
+    assert len(tdata) == 200
+
+
+def test_down_converter_bounds():
+    # the phase truncation to the table and the rounding of the products
+    # bound the error of every output beat
+    rng = np.random.default_rng(2)
+    x = rng.integers(-2**15, 2**15, 4096)
+    bound = 2**15 * (2 * np.pi / 2**10 + 2**-15) + 2
+
+    for phase_increment, decimation in [(0x0c000000, 8), (0x2aaaaaab, 5), (0xf0000000, 1)]:
+        tdata, _ = DownConverter(phase_increment, decimation).process(x, np.zeros(len(x)))
+        real, imag = complex_parts(tdata)
+        ideal = ideal_down_converter(x, phase_increment, decimation)
+
+        assert np.max(np.abs(real - ideal[:, 0])) <= bound
+        assert np.max(np.abs(imag - ideal[:, 1])) <= bound
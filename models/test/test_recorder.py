@@ -0,0 +1,71 @@
+import numpy as np
+
+from models.recorder import Recorder
+
+
+def frames(count, length):
+    tdata = np.arange(count * length) + 1
+    tlast = np.arange(count * length) % length == length - 1
+    return tdata, tlast
+
+
+def test_recorder():
+    model = Recorder(16)
+    tdata, tlast = frames(3, 8)
+    model.process(tdata, tlast)
+
+    assert model.memory[:8].tolist() == tdata[16:].tolist()
+    assert model.interrupts == 3
+
+
+def test_recorder_trigger():
+    tdata, tlast = frames(4, 8)
+    trigger = np.zeros(len(tdata), dtype=bool)
+
+    # the first frame after reset is never captured
+    trigger[2] = True
+    model = Recorder(8, opt_trigger=1)
+    model.process(tdata, tlast, trigger)
+    assert model.memory.tolist() == tdata[8:16].tolist()
+
+    # a pulse on the first sample of a frame captures that frame
+    trigger[:] = False
+    trigger[16] = True
+    model = Recorder(8, opt_trigger=1)
+    model.process(tdata, tlast, trigger)
+    assert model.memory.tolist() == tdata[16:24].tolist()
+    assert model.interrupts == 4
+
+
+def test_recorder_trigger_chunks():
+    rng = np.random.default_rng(4)
+    tdata, tlast = frames(64, 16)
+    trigger = rng.uniform(size=len(tdata)) < 0.01
+
+    whole = Recorder(16, opt_trigger=1)
+    whole.process(tdata, tlast, trigger)
+
+    chunked = Recorder(16, opt_trigger=1)
+    for n in range(0, len(tdata), 7):
+        chunked.process(tdata[n:n+7], tlast[n:n+7], trigger[n:n+7])
+
+    assert np.all(chunked.memory == whole.memory)
+
+
+def test_recorder_pretrigger():
+    depth = 16
+    tdata = np.arange(3 * depth) + 1
+
+    for post_trigger in [0, depth // 2, depth - 1]:
+        trigger = np.zeros(len(tdata), dtype=bool)
+        trigger[20] = True
+
+        model = Recorder(depth, opt_trigger=2, post_trigger=post_trigger)
+        for n in range(0, len(tdata), 5):
+            model.process(tdata[n:n+5], trigger=trigger[n:n+5])
+
+        last = 20 + post_trigger
+        assert model.captured
+        assert model.interrupts == 1
+        assert model.wrap_index == (last + 1) % depth
+        assert model.window().tolist() == tdata[last-depth+1:last+1].tolist()
@@ -0,0 +1,16 @@
+import numpy as np
+
+from models.spectrometer import Spectrometer
+
+
+def test_spectrometer():
+    rng = np.random.default_rng(5)
+    codes = rng.integers(0, 2**14, size=64 * 12 + 10)
+
+    model = Spectrometer(64, 4)
+    spectra = np.concatenate([model.process(codes[n:n+100]) for n in range(0, len(codes), 100)])
+
+    # offset binary codes
+    samples = codes - 2**13
+    expected = samples[:64 * 12].reshape(3, 4, 64).sum(axis=1) % 2**24
+    assert np.all(spectra == expected)
@@ -0,0 +1,12 @@
+"""Shared cocotb testbench utilities for the cores in this repository."""
+
+from .bram import PipelinedBRAM
+from .coverage import Coverage, StreamCoverage, coverage
+from .factory import TestFactory, parameter
+from .packed import PackedStreamSink, PackedStreamSource, field, pack
+from .profiling import TestProfiler, folded_stacks, profiling_enabled
+from .regression import covering_rows, covering_strength, is_nightly
+from .seeding import derive_seed, reproduce_command, seed_module
+from .soak import StreamSoak, repeat_frame, sample_chunks, stream_beats
+from .throughput import Throughput
+from .traces import cached_reference, open_trace, trace_chunks, trace_path
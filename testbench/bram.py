@@ -0,0 +1,55 @@
+"""BRAM port model with a configurable read latency.
+
+Like the `bram` module, a read takes READ_LATENCY cycles: the first stage
+is clocked with the enable, the output registers after it are not.
+"""
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+
+class PipelinedBRAM:
+    """Memory behind the `bram_*` port of a core, read-first on writes."""
+
+    def __init__(self, dut, clock, prefix="bram", latency=1):
+        self.latency = latency
+        self.contents = {}
+        self.pipeline = [0] * latency
+
+        self.rddata = getattr(dut, f"{prefix}_rddata")
+        self.wrdata = getattr(dut, f"{prefix}_wrdata", None)
+        self.addr = getattr(dut, f"{prefix}_addr")
+        self.we = getattr(dut, f"{prefix}_we", None)
+        self.en = getattr(dut, f"{prefix}_en")
+
+        self.rddata.setimmediatevalue(0)
+        cocotb.fork(self._run(clock))
+
+    def set_contents(self, contents):
+        self.contents = dict(contents)
+
+    def verify(self, contents):
+        for addr, data in contents.items():
+            assert self.contents.get(addr, 0) == data, \
+                f"BRAM at {addr}: {self.contents.get(addr, 0):#x} != {data:#x}"
+
+    def tick(self):
+        """Update on a rising edge, with the port inputs before the edge."""
+        first = self.pipeline[0]
+
+        if self.en.value.is_resolvable and self.en.value:
+            addr = int(self.addr.value)
+            first = self.contents.get(addr, 0)
+
+            we = int(self.we.value) if self.we is not None and self.we.value.is_resolvable else 0
+            if we:
+                mask = sum(0xFF << 8*ii for ii in range(we.bit_length()) if we & (1 << ii))
+                self.contents[addr] = (first & ~mask) | (int(self.wrdata.value) & mask)
+
+        self.pipeline = [first] + self.pipeline[:-1]
+        self.rddata <= self.pipeline[-1]
+
+    async def _run(self, clock):
+        while True:
+            await RisingEdge(clock)
+            self.tick()
@@ -0,0 +1,168 @@
+"""Functional coverage bins for AXI4-Stream interfaces.
+
+Bins are grouped by name and merged over all tests run in a simulation; the
+totals are written to a JSON file (COVERAGE_FILE, or functional_coverage.json
+in the directory of the test module) after every generated test, and merged
+with an existing file so that separate simulations of the same core
+accumulate, whether run by make or from a pytest entry point in its own
+sim_build directory.
+"""
+
+import json
+import os
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+
+def _run_bin(length):
+    if length == 1:
+        return "1"
+    elif length < 4:
+        return "2-3"
+    elif length < 16:
+        return "4-15"
+    else:
+        return "16+"
+
+
+def coverage_file(module_file):
+    """Coverage file of the testbench of a test module."""
+    default = os.path.join(os.path.dirname(os.path.abspath(module_file)), "functional_coverage.json")
+    return os.environ.get("COVERAGE_FILE", default)
+
+
+class Coverage:
+    def __init__(self):
+        self.groups = {}
+        self.baseline = None
+
+    def define(self, group, bins):
+        hits = self.groups.setdefault(group, {})
+        for name in bins:
+            hits.setdefault(name, 0)
+
+    def sample(self, group, name):
+        hits = self.groups.setdefault(group, {})
+        hits[name] = hits.get(name, 0) + 1
+
+    def missing(self):
+        return {group: [name for name, count in hits.items() if count == 0]
+                for group, hits in self.groups.items()
+                if not all(hits.values())}
+
+    def report(self, log):
+        for group, hits in sorted(self.groups.items()):
+            covered = sum(1 for count in hits.values() if count)
+            log.info(f"coverage {group}: {covered}/{len(hits)} bins")
+
+        for group, names in sorted(self.missing().items()):
+            log.info(f"coverage {group}: not hit {', '.join(names)}")
+
+    def write(self, path=None):
+        path = path or os.environ.get("COVERAGE_FILE", "functional_coverage.json")
+
+        # counts already in the file when this simulation started
+        if self.baseline is None:
+            self.baseline = {}
+            if os.path.exists(path):
+                with open(path) as f:
+                    self.baseline = json.load(f)
+
+        merged = {group: dict(hits) for group, hits in self.baseline.items()}
+        for group, hits in self.groups.items():
+            totals = merged.setdefault(group, {})
+            for name, count in hits.items():
+                totals[name] = totals.get(name, 0) + count
+
+        with open(path, "w") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+
+
+coverage = Coverage()
+
+
+class StreamCoverage:
+    """Samples stall and idle patterns, frame lengths and data extremes.
+
+    Stalls (TVALID without TREADY) and idle cycles (no TVALID) are binned by
+    run length. Frame lengths are binned at the edges (1, 2 and `max_length`
+    when given), data at the unsigned and two's complement extremes.
+    """
+
+    def __init__(self, dut, prefix, clock, max_length=None, db=None):
+        self.prefix = prefix
+        self.clock = clock
+        self.max_length = max_length
+        self.db = db or coverage
+
+        self.tvalid = getattr(dut, f"{prefix}_tvalid")
+        self.tready = getattr(dut, f"{prefix}_tready", None)
+        self.tdata = getattr(dut, f"{prefix}_tdata")
+        self.tlast = getattr(dut, f"{prefix}_tlast", None)
+
+        width = len(self.tdata)
+        self.extremes = {
+            0: "zero",
+            2**width - 1: "all_ones",
+            2**(width-1): "signed_min",
+            2**(width-1) - 1: "signed_max",
+        }
+
+        runs = ["1", "2-3", "4-15", "16+"]
+        if self.tready is not None:
+            self.db.define(f"{prefix}.stall", runs)
+        self.db.define(f"{prefix}.idle", runs)
+        self.db.define(f"{prefix}.data", self.extremes.values())
+        if self.tlast is not None:
+            lengths = ["1", "2", "3+"]
+            if max_length:
+                lengths.append("max")
+            self.db.define(f"{prefix}.frame_length", lengths)
+
+        cocotb.fork(self._run())
+
+    def _frame_bin(self, length):
+        if self.max_length and length == self.max_length:
+            return "max"
+        elif length < 3:
+            return str(length)
+        else:
+            return "3+"
+
+    async def _run(self):
+        stall = 0
+        idle = 0
+        length = 0
+
+        while True:
+            await RisingEdge(self.clock)
+
+            tvalid = self.tvalid.value
+            if not tvalid.is_resolvable:
+                continue
+
+            ready = self.tready is None or (self.tready.value.is_resolvable and self.tready.value)
+
+            if tvalid and not ready:
+                stall += 1
+            elif stall:
+                self.db.sample(f"{self.prefix}.stall", _run_bin(stall))
+                stall = 0
+
+            if not tvalid:
+                idle += 1
+            elif idle:
+                self.db.sample(f"{self.prefix}.idle", _run_bin(idle))
+                idle = 0
+
+            if tvalid and ready:
+                tdata = self.tdata.value
+                if tdata.is_resolvable and int(tdata) in self.extremes:
+                    self.db.sample(f"{self.prefix}.data", self.extremes[int(tdata)])
+
+                if self.tlast is not None:
+                    length += 1
+                    if self.tlast.value.is_resolvable and self.tlast.value:
+                        self.db.sample(f"{self.prefix}.frame_length", self._frame_bin(length))
+                        length = 0
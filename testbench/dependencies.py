@@ -0,0 +1,161 @@
+"""RTL dependency graph of the testbenches, for incremental regressions.
+
+The sources of each testbench (a core's test/cocotb directory) are read
+from the `verilog_sources` lists of its pytest entry points and the
+VERILOG_SOURCES of its Makefile. A testbench is affected by a change to any
+of those sources, to a file in its own directory, or to the shared testbench
+and models packages. List the testbenches affected by the changes since a
+revision with:
+
+    python -m testbench.dependencies [--since REV]
+"""
+
+import argparse
+import ast
+import glob
+import os
+import re
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# changes to these affect every testbench
+SHARED = ["testbench", "models", "conftest.py"]
+
+# outputs of a simulation run, never a change to a testbench
+BUILD_OUTPUTS = {"sim_build", "results.xml", "__pycache__"}
+
+
+def makefile_sources(path):
+    """VERILOG_SOURCES of a cocotb Makefile, as absolute paths."""
+    directory = os.path.dirname(os.path.abspath(path))
+    variables = {"PWD": directory}
+    sources = []
+
+    with open(path) as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+
+            match = re.match(r"(\w+)\s*(\+=|\?=|:=|=)\s*(.*)", line)
+            if not match:
+                continue
+            name, op, value = match.groups()
+
+            value = re.sub(r"\$\((\w+)\)", lambda m: variables.get(m.group(1), m.group(0)), value)
+
+            if name == "VERILOG_SOURCES":
+                sources.extend(value.split())
+            elif op != "+=":
+                variables[name] = value
+
+    sources = [os.path.normpath(os.path.join(directory, source)) for source in sources]
+    return {source for source in sources if os.path.exists(source)}
+
+
+def pytest_sources(path):
+    """`verilog_sources` of the pytest entry points in a test module."""
+    directory = os.path.dirname(os.path.abspath(path))
+    namespace = {
+        "os": os,
+        "tests_dir": directory,
+        "rtl_dir": os.path.abspath(os.path.join(directory, "..", "..", "rtl")),
+        "root_dir": os.path.abspath(os.path.join(directory, "..", "..", "..")),
+    }
+
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+
+    sources = set()
+    for function in ast.walk(tree):
+        if not isinstance(function, ast.FunctionDef):
+            continue
+
+        local = dict(namespace)
+        for node in function.body:
+            if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+                continue
+            target = node.targets[0]
+            if not isinstance(target, ast.Name):
+                continue
+
+            if target.id == "dut" and isinstance(node.value, ast.Constant):
+                local["dut"] = node.value.value
+            elif target.id == "verilog_sources":
+                expression = ast.Expression(node.value)
+                sources.update(eval(compile(expression, path, "eval"), {"__builtins__": {}}, local))
+
+    return {os.path.normpath(source) for source in sources}
+
+
+def testbenches(root=ROOT):
+    """Map of testbench directory to the RTL sources it simulates."""
+    graph = {}
+
+    for path in glob.glob(os.path.join(root, "*", "test", "cocotb", "Makefile")):
+        graph.setdefault(os.path.dirname(path), set()).update(makefile_sources(path))
+
+    for path in glob.glob(os.path.join(root, "*", "test", "cocotb", "*.py")):
+        graph.setdefault(os.path.dirname(path), set()).update(pytest_sources(path))
+
+    return graph
+
+
+def core_sources(core, graph, root=ROOT):
+    """RTL sources of the testbench of a core, its top level last."""
+    top = os.path.join(root, core, "rtl", f"{core}.sv")
+    sources = graph.get(os.path.join(root, core, "test", "cocotb"), set()) - {top}
+    return sorted(sources) + [top]
+
+
+def changed_files(revision, root=ROOT):
+    """Files changed since `revision`, including uncommitted and untracked files.
+
+    Untracked simulation build outputs are left out, so a testbench that has
+    been run locally is not affected by its own build directory.
+    """
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=root, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True)
+        return result.stdout.split()
+
+    untracked = [path for path in git("ls-files", "--others", "--exclude-standard")
+        if not BUILD_OUTPUTS.intersection(path.split("/"))]
+    changed = git("diff", "--name-only", revision, "--") + untracked
+
+    return {os.path.normpath(os.path.join(root, path)) for path in changed}
+
+
+def affected(changed, root=ROOT):
+    """Testbench directories affected by the changed files."""
+    graph = testbenches(root)
+    shared = [os.path.join(root, path) for path in SHARED]
+
+    if any(path == s or path.startswith(s + os.sep) for path in changed for s in shared):
+        return set(graph)
+
+    return {directory for directory, sources in graph.items()
+            if sources & changed
+            or any(path.startswith(directory + os.sep) for path in changed)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m testbench.dependencies",
+        description="List the testbenches affected by changes since a git revision.")
+    parser.add_argument("--since", default="HEAD", help="git revision (default: %(default)s)")
+    parser.add_argument("--sources", action="store_true", help="also list the sources of each testbench")
+    args = parser.parse_args(argv)
+
+    graph = testbenches()
+    for directory in sorted(affected(changed_files(args.since))):
+        print(os.path.relpath(directory, ROOT))
+        if args.sources:
+            for source in sorted(graph[directory]):
+                print(f"    {os.path.relpath(source, ROOT)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
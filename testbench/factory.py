@@ -0,0 +1,141 @@
+"""TestFactory generating a covering array of the options.
+
+Generated tests keep the name they have in the full cartesian product, so
+run_test_037 runs the same options in pre-merge and nightly regressions.
+Tests that only apply to some builds are left undecorated, and their
+factories are only generated for those builds, on the parameters the
+Makefiles and pytest entry points export:
+
+    if parameter("OPT_TRIGGER") == 2:
+        factory = TestFactory(run_test_pretrigger)
+        ...
+        factory.generate_tests()
+"""
+
+import inspect
+import itertools
+import os
+
+import cocotb
+import cocotb.regression
+
+from .coverage import coverage, coverage_file
+from .profiling import TestProfiler, profiling_enabled
+from .regression import covering_rows, covering_strength, is_nightly
+from .seeding import derive_seed, reproduce_command, seed_module
+from .telemetry import TestRecorder, telemetry_enabled
+
+
+def parameter(name, default=0):
+    """Top level parameter of the build, from the PARAM_<name> variable
+    exported by the Makefiles and set by the pytest entry points."""
+    return int(os.environ.get(f"PARAM_{name}", default))
+
+
+def _create_test(function, name, documentation, mod, *args, **kwargs):
+    async def _my_test(dut):
+        seed = derive_seed(mod.__name__, name, kwargs)
+        seed_module(mod, seed)
+        dut._log.info(f"seed {seed}")
+
+        profiler = None
+        if profiling_enabled():
+            profiler = TestProfiler(dut, name, mod.__name__)
+            profiler.start()
+
+        recorder = None
+        if telemetry_enabled():
+            recorder = TestRecorder(dut, name, mod.__name__, kwargs)
+            recorder.start()
+
+        outcome = "failed"
+        try:
+            await function(dut, *args, **kwargs)
+            outcome = "passed"
+        finally:
+            if profiler:
+                profiler.stop()
+
+            if recorder:
+                recorder.stop(outcome)
+
+            if outcome == "failed":
+                dut._log.error(f"rerun this test with: {reproduce_command(mod, name, seed)}")
+
+            coverage.report(dut._log)
+            coverage.write(coverage_file(mod.__file__))
+
+    _my_test.__name__ = name
+    _my_test.__qualname__ = name
+    _my_test.__doc__ = documentation
+    _my_test.__module__ = mod.__name__
+
+    return cocotb.test()(_my_test)
+
+
+class TestFactory(cocotb.regression.TestFactory):
+    """Drop-in replacement for cocotb's TestFactory.
+
+    Pre-merge regressions only generate the tests of a COVERING_STRENGTH-wise
+    (pairwise by default) covering array of the options; REGRESSION=nightly
+    generates the full product.
+    """
+
+    def generate_tests(self, prefix="", postfix=""):
+        frm = inspect.stack()[1]
+        mod = inspect.getmodule(frm[0])
+
+        names = list(self.kwargs)
+        rows = list(itertools.product(*self.kwargs.values()))
+        indices = list(itertools.product(*(range(len(v)) for v in self.kwargs.values())))
+
+        def test_name(index):
+            return "%s%s%s_%03d" % (prefix, self.name, postfix, index + 1)
+
+        # tests requested by name (e.g. to reproduce a failure) are generated
+        # whether or not they are part of the covering array
+        requested = [name for name in os.environ.get("TESTCASE", "").split(",") if name]
+
+        if any(test_name(index) in requested for index in range(len(rows))):
+            selected = [index for index in range(len(rows)) if test_name(index) in requested]
+        elif is_nightly():
+            selected = range(len(rows))
+        else:
+            selected = covering_rows(indices, covering_strength())
+
+        self.log.info(f"generating {len(selected)} of {len(rows)} {self.name} tests")
+
+        for index in selected:
+            # grouped options, add_option(("a", "b"), [...]), are split into
+            # their names as in cocotb's TestFactory
+            testoptions = {}
+            for optname, optvalue in zip(names, rows[index]):
+                if isinstance(optname, str):
+                    testoptions[optname] = optvalue
+                else:
+                    testoptions.update(zip(optname, optvalue))
+            name = test_name(index)
+
+            doc = "Automatically generated test\n\n"
+            for optname, optvalue in testoptions.items():
+                if callable(optvalue):
+                    if not optvalue.__doc__:
+                        desc = "No docstring supplied"
+                    else:
+                        desc = optvalue.__doc__.split('\n')[0]
+                    doc += "\t{}: {} ({})\n".format(optname, optvalue.__qualname__, desc)
+                else:
+                    doc += "\t{}: {}\n".format(optname, repr(optvalue))
+
+            kwargs = {}
+            kwargs.update(self.kwargs_constant)
+            kwargs.update(testoptions)
+
+            if hasattr(mod, name):
+                self.log.error("Overwriting %s in module %s. "
+                               "This causes a previously defined testcase "
+                               "not to be run. Consider setting/changing "
+                               "name_postfix" % (name, mod))
+
+            setattr(mod, name, _create_test(self.test_function, name, doc, mod,
+                                            *self.args, **kwargs))
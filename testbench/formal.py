@@ -0,0 +1,244 @@
+"""Formal proofs of the FORMAL properties of the cores with SymbiYosys.
+
+Every core whose RTL has an `ifdef FORMAL block (the AXI-Stream handshake
+properties) is proved for each of its parameter sets in PARAMETERS, or its
+defaults, reading the RTL sources of its cocotb testbench. A .sby file is
+generated per core, parameter set and mode in FORMAL_DIR (formal/ at the top
+of the repository by default) and the jobs run in parallel.
+
+Results are cached in FORMAL_DIR/results.json, keyed by a hash of the .sby
+file and the RTL it reads, so jobs of unchanged cores are skipped; only
+PASS and FAIL are cached. Run the proofs with:
+
+    python -m testbench.formal [--mode bmc|prove] [--depth N] [--jobs N] [core ...]
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+from .dependencies import ROOT, core_sources, testbenches
+from .telemetry import format_table
+
+
+# parameter sets proved for each core, small enough for the solvers
+PARAMETERS = {
+    "axis_packetizer": [
+        dict(LANES=1),
+        dict(LANES=4, OPT_REGISTER=1),
+        dict(LANES=2, OPT_HEADER=1),
+    ],
+    "axis_real_to_complex": [
+        dict(OPT_REGISTER=0),
+        dict(OPT_REGISTER=1),
+        dict(OPT_DDC=1, LUT_WIDTH=6, CIC_STAGES=2, DECIMATION_WIDTH=3),
+    ],
+    "axis_width_converter": [
+        dict(S_LANES=1, M_LANES=4),
+        dict(S_LANES=4, M_LANES=1),
+    ],
+    "axis_packet_fifo": [
+        dict(ADDR_WIDTH=3),
+        dict(ADDR_WIDTH=3, OPT_STORE_FORWARD=0),
+    ],
+    "axis_broadcaster": [
+        dict(OUTPUTS=2),
+        dict(OUTPUTS=3, OPT_DROP=1),
+    ],
+    "axis_multichannel_accumulator": [
+        dict(CHANNELS=4),
+        dict(CHANNELS=4, OPT_DOUBLE_BUFFER=1),
+        dict(CHANNELS=4, OPT_COMPLEX=2),
+        dict(CHANNELS=4, OPT_SNAPSHOT=1),
+    ],
+}
+
+# results that hold until the .sby file or the RTL changes
+CACHED = ("PASS", "FAIL")
+
+
+Job = collections.namedtuple("Job", ["core", "parameters", "mode", "depth", "sources"])
+Result = collections.namedtuple("Result", ["job", "status", "seconds", "cached"])
+
+
+def formal_directory():
+    return os.environ.get("FORMAL_DIR", os.path.join(ROOT, "formal"))
+
+
+def formal_cores(root=ROOT):
+    """Map of core name to its top-level RTL, for the cores with FORMAL properties."""
+    cores = {}
+    for path in glob.glob(os.path.join(root, "*", "rtl", "*.sv")):
+        core = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        if os.path.basename(path) != f"{core}.sv":
+            continue
+
+        with open(path) as f:
+            if re.search(r"`ifdef\s+FORMAL\b", f.read()):
+                cores[core] = path
+
+    return cores
+
+
+def jobs(cores=None, mode="bmc", depth=20, root=ROOT):
+    """Jobs of the selected cores, all cores with FORMAL properties by default."""
+    available = formal_cores(root)
+    graph = testbenches(root)
+
+    selected = []
+    for core in cores or sorted(available):
+        if core not in available:
+            raise KeyError(f"{core} has no FORMAL properties")
+
+        # the top level is read last, after the cores it instantiates
+        sources = core_sources(core, graph, root)
+        for parameters in PARAMETERS.get(core, [{}]):
+            selected.append(Job(core, parameters, mode, depth, sources))
+
+    return selected
+
+
+def job_name(job):
+    parameters = "-".join(f"{name}{value}" for name, value in job.parameters.items())
+    return "-".join(filter(None, [job.core, parameters, job.mode]))
+
+
+def sby_script(job):
+    """SymbiYosys file of a job."""
+    lines = ["[options]", f"mode {job.mode}", f"depth {job.depth}", "",
+             "[engines]", "smtbmc", "",
+             "[script]"]
+    # only the top level is read with its FORMAL block: the assumptions of
+    # an instantiated core would constrain the internal handshakes the
+    # proof is meant to check
+    *submodules, top = job.sources
+    lines += [f"read -sv {os.path.basename(source)}" for source in submodules]
+    lines += [f"read -formal {os.path.basename(top)}"]
+    lines += [f"chparam -set {name} {value} {job.core}" for name, value in job.parameters.items()]
+    lines += [f"prep -top {job.core}", "", "[files]"]
+    lines += job.sources
+    return "\n".join(lines) + "\n"
+
+
+def job_key(job):
+    """Hash of the .sby file of a job and the RTL it reads."""
+    digest = hashlib.sha256(sby_script(job).encode())
+    for source in job.sources:
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_sby(job, directory):
+    """Status reported by SymbiYosys for a job, run in `directory`."""
+    name = job_name(job)
+    path = os.path.join(directory, f"{name}.sby")
+    with open(path, "w") as f:
+        f.write(sby_script(job))
+
+    try:
+        result = subprocess.run(["sby", "-f", f"{name}.sby"], cwd=directory,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    except FileNotFoundError:
+        return "ERROR"
+
+    match = re.search(r"DONE \((\w+)", result.stdout)
+    return match.group(1) if match else "ERROR"
+
+
+def load_cache(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cache(path, cache):
+    # written whole and renamed, as several runs may share the directory
+    with open(path + ".tmp", "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def run(selected, workers=None, directory=None, force=False):
+    """Results of the jobs, running those without a cached result in parallel."""
+    directory = directory or formal_directory()
+    os.makedirs(directory, exist_ok=True)
+
+    cache_path = os.path.join(directory, "results.json")
+    cache = load_cache(cache_path)
+
+    results = {}
+    pending = {}
+    for job in selected:
+        key = job_key(job)
+        if not force and key in cache:
+            results[key] = Result(job, cache[key]["status"], cache[key]["seconds"], True)
+        else:
+            pending[key] = job
+
+    def timed(job):
+        start = time.perf_counter()
+        status = run_sby(job, directory)
+        return status, time.perf_counter() - start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {executor.submit(timed, job): key for key, job in pending.items()}
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            status, seconds = future.result()
+            results[key] = Result(pending[key], status, seconds, False)
+
+            if status in CACHED:
+                cache[key] = dict(name=job_name(pending[key]), status=status, seconds=seconds)
+                save_cache(cache_path, cache)
+
+    return [results[job_key(job)] for job in selected]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m testbench.formal",
+        description="Prove the FORMAL properties of the cores with SymbiYosys.")
+    parser.add_argument("cores", nargs="*", help="cores to prove (default: all with FORMAL properties)")
+    parser.add_argument("--mode", choices=["bmc", "prove"], default="bmc", help="proof mode (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=20, help="proof depth in cycles (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel jobs (default: the number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="ignore the cached results")
+    parser.add_argument("--list", action="store_true", help="list the jobs without running them")
+    args = parser.parse_args(argv)
+
+    try:
+        selected = jobs(args.cores, args.mode, args.depth)
+    except KeyError as error:
+        print(error.args[0], file=sys.stderr)
+        return 1
+
+    if args.list:
+        for job in selected:
+            print(job_name(job))
+        return 0
+
+    if shutil.which("sby") is None:
+        print("sby (SymbiYosys) not found in PATH", file=sys.stderr)
+        return 1
+
+    results = run(selected, args.jobs, force=args.force)
+
+    print(format_table(["job", "status", "time [s]", "cached"],
+        [(job_name(result.job), result.status, f"{result.seconds:.1f}", "yes" if result.cached else "")
+         for result in results]))
+
+    return 0 if all(result.status == "PASS" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
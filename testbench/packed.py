@@ -0,0 +1,154 @@
+"""Drivers for AXI-Stream interfaces packed in vectors.
+
+Cores with several stream interfaces of one kind pack them in one set of
+signals, interface i in bits [i*DATA_WIDTH +: DATA_WIDTH] of TDATA and bit i
+of TVALID, TLAST and TREADY. Each interface has its own pause generator.
+"""
+
+import collections
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+
+def field(value, index, width):
+    """Field `index` of a packed vector, None if not resolvable."""
+    binstr = value.binstr
+    bits = binstr[len(binstr) - (index + 1) * width:len(binstr) - index * width]
+    return int(bits, 2) if all(bit in "01" for bit in bits) else None
+
+
+def pack(fields, width):
+    """Packed vector of `width` bit fields, field 0 in the least significant bits."""
+    return sum(int(value) << (ii * width) for ii, value in enumerate(fields))
+
+
+class PackedStreamSource:
+    """Sources of the packed `prefix` slave interfaces.
+
+    Beats are queued per interface with `send`, and the beats accepted by
+    the core are counted in `accepted`.
+    """
+
+    def __init__(self, dut, prefix, clock, channels, data_width):
+        self.tdata = getattr(dut, f"{prefix}_tdata")
+        self.tvalid = getattr(dut, f"{prefix}_tvalid")
+        self.tlast = getattr(dut, f"{prefix}_tlast")
+        self.tready = getattr(dut, f"{prefix}_tready")
+
+        self.clock = clock
+        self.channels = channels
+        self.data_width = data_width
+
+        self.queues = [collections.deque() for _ in range(channels)]
+        self.pause_generators = [None] * channels
+        self.current = [None] * channels
+        self.accepted = [0] * channels
+
+        self.tdata.setimmediatevalue(0)
+        self.tvalid.setimmediatevalue(0)
+        self.tlast.setimmediatevalue(0)
+
+        cocotb.fork(self._run(clock))
+
+    def set_pause_generator(self, index, generator=None):
+        self.pause_generators[index] = generator
+
+    def send(self, index, tdata, tlast=None):
+        """Queue beats on interface `index`, with TLAST on the last by default."""
+        tdata = list(map(int, tdata))
+        if tlast is None:
+            tlast = [ii == len(tdata) - 1 for ii in range(len(tdata))]
+        self.queues[index].extend(zip(tdata, map(int, tlast)))
+
+    def idle(self):
+        return not any(self.queues) and all(beat is None for beat in self.current)
+
+    async def wait(self):
+        while not self.idle():
+            await RisingEdge(self.clock)
+
+    def sample(self):
+        tready = self.tready.value
+        ready = tready.integer if tready.is_resolvable else 0
+
+        for ii, generator in enumerate(self.pause_generators):
+            if self.current[ii] is not None and ready >> ii & 1:
+                self.current[ii] = None
+                self.accepted[ii] += 1
+
+            # a beat once presented is held until accepted
+            paused = generator and next(generator)
+            if self.current[ii] is None and self.queues[ii] and not paused:
+                self.current[ii] = self.queues[ii].popleft()
+
+        beats = [beat or (0, 0) for beat in self.current]
+        self.tdata <= pack([tdata for tdata, _ in beats], self.data_width)
+        self.tlast <= pack([tlast for _, tlast in beats], 1)
+        self.tvalid <= pack([beat is not None for beat in self.current], 1)
+
+    async def _run(self, clock):
+        while True:
+            await RisingEdge(clock)
+            self.sample()
+
+
+class PackedStreamSink:
+    """Sinks of the packed `prefix` master interfaces.
+
+    The beats received on interface i are in `beats[i]`, as (tdata, tlast).
+    """
+
+    def __init__(self, dut, prefix, clock, channels, data_width):
+        self.tdata = getattr(dut, f"{prefix}_tdata")
+        self.tvalid = getattr(dut, f"{prefix}_tvalid")
+        self.tlast = getattr(dut, f"{prefix}_tlast")
+        self.tready = getattr(dut, f"{prefix}_tready")
+
+        self.channels = channels
+        self.data_width = data_width
+
+        self.pause_generators = [None] * channels
+        self.beats = [[] for _ in range(channels)]
+        self.first = [None] * channels
+        self.last = [None] * channels
+        self.cycle = 0
+
+        self.tready.setimmediatevalue(0)
+
+        cocotb.fork(self._run(clock))
+
+    def set_pause_generator(self, index, generator=None):
+        self.pause_generators[index] = generator
+
+    def beats_per_clock(self, index):
+        if not self.beats[index]:
+            return 0.0
+        return len(self.beats[index]) / (self.last[index] - self.first[index] + 1)
+
+    def idle(self):
+        tvalid = self.tvalid.value
+        return tvalid.is_resolvable and tvalid.integer == 0
+
+    def sample(self):
+        tvalid = self.tvalid.value
+        tready = self.tready.value
+        if tvalid.is_resolvable and tready.is_resolvable:
+            handshakes = tvalid.integer & tready.integer
+            for ii in range(self.channels):
+                if handshakes >> ii & 1:
+                    tdata = field(self.tdata.value, ii, self.data_width)
+                    tlast = field(self.tlast.value, ii, 1)
+                    self.beats[ii].append((tdata, tlast))
+                    if self.first[ii] is None:
+                        self.first[ii] = self.cycle
+                    self.last[ii] = self.cycle
+
+        self.tready <= pack([not (generator and next(generator)) for generator in self.pause_generators], 1)
+
+        self.cycle += 1
+
+    async def _run(self, clock):
+        while True:
+            await RisingEdge(clock)
+            self.sample()
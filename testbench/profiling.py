@@ -0,0 +1,169 @@
+"""Opt-in per-test profiling (PROFILE=1).
+
+Each generated test runs under cProfile. Time spent in Python is measured
+around the scheduler's reaction to every simulator (GPI) callback; the rest
+of the wall time is spent in the simulator. For every test a report and the
+raw pstats are written to PROFILE_DIR (profile by default), and the folded
+stacks of all tests in a module are merged into <module>.folded, which can
+be rendered with flamegraph.pl or speedscope.
+"""
+
+import cProfile
+import collections
+import io
+import os
+import pstats
+import time
+
+import cocotb
+from cocotb.triggers import RisingEdge
+from cocotb.utils import get_sim_time
+
+
+def profiling_enabled():
+    return os.environ.get("PROFILE", "0") not in ("", "0")
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def folded_stacks(stats, max_depth=64):
+    """Collapse pstats into flame graph stacks, in microseconds.
+
+    cProfile only records caller/callee pairs, so below the first level the
+    time of a function is split between the paths reaching it in proportion
+    to the time spent on each call edge.
+    """
+    entries = stats.stats
+
+    callees = collections.defaultdict(dict)
+    for func, (cc, nc, tt, ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    folded = collections.Counter()
+
+    def visit(func, path, scale):
+        tt, ct = entries[func][2:4]
+        stack = path + [_label(func)]
+
+        if tt * scale > 0:
+            folded[";".join(stack)] += tt * scale * 1e6
+
+        if len(stack) >= max_depth:
+            return
+
+        for callee, edge in callees[func].items():
+            callee_ct = entries[callee][3]
+            share = scale * edge[3] / callee_ct if callee_ct else 0
+            if callee not in visited and callee_ct * share >= 1e-6:
+                visited.add(callee)
+                visit(callee, stack, share)
+                visited.discard(callee)
+
+    for func, entry in entries.items():
+        if not entry[4]:
+            visited = {func}
+            visit(func, [], 1.0)
+
+    return collections.Counter({stack: int(t) for stack, t in folded.items() if int(t)})
+
+
+class TestProfiler:
+    """Profiles one test: cProfile, Python vs simulator time and callbacks."""
+
+    merged = collections.defaultdict(collections.Counter)
+
+    def __init__(self, dut, name, module, clock="aclk"):
+        self.dut = dut
+        self.name = name
+        self.module = module
+        self.clock = getattr(dut, clock, None)
+        self.path = os.environ.get("PROFILE_DIR", "profile")
+
+        self.profile = cProfile.Profile()
+        self.callbacks = 0
+        self.python_time = 0.0
+        self.cycles = 0
+
+    async def _count_cycles(self):
+        # RisingEdge triggers are shared, so this adds no callbacks of its own
+        # as long as anything else waits on the clock
+        while True:
+            await RisingEdge(self.clock)
+            self.cycles += 1
+
+    def start(self):
+        # triggers are primed with the bound scheduler._react (scheduler.react
+        # is a deprecated wrapper nothing calls), so shadow it on the instance
+        scheduler = cocotb.scheduler
+        self.react = scheduler._react
+
+        def react(trigger):
+            # triggers fired while reacting are only queued, and their time
+            # is already part of the outer reaction
+            if scheduler._is_reacting:
+                return self.react(trigger)
+
+            start = time.perf_counter()
+            try:
+                return self.react(trigger)
+            finally:
+                self.python_time += time.perf_counter() - start
+                self.callbacks += 1
+
+        scheduler._react = react
+
+        if self.clock is not None:
+            cocotb.fork(self._count_cycles())
+
+        self.sim_start = get_sim_time("ns")
+        self.wall_start = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        wall_time = time.perf_counter() - self.wall_start
+        sim_time = get_sim_time("ns") - self.sim_start
+
+        del cocotb.scheduler._react
+
+        os.makedirs(self.path, exist_ok=True)
+        prefix = os.path.join(self.path, f"{self.module}.{self.name}")
+
+        stats = pstats.Stats(self.profile)
+        stats.dump_stats(f"{prefix}.prof")
+
+        # the simulator runs between callbacks, the testbench inside them
+        simulator_time = max(wall_time - self.python_time, 0.0)
+
+        summary = [
+            f"test {self.module}.{self.name}",
+            f"wall time {wall_time:.3f} s",
+            f"python time {self.python_time:.3f} s ({100*self.python_time/wall_time:.1f} %)",
+            f"simulator time {simulator_time:.3f} s ({100*simulator_time/wall_time:.1f} %)",
+            f"simulated {sim_time:.0f} ns, {self.cycles} cycles, {self.cycles/wall_time:.0f} cycles/s",
+            f"gpi callbacks {self.callbacks} ({self.callbacks/max(self.cycles, 1):.2f} per cycle)",
+        ]
+
+        with open(f"{prefix}.txt", "w") as f:
+            f.write("\n".join(summary) + "\n\n")
+            stream = io.StringIO()
+            pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(40)
+            f.write(stream.getvalue())
+
+        merged = self.merged[self.module]
+        merged.update(folded_stacks(stats))
+
+        with open(os.path.join(self.path, f"{self.module}.folded"), "w") as f:
+            for stack, count in sorted(merged.items()):
+                f.write(f"{stack} {count}\n")
+
+        for line in summary[1:]:
+            self.dut._log.info(f"profile: {line}")
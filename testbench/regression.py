@@ -0,0 +1,52 @@
+"""Regression mode selection and covering arrays.
+
+Pre-merge runs generate a covering array over the test options: every
+combination of any `strength` options (pairwise by default) appears in at
+least one selected test. Nightly runs (REGRESSION=nightly) generate the full
+cartesian product.
+"""
+
+import itertools
+import os
+
+
+def is_nightly():
+    return os.environ.get("REGRESSION", "").lower() == "nightly"
+
+
+def covering_strength():
+    return int(os.environ.get("COVERING_STRENGTH", "2"))
+
+
+def covering_rows(rows, strength=2):
+    """Select rows covering every `strength`-way combination of values.
+
+    `rows` is a sequence of equal-length tuples of hashable values (the
+    candidate tests); the indices of the selected rows are returned in
+    ascending order. Rows are picked greedily, the row covering the most
+    uncovered combinations first and the lowest index on ties, so the
+    selection is deterministic and includes row 0.
+    """
+    rows = [tuple(row) for row in rows]
+    if not rows:
+        return []
+
+    width = len(rows[0])
+    if strength >= width:
+        return list(range(len(rows)))
+
+    groups = list(itertools.combinations(range(width), strength))
+
+    def combinations(row):
+        return {(group, tuple(row[i] for i in group)) for group in groups}
+
+    candidates = {index: combinations(row) for index, row in enumerate(rows)}
+    uncovered = set().union(*candidates.values())
+
+    selected = []
+    while uncovered:
+        index = max(candidates, key=lambda k: (len(candidates[k] & uncovered), -k))
+        uncovered -= candidates.pop(index)
+        selected.append(index)
+
+    return sorted(selected)
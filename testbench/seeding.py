@@ -0,0 +1,47 @@
+"""Per-test random seeds.
+
+The testbenches draw their stimulus and pause patterns from a module-global
+`rng`. Every generated test reseeds it from a seed derived from the test
+name and its options, so a test gets the same stimulus whatever ran before
+it. The seed is logged, and on failure so is a command rerunning just that
+test; TEST_SEED overrides the derived seed.
+"""
+
+import hashlib
+import json
+import os
+import random
+import shlex
+
+import cocotb
+import numpy as np
+
+from .telemetry import describe, dut_parameters
+
+
+def derive_seed(module, name, options):
+    if os.environ.get("TEST_SEED"):
+        return int(os.environ["TEST_SEED"], 0)
+
+    key = json.dumps([module, name, {k: describe(v) for k, v in options.items()}], sort_keys=True)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "little")
+
+
+def seed_module(mod, seed):
+    mod.rng = np.random.default_rng(seed)
+    random.seed(seed)
+
+
+def reproduce_command(mod, name, seed):
+    """Shell command rerunning a single generated test with its seed."""
+    directory = os.path.relpath(os.path.dirname(os.path.abspath(mod.__file__)))
+
+    simulator = os.environ.get("SIM")
+    if not simulator:
+        simulator = "verilator" if "verilator" in (cocotb.SIM_NAME or "").lower() else "icarus"
+
+    env = {"TESTCASE": name, "TEST_SEED": str(seed), "SIM": simulator}
+    env.update({f"PARAM_{k}": v for k, v in sorted(dut_parameters().items())})
+
+    assignments = " ".join(f"{k}={shlex.quote(v)}" for k, v in env.items())
+    return f"{assignments} make -C {shlex.quote(directory)}"
@@ -0,0 +1,198 @@
+"""Bounded-memory soak runs of AXI4-Stream cores.
+
+A soak run drives a core's slave interface and checks its master interface
+beat by beat for as long as requested (SOAK_BEATS checked output beats, or
+SOAK_SECONDS of wall time), e.g. 10^8 beats overnight:
+
+    SOAK_BEATS=100000000 TESTCASE=run_test_soak_001 make
+
+Stimulus is pulled lazily from an iterator of beats, typically generated in
+chunks with `stream_beats(sample_chunks(generator))`, and the expected output
+comes from a streaming reference: a callable mapping every accepted input
+beat to the output beats it produces, or an iterator of output beats for
+cores without a slave interface. Only the beats in flight through the
+core and a short history for error context are kept, so memory use does not
+grow with the length of the run. The run stops on the first mismatch.
+"""
+
+import collections
+import itertools
+import os
+import time
+
+from cocotb.triggers import RisingEdge
+
+
+def soak_beats(default=10000):
+    return int(float(os.environ.get("SOAK_BEATS", default)))
+
+
+def soak_seconds():
+    seconds = os.environ.get("SOAK_SECONDS")
+    return float(seconds) if seconds else None
+
+
+def sample_chunks(generator, size=4096):
+    """Endless chunks of `size` samples drawn from `generator(size)`."""
+    while True:
+        yield generator(size)
+
+
+def stream_beats(chunks, frame_length=None):
+    """(tdata, tlast) beats of a stream of sample chunks.
+
+    tlast is set on every `frame_length`-th beat, or never if None.
+    """
+    index = 0
+    for chunk in chunks:
+        for value in chunk:
+            index += 1
+            last = frame_length is not None and index % frame_length == 0
+            yield int(value), int(last)
+
+
+def repeat_frame(values, last=True):
+    """Endless repetition of a frame of `values`, tlast on its final beat."""
+    values = [int(v) for v in values]
+    return itertools.cycle([(v, int(last and n == len(values) - 1)) for n, v in enumerate(values)])
+
+
+class StreamSoak:
+    """Drives `source` and checks `sink` of a core against a streaming reference.
+
+    The soak run drives the slave interface signals and the master interface
+    TREADY itself, so no other driver may be attached to them. Expected beats
+    are (tdata, tlast) pairs; a tlast of None is not checked.
+    """
+
+    def __init__(self, dut, clock, source="s_axis", sink="m_axis",
+                 history=16, max_in_flight=4096, timeout=10000, report_interval=1000000):
+        self.dut = dut
+        self.clock = clock
+        self.log = dut._log
+
+        self.history = history
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.report_interval = report_interval
+
+        if source:
+            self.s_tdata = getattr(dut, f"{source}_tdata")
+            self.s_tvalid = getattr(dut, f"{source}_tvalid")
+            self.s_tready = getattr(dut, f"{source}_tready")
+            self.s_tlast = getattr(dut, f"{source}_tlast", None)
+
+            self.s_tvalid.setimmediatevalue(0)
+
+        self.m_tdata = getattr(dut, f"{sink}_tdata")
+        self.m_tvalid = getattr(dut, f"{sink}_tvalid")
+        self.m_tready = getattr(dut, f"{sink}_tready")
+        self.m_tlast = getattr(dut, f"{sink}_tlast", None)
+
+        self.m_tready.setimmediatevalue(0)
+
+    def _mismatch(self, message, index, cycle, recent, sent):
+        lines = [f"soak: {message} at output beat {index} (cycle {cycle}, {sent} input beats accepted)"]
+        lines.append("recent output beats (index, tdata, tlast, expected):")
+        for n, tdata, tlast, expected in recent:
+            lines.append(f"  {n}: 0x{tdata:x} {tlast} {expected}")
+        return AssertionError("\n".join(lines))
+
+    async def run(self, stimulus=None, reference=None, expected=None, beats=None, seconds=None,
+                  idle_generator=None, backpressure_generator=None):
+        """Run until `beats` output beats were checked or `seconds` have passed.
+
+        `stimulus` is an iterable of (tdata, tlast) input beats and
+        `reference(tdata, tlast)` returns the output beats produced by an input
+        beat. For a core without a slave interface, or output precomputed for
+        the whole stimulus, `expected` iterates over the output beats instead.
+        Returns the statistics of the run.
+        """
+        beats = soak_beats() if beats is None else beats
+        seconds = soak_seconds() if seconds is None else seconds
+
+        inputs = iter(stimulus) if stimulus is not None else None
+        expected = iter(expected) if expected is not None else None
+
+        pending = collections.deque()
+        recent = collections.deque(maxlen=self.history)
+
+        beat = None
+        ready = 0
+        sent = 0
+        received = 0
+        cycle = 0
+        last_output = 0
+
+        start = time.perf_counter()
+        deadline = start + seconds if seconds else None
+        self.log.info(f"soak: {beats} beats" + (f" or {seconds:.0f} s" if seconds else ""))
+
+        while True:
+            await RisingEdge(self.clock)
+            cycle += 1
+
+            if beat is not None and self.s_tready.value:
+                sent += 1
+                if reference is not None:
+                    pending.extend(reference(*beat))
+                beat = None
+
+            if ready and self.m_tvalid.value:
+                tdata = int(self.m_tdata.value)
+                tlast = int(self.m_tlast.value) if self.m_tlast is not None else None
+
+                if expected is not None:
+                    wanted = next(expected, None)
+                else:
+                    wanted = pending.popleft() if pending else None
+
+                if wanted is None:
+                    recent.append((received, tdata, tlast, None))
+                    raise self._mismatch("unexpected output beat", received, cycle, recent, sent)
+
+                recent.append((received, tdata, tlast, wanted))
+
+                if tdata != wanted[0] or (wanted[1] is not None and tlast != wanted[1]):
+                    raise self._mismatch(f"expected {wanted}, got (0x{tdata:x}, {tlast})",
+                        received, cycle, recent, sent)
+
+                received += 1
+                last_output = cycle
+
+                if received % self.report_interval == 0:
+                    elapsed = time.perf_counter() - start
+                    self.log.info(f"soak: {received} beats, {received/elapsed:.0f} beats/s")
+
+                if received >= beats or (deadline and time.perf_counter() >= deadline):
+                    break
+
+            if cycle - last_output > self.timeout:
+                raise self._mismatch(f"no output for {self.timeout} cycles", received, cycle, recent, sent)
+
+            assert len(pending) <= self.max_in_flight, \
+                f"soak: {len(pending)} expected beats in flight, more than {self.max_in_flight}"
+
+            if inputs is not None:
+                if beat is None and not (idle_generator and next(idle_generator)):
+                    beat = next(inputs, None)
+
+                if beat is not None:
+                    self.s_tdata <= beat[0]
+                    if self.s_tlast is not None:
+                        self.s_tlast <= beat[1]
+                self.s_tvalid <= int(beat is not None)
+
+            ready = int(not (backpressure_generator and next(backpressure_generator)))
+            self.m_tready <= ready
+
+        elapsed = time.perf_counter() - start
+        self.m_tready <= 0
+        if inputs is not None:
+            self.s_tvalid <= 0
+
+        stats = dict(beats=received, inputs=sent, cycles=cycle, seconds=elapsed,
+                     beats_per_sec=received / elapsed if elapsed else None)
+        self.log.info(f"soak: {received} beats in {cycle} cycles and {elapsed:.1f} s "
+                      f"({stats['beats_per_sec']:.0f} beats/s, {cycle/elapsed:.0f} cycles/s)")
+        return stats
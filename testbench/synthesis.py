@@ -0,0 +1,254 @@
+"""Synthesis benchmark of the cores with Yosys.
+
+Each core is synthesized for the parameter sets in SWEEPS, reading the RTL
+sources of its cocotb testbench, for a Xilinx 7-series target (the Zynq of
+the Red Pitaya) by default or Yosys' generic 6-input LUT mapping. The cell
+counts (LUTs, flip-flops, block RAM in 18 kb units, LUT RAM, DSPs, carry
+chains) and the longest combinational path, in cells between registers, are
+written to a JSON report (synthesis.json by default) meant to be diffed
+between commits:
+
+    python -m testbench.synthesis [--target xilinx|generic] [--jobs N] [--output PATH] [core ...]
+    python -m testbench.synthesis --compare base.json [--output PATH]
+
+The scripts and logs of each run are kept in SYNTH_DIR (synthesis/ at the
+top of the repository by default).
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from .dependencies import ROOT, core_sources, testbenches
+from .telemetry import format_table
+
+
+# parameter sets benchmarked for each core
+SWEEPS = {
+    "axis_multichannel_accumulator": [
+        dict(CHANNELS=1024),
+        dict(CHANNELS=4096),
+        dict(CHANNELS=4096, READ_LATENCY=2),
+        dict(CHANNELS=1024, OPT_COMPLEX=1),
+        dict(CHANNELS=1024, OPT_DOUBLE_BUFFER=1),
+        dict(CHANNELS=1024, OPT_SNAPSHOT=1),
+    ],
+    "axi_bram_interface": [
+        dict(AXI_ADDR_WIDTH=12),
+        dict(AXI_ADDR_WIDTH=16),
+    ],
+    "axi_axis_recorder": [
+        dict(AXI_ADDR_WIDTH=14),
+    ],
+    "axi_axis_streamer": [
+        dict(AXI_ADDR_WIDTH=14),
+        dict(AXI_ADDR_WIDTH=14, OPT_SEQUENCER=1),
+    ],
+    "axis_packetizer": [
+        dict(LANES=1),
+        dict(LANES=4),
+        dict(LANES=4, OPT_REGISTER=1),
+        dict(LANES=4, OPT_HEADER=1),
+    ],
+    "axis_real_to_complex": [
+        dict(OPT_REGISTER=0),
+        dict(OPT_REGISTER=1),
+        dict(OPT_DDC=1),
+    ],
+    "axis_width_converter": [
+        dict(S_LANES=1, M_LANES=4),
+        dict(S_LANES=4, M_LANES=1),
+    ],
+    "axis_packet_fifo": [
+        dict(ADDR_WIDTH=10),
+        dict(ADDR_WIDTH=10, OPT_STORE_FORWARD=0),
+    ],
+    "axis_broadcaster": [
+        dict(OUTPUTS=2),
+        dict(OUTPUTS=4),
+    ],
+    "axis_spectrometer": [
+        dict(CHANNELS=1024),
+    ],
+}
+
+TARGETS = {
+    "xilinx": "synth_xilinx -flatten",
+    "generic": "synth -flatten -lut 6",
+}
+
+# cell type prefixes of each resource, and the cells counting double
+RESOURCES = {
+    "luts": ("LUT", "$lut"),
+    "ffs": ("FD", "$_DFF", "$_SDFF", "$_ALDFF", "$_DLATCH"),
+    "bram18": ("RAMB",),
+    "lutram": ("RAM32", "RAM64", "RAM128", "RAM256"),
+    "dsps": ("DSP48",),
+    "carry": ("CARRY",),
+}
+WEIGHTS = {"RAMB36E1": 2}
+
+# cells that register their outputs, where a combinational path ends
+REGISTERS = RESOURCES["ffs"] + RESOURCES["bram18"]
+
+# metrics compared between reports
+METRICS = ["luts", "ffs", "bram18", "lutram", "dsps", "carry", "longest_path"]
+
+
+Job = collections.namedtuple("Job", ["core", "parameters", "target", "sources"])
+
+
+def synthesis_directory():
+    return os.environ.get("SYNTH_DIR", os.path.join(ROOT, "synthesis"))
+
+
+def jobs(cores=None, target="xilinx", root=ROOT):
+    """Jobs of the selected cores, every core in SWEEPS by default."""
+    graph = testbenches(root)
+
+    selected = []
+    for core in cores or sorted(SWEEPS):
+        if not os.path.exists(os.path.join(root, core, "rtl", f"{core}.sv")):
+            raise KeyError(f"no core {core}")
+
+        sources = core_sources(core, graph, root)
+        for parameters in SWEEPS.get(core, [{}]):
+            selected.append(Job(core, parameters, target, sources))
+
+    return selected
+
+
+def job_name(job):
+    parameters = "-".join(f"{name}{value}" for name, value in job.parameters.items())
+    return "-".join(filter(None, [job.core, parameters]))
+
+
+def yosys_script(job, name):
+    """Yosys script of a job, writing `name`.stat.json and `name`.ltp.log."""
+    # `ltp -noff` only skips the internal $_DFF_* cells, so the path is cut
+    # by leaving every register out of the selection instead
+    combinational = " ".join(["t:*"] + [f"t:{prefix}* %d" for prefix in REGISTERS])
+
+    lines = [f"read_verilog -sv {source}" for source in job.sources]
+    lines += [f"chparam -set {key} {value} {job.core}" for key, value in job.parameters.items()]
+    lines += [f"{TARGETS[job.target]} -top {job.core}",
+              f"tee -q -o {name}.stat.json stat -json",
+              f"tee -q -o {name}.ltp.log ltp {combinational}"]
+    return "\n".join(lines) + "\n"
+
+
+def resources(cells):
+    """Resource counts of a map of cell type to count."""
+    counts = dict.fromkeys(RESOURCES, 0)
+    for cell, count in cells.items():
+        for resource, prefixes in RESOURCES.items():
+            if cell.startswith(prefixes):
+                counts[resource] += count * WEIGHTS.get(cell, 1)
+    return counts
+
+
+def longest_path(log):
+    """Length of the longest topological path reported by `ltp`."""
+    lengths = [int(length) for length in re.findall(r"\(length=(\d+)\)", log)]
+    return max(lengths, default=None)
+
+
+def run_yosys(job, directory):
+    """Report entry of a job, synthesized in `directory`."""
+    name = job_name(job)
+    with open(os.path.join(directory, f"{name}.ys"), "w") as f:
+        f.write(yosys_script(job, name))
+
+    with open(os.path.join(directory, f"{name}.log"), "w") as log:
+        result = subprocess.run(["yosys", "-q", "-s", f"{name}.ys"], cwd=directory,
+            stdout=log, stderr=subprocess.STDOUT)
+
+    entry = dict(core=job.core, parameters=job.parameters, target=job.target)
+    if result.returncode:
+        return dict(entry, status="ERROR")
+
+    with open(os.path.join(directory, f"{name}.stat.json")) as f:
+        cells = json.load(f)["design"]["num_cells_by_type"]
+    with open(os.path.join(directory, f"{name}.ltp.log")) as f:
+        depth = longest_path(f.read())
+
+    return dict(entry, status="OK", cells=cells, longest_path=depth, **resources(cells))
+
+
+def run(selected, workers=None, directory=None):
+    """Report of the jobs, synthesized in parallel."""
+    directory = directory or synthesis_directory()
+    os.makedirs(directory, exist_ok=True)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        entries = executor.map(lambda job: run_yosys(job, directory), selected)
+        return dict(zip(map(job_name, selected), entries))
+
+
+def compare(base, report):
+    """Rows of the metrics that changed between two reports."""
+    rows = []
+    for name in sorted(set(base) | set(report)):
+        old = base.get(name, {})
+        new = report.get(name, {})
+        for metric in METRICS:
+            if old.get(metric) != new.get(metric):
+                rows.append((name, metric, old.get(metric), new.get(metric)))
+    return rows
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_report(path, report):
+    # sorted and indented, so reports of two commits diff line by line
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m testbench.synthesis",
+        description="Synthesize the cores with Yosys and report their resources and logic depth.")
+    parser.add_argument("cores", nargs="*", help="cores to synthesize (default: all in SWEEPS)")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="xilinx", help="synthesis target (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel jobs (default: the number of CPUs)")
+    parser.add_argument("--output", default="synthesis.json", help="JSON report (default: %(default)s)")
+    parser.add_argument("--compare", metavar="BASE", default=None,
+        help="compare the report in --output with the report BASE instead of synthesizing")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        rows = compare(load_report(args.compare), load_report(args.output))
+        print(format_table(["job", "metric", args.compare, args.output], rows) if rows else "no changes")
+        return 0
+
+    try:
+        selected = jobs(args.cores, args.target)
+    except KeyError as error:
+        print(error.args[0], file=sys.stderr)
+        return 1
+
+    if shutil.which("yosys") is None:
+        print("yosys not found in PATH", file=sys.stderr)
+        return 1
+
+    report = run(selected, args.jobs)
+    save_report(args.output, report)
+
+    print(format_table(["job", "status", *METRICS],
+        [(name, entry["status"], *(entry.get(metric) for metric in METRICS)) for name, entry in report.items()]))
+
+    return 0 if all(entry["status"] == "OK" for entry in report.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Test duration telemetry.
+
+Every generated cocotb test and every pytest parametrization of a cocotb
+entry point appends a record to a local SQLite database (TELEMETRY_DB,
+.telemetry.sqlite at the top of the repository by default; TELEMETRY=0
+disables recording). Records of one pytest session or make invocation share
+a run id.
+
+Report the slowest tests of the latest run, regressions versus the previous
+runs and simulation speed per core with:
+
+    python -m testbench.telemetry [--runs N] [--slowest N]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    run TEXT,
+    timestamp REAL,
+    kind TEXT,
+    core TEXT,
+    test TEXT,
+    parameters TEXT,
+    simulator TEXT,
+    outcome TEXT,
+    sim_time REAL,
+    wall_time REAL,
+    cycles INTEGER,
+    cycles_per_sec REAL
+)
+"""
+
+
+def telemetry_enabled():
+    return os.environ.get("TELEMETRY", "1") not in ("", "0")
+
+
+def database_path():
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".telemetry.sqlite")
+    return os.environ.get("TELEMETRY_DB", default)
+
+
+def run_id():
+    # set once per pytest session (see conftest.py) and inherited by the
+    # simulations; a bare make invocation is a run of its own
+    if "TELEMETRY_RUN" not in os.environ:
+        os.environ["TELEMETRY_RUN"] = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+    return os.environ["TELEMETRY_RUN"]
+
+
+def core_name(module):
+    return module[len("test_"):] if module.startswith("test_") else module
+
+
+def describe(value):
+    if callable(value):
+        return value.__qualname__
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    else:
+        return repr(value)
+
+
+def connect(path=None):
+    db = sqlite3.connect(path or database_path(), timeout=30)
+    db.execute(SCHEMA)
+    return db
+
+
+def record(kind, core, test, parameters, simulator, outcome, wall_time,
+           sim_time=None, cycles=None, path=None):
+    cycles_per_sec = cycles / wall_time if cycles and wall_time else None
+    parameters = json.dumps({k: describe(v) for k, v in parameters.items()}, sort_keys=True)
+
+    with connect(path) as db:
+        db.execute("INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id(), time.time(), kind, core, test, parameters, simulator, outcome,
+             sim_time, wall_time, cycles, cycles_per_sec))
+    db.close()
+
+
+def dut_parameters():
+    """HDL parameters of the simulation, as passed in PARAM_* variables."""
+    return {k[len("PARAM_"):]: v for k, v in os.environ.items() if k.startswith("PARAM_")}
+
+
+class TestRecorder:
+    """Times one generated cocotb test and records it on completion."""
+
+    def __init__(self, dut, name, module, options, clock="aclk"):
+        self.dut = dut
+        self.name = name
+        self.module = module
+        self.options = options
+        self.clock = getattr(dut, clock, None)
+        self.cycles = 0
+
+    async def _count_cycles(self):
+        from cocotb.triggers import RisingEdge
+
+        while True:
+            await RisingEdge(self.clock)
+            self.cycles += 1
+
+    def start(self):
+        import cocotb
+        from cocotb.utils import get_sim_time
+
+        if self.clock is not None:
+            cocotb.fork(self._count_cycles())
+
+        self.sim_start = get_sim_time("ns")
+        self.wall_start = time.perf_counter()
+
+    def stop(self, outcome):
+        import cocotb
+        from cocotb.utils import get_sim_time
+
+        wall_time = time.perf_counter() - self.wall_start
+        sim_time = get_sim_time("ns") - self.sim_start
+
+        parameters = dut_parameters()
+        parameters.update(self.options)
+
+        record("cocotb", core_name(self.module), f"{self.module}.{self.name}", parameters,
+               cocotb.SIM_NAME, outcome, wall_time, sim_time=sim_time,
+               cycles=self.cycles if self.clock is not None else None)
+
+
+def format_table(header, rows):
+    rows = [["" if v is None else str(v) for v in row] for row in rows]
+    widths = [max([len(str(h))] + [len(row[i]) for row in rows]) for i, h in enumerate(header)]
+    lines = ["  ".join(str(h).ljust(w) for h, w in zip(header, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def runs(db):
+    return [row[0] for row in db.execute(
+        "SELECT run, MIN(timestamp) FROM tests GROUP BY run ORDER BY MIN(timestamp)")]
+
+
+def slowest(db, run, count):
+    return db.execute(
+        "SELECT test, parameters, simulator, wall_time, sim_time, cycles_per_sec FROM tests "
+        "WHERE run = ? ORDER BY wall_time DESC LIMIT ?", (run, count)).fetchall()
+
+
+def regressions(db, run, previous, threshold):
+    """Tests at least `threshold` slower than their median in `previous` runs."""
+    if not previous:
+        return []
+
+    history = {}
+    marks = ",".join("?" * len(previous))
+    for kind, test, parameters, wall_time in db.execute(
+            f"SELECT kind, test, parameters, wall_time FROM tests WHERE run IN ({marks})", previous):
+        history.setdefault((kind, test, parameters), []).append(wall_time)
+
+    result = []
+    for kind, test, parameters, wall_time in db.execute(
+            "SELECT kind, test, parameters, wall_time FROM tests WHERE run = ?", (run,)):
+        times = history.get((kind, test, parameters))
+        if times:
+            baseline = statistics.median(times)
+            if baseline and wall_time > baseline * (1 + threshold):
+                result.append((test, parameters, baseline, wall_time, wall_time / baseline))
+
+    return sorted(result, key=lambda r: r[4], reverse=True)
+
+
+def trends(db, selected):
+    """Simulated cycles per wall clock second of each core, per run."""
+    marks = ",".join("?" * len(selected))
+    speed = {}
+    for core, run, cycles, wall_time in db.execute(
+            f"SELECT core, run, SUM(cycles), SUM(wall_time) FROM tests "
+            f"WHERE kind = 'cocotb' AND cycles IS NOT NULL AND run IN ({marks}) "
+            f"GROUP BY core, run", selected):
+        speed.setdefault(core, {})[run] = cycles / wall_time if wall_time else None
+
+    return [(core, *(speed[core].get(run) for run in selected)) for core in sorted(speed)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m testbench.telemetry",
+        description="Report test durations recorded by the testbench telemetry.")
+    parser.add_argument("--db", default=None, help="telemetry database (default: TELEMETRY_DB or .telemetry.sqlite)")
+    parser.add_argument("--run", default=None, help="run to report on (default: the latest)")
+    parser.add_argument("--runs", type=int, default=5, help="number of previous runs to compare with")
+    parser.add_argument("--slowest", type=int, default=20, help="number of slowest tests to list")
+    parser.add_argument("--threshold", type=float, default=0.25,
+        help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    path = args.db or database_path()
+    if not os.path.exists(path):
+        print(f"no telemetry recorded in {path}", file=sys.stderr)
+        return 1
+
+    db = connect(path)
+    all_runs = runs(db)
+    if not all_runs:
+        print(f"no telemetry recorded in {path}", file=sys.stderr)
+        return 1
+
+    run = args.run or all_runs[-1]
+    if run not in all_runs:
+        print(f"unknown run {run}", file=sys.stderr)
+        return 1
+
+    previous = all_runs[max(all_runs.index(run) - args.runs, 0):all_runs.index(run)]
+
+    print(f"run {run}\n")
+
+    print("slowest tests")
+    print(format_table(["test", "parameters", "simulator", "wall [s]", "sim [ns]", "cycles/s"],
+        [(test, parameters, simulator, f"{wall:.2f}", sim and f"{sim:.0f}", cps and f"{cps:.0f}")
+         for test, parameters, simulator, wall, sim, cps in slowest(db, run, args.slowest)]))
+    print()
+
+    found = regressions(db, run, previous, args.threshold)
+    print(f"regressions versus the previous {len(previous)} runs")
+    if found:
+        print(format_table(["test", "parameters", "median [s]", "wall [s]", "ratio"],
+            [(test, parameters, f"{baseline:.2f}", f"{wall:.2f}", f"{ratio:.2f}")
+             for test, parameters, baseline, wall, ratio in found]))
+    else:
+        print("none")
+    print()
+
+    selected = previous + [run]
+    print("cycles/s per core")
+    print(format_table(["core", *selected],
+        [(core, *(cps and f"{cps:.0f}" for cps in speeds))
+         for core, *speeds in trends(db, selected)]))
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Stand-ins for the cocotb signal handles, so the monitors and drivers of
+the testbench package can be stepped by hand without a simulator."""
+
+import cocotb
+import pytest
+
+
+class Value(int):
+    """A resolved signal value, as a BinaryValue of `width` bits."""
+
+    is_resolvable = True
+
+    def __new__(cls, value, width=32):
+        value = super().__new__(cls, value)
+        value.width = width
+        return value
+
+    @property
+    def integer(self):
+        return int(self)
+
+    @property
+    def binstr(self):
+        return format(int(self), f"0{self.width}b")
+
+
+class Signal:
+    """Signal assigned immediately, by `<=` or setimmediatevalue."""
+
+    def __init__(self, value=0, width=32):
+        self.width = width
+        self.value = Value(value, width)
+
+    def setimmediatevalue(self, value):
+        self.value = Value(value, self.width)
+
+    def __le__(self, value):
+        self.value = Value(value, self.width)
+
+
+class RegisteredSignal(Signal):
+    """Signal updated by `<=` only on the next clock edge."""
+
+    def __init__(self, value=0, width=32):
+        super().__init__(value, width)
+        self.next = None
+
+    def __le__(self, value):
+        self.next = value
+
+    def edge(self):
+        if self.next is not None:
+            self.value = Value(self.next, self.width)
+            self.next = None
+
+
+@pytest.fixture(autouse=True)
+def no_fork(monkeypatch):
+    # the tests call the sampling methods instead of running their coroutines
+    monkeypatch.setattr(cocotb, "fork", lambda coroutine: coroutine.close())
@@ -0,0 +1,32 @@
+import json
+import os
+
+from testbench.coverage import Coverage, coverage_file
+
+
+def test_coverage_file(tmp_path, monkeypatch):
+    module = str(tmp_path / "core" / "test" / "cocotb" / "test_core.py")
+
+    # independent of the simulator's working directory
+    monkeypatch.delenv("COVERAGE_FILE", raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert coverage_file(module) == str(tmp_path / "core" / "test" / "cocotb" / "functional_coverage.json")
+
+    monkeypatch.setenv("COVERAGE_FILE", "other.json")
+    assert coverage_file(module) == "other.json"
+
+
+def test_accumulate(tmp_path):
+    path = str(tmp_path / "functional_coverage.json")
+
+    # two simulations of the same core, as two pytest parametrizations
+    for _ in range(2):
+        coverage = Coverage()
+        coverage.define("s_axis.stall", ["1", "2-3"])
+        coverage.sample("s_axis.stall", "1")
+        coverage.write(path)
+        coverage.sample("s_axis.stall", "1")
+        coverage.write(path)
+
+    with open(path) as f:
+        assert json.load(f) == {"s_axis.stall": {"1": 4, "2-3": 0}}
@@ -0,0 +1,88 @@
+import os
+import subprocess
+
+from testbench import dependencies
+
+
+ROOT = dependencies.ROOT
+
+
+def path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def bench_dir(core):
+    return path(core, "test", "cocotb")
+
+
+def test_sources():
+    graph = dependencies.testbenches()
+
+    assert graph[bench_dir("axi_axis_recorder")] == {
+        path("axi_axis_recorder", "rtl", "axi_axis_recorder.sv"),
+        path("axi_bram_interface", "rtl", "axi_bram_interface.sv"),
+        path("axis_bram_writer", "rtl", "axis_bram_writer_trigger.sv"),
+        path("bram", "rtl", "bram.sv"),
+    }
+
+    # Makefile-only testbenches are included as well
+    assert path("axis_skid_buffer", "rtl", "axis_skid_buffer.sv") in graph[bench_dir("axis_multichannel_accumulator")]
+
+
+def test_affected():
+    affected = dependencies.affected({path("axis_real_to_complex", "rtl", "axis_real_to_complex.sv")})
+    assert bench_dir("axis_real_to_complex") in affected
+    assert bench_dir("axi_axis_recorder") not in affected
+    assert bench_dir("axi_axis_streamer") not in affected
+
+    affected = dependencies.affected({path("bram", "rtl", "bram.sv")})
+    assert bench_dir("axi_axis_recorder") in affected
+    assert bench_dir("axi_axis_streamer") in affected
+    assert bench_dir("axis_packetizer") not in affected
+
+    affected = dependencies.affected({path("axis_packetizer", "test", "cocotb", "test_axis_packetizer.py")})
+    assert affected == {bench_dir("axis_packetizer")}
+
+    affected = dependencies.affected({path("testbench", "factory.py")})
+    assert affected == set(dependencies.testbenches())
+
+    assert dependencies.affected({path("README.md")}) == set()
+
+
+def test_makefile_sources(tmp_path):
+    (tmp_path / "rtl").mkdir()
+    (tmp_path / "rtl" / "core.sv").write_text("")
+    (tmp_path / "rtl" / "other.sv").write_text("")
+
+    makefile = tmp_path / "Makefile"
+    makefile.write_text(
+        "DUT      = core\n"
+        "VERILOG_SOURCES += rtl/$(DUT).sv\n"
+        "VERILOG_SOURCES += $(PWD)/rtl/other.sv # comment\n"
+        "VERILOG_SOURCES += iverilog_dump.v\n")
+
+    assert dependencies.makefile_sources(str(makefile)) == {
+        str(tmp_path / "rtl" / "core.sv"),
+        str(tmp_path / "rtl" / "other.sv"),
+    }
+
+
+def test_changed_files_ignores_build_outputs(tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@localhost", *args],
+            cwd=tmp_path, check=True, stdout=subprocess.DEVNULL)
+
+    bench = tmp_path / "core" / "test" / "cocotb"
+    bench.mkdir(parents=True)
+    (bench / "Makefile").write_text("")
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "initial")
+
+    # an empty .gitignore, so only the build output filter applies
+    (bench / "sim_build" / "test_core").mkdir(parents=True)
+    (bench / "sim_build" / "test_core" / "Vtop.cpp").write_text("")
+    (bench / "results.xml").write_text("")
+    (bench / "test_core.py").write_text("")
+
+    assert dependencies.changed_files("HEAD", root=str(tmp_path)) == {str(bench / "test_core.py")}
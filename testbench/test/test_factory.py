@@ -0,0 +1,29 @@
+import asyncio
+import logging
+import sys
+import types
+
+from testbench import factory
+
+
+async def run_grouped(dut, a=0, b=0, c=None):
+    dut.calls.append(dict(a=a, b=b, c=c))
+
+
+def test_grouped_options(monkeypatch):
+    monkeypatch.setenv("TELEMETRY", "0")
+    monkeypatch.delenv("REGRESSION", raising=False)
+    monkeypatch.setattr(factory, "coverage", types.SimpleNamespace(report=lambda log: None, write=lambda path: None))
+
+    tf = factory.TestFactory(run_grouped)
+    tf.add_option(("a", "b"), [(1, 2), (3, 4)])
+    tf.add_option("c", ["x", "y"])
+    tf.generate_tests()
+
+    module = sys.modules[__name__]
+    test = module.run_grouped_003
+    assert "\ta: 3\n\tb: 4\n\tc: 'x'\n" in test._func.__doc__
+
+    dut = types.SimpleNamespace(_log=logging.getLogger("dut"), calls=[])
+    asyncio.run(test._func(dut))
+    assert dut.calls == [dict(a=3, b=4, c="x")]
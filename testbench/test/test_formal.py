@@ -0,0 +1,79 @@
+import os
+
+from testbench import formal
+
+
+ROOT = formal.ROOT
+
+
+def path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def test_jobs():
+    assert "axis_packetizer" in formal.formal_cores()
+    assert "bram" not in formal.formal_cores()
+
+    jobs = formal.jobs(["axis_packetizer"], mode="prove", depth=8)
+    assert len(jobs) == len(formal.PARAMETERS["axis_packetizer"])
+
+    # the core instantiated is read before the top level
+    job = jobs[1]
+    assert job.sources == [
+        path("axis_skid_buffer", "rtl", "axis_skid_buffer.sv"),
+        path("axis_packetizer", "rtl", "axis_packetizer.sv"),
+    ]
+    assert formal.job_name(job) == "axis_packetizer-LANES4-OPT_REGISTER1-prove"
+
+    script = formal.sby_script(job)
+    assert "mode prove\ndepth 8\n" in script
+    assert "read -sv axis_skid_buffer.sv\nread -formal axis_packetizer.sv\n" in script
+    assert "chparam -set LANES 4 axis_packetizer\nchparam -set OPT_REGISTER 1 axis_packetizer\n" in script
+    assert script.endswith(path("axis_packetizer", "rtl", "axis_packetizer.sv") + "\n")
+
+
+def test_submodules_without_formal():
+    job = formal.jobs(["axis_multichannel_accumulator"])[1]
+    assert job.parameters == dict(CHANNELS=4, OPT_DOUBLE_BUFFER=1)
+
+    # the assumptions of the output FIFO must not constrain the accumulator
+    reads = [line for line in formal.sby_script(job).splitlines() if line.startswith("read ")]
+    assert "read -sv axis_packet_fifo.sv" in reads
+    assert reads[-1] == "read -formal axis_multichannel_accumulator.sv"
+    assert all(line.startswith("read -sv ") for line in reads[:-1])
+
+
+def test_cache(tmp_path, monkeypatch):
+    source = tmp_path / "core.sv"
+    source.write_text("module core; endmodule\n")
+    jobs = [formal.Job("core", dict(WIDTH=width), "bmc", 4, [str(source)]) for width in (8, 16)]
+
+    statuses = {"core-WIDTH8-bmc": "PASS", "core-WIDTH16-bmc": "UNKNOWN"}
+    ran = []
+
+    def run_sby(job, directory):
+        ran.append(formal.job_name(job))
+        return statuses[formal.job_name(job)]
+
+    monkeypatch.setattr(formal, "run_sby", run_sby)
+    directory = str(tmp_path / "formal")
+
+    results = formal.run(jobs, 2, directory)
+    assert [result.status for result in results] == ["PASS", "UNKNOWN"]
+    assert sorted(ran) == sorted(statuses)
+
+    # only the conclusive result is cached
+    ran.clear()
+    results = formal.run(jobs, 2, directory)
+    assert [result.cached for result in results] == [True, False]
+    assert ran == ["core-WIDTH16-bmc"]
+
+    # a change to the RTL runs every job again
+    ran.clear()
+    source.write_text("module core; wire a; endmodule\n")
+    formal.run(jobs, 2, directory)
+    assert sorted(ran) == sorted(statuses)
+
+    ran.clear()
+    formal.run(jobs, 2, directory, force=True)
+    assert sorted(ran) == sorted(statuses)
@@ -0,0 +1,71 @@
+import random
+import types
+
+from testbench.packed import PackedStreamSink, PackedStreamSource, field, pack
+
+from .conftest import RegisteredSignal, Value
+
+
+class Bus:
+    def __init__(self, channels, data_width):
+        self.axis_tdata = RegisteredSignal(width=channels * data_width)
+        self.axis_tvalid = RegisteredSignal(width=channels)
+        self.axis_tlast = RegisteredSignal(width=channels)
+        self.axis_tready = RegisteredSignal(width=channels)
+
+    def edge(self):
+        for signal in vars(self).values():
+            signal.edge()
+
+
+def random_pause(seed):
+    rng = random.Random(seed)
+    while True:
+        yield int(rng.random() < 0.5)
+
+
+def test_field():
+    assert field(Value(pack([1, 2, 3], 4), 12), 1, 4) == 2
+    assert pack([1, 0, 1], 1) == 0b101
+    assert field(types.SimpleNamespace(binstr="xxxx0011"), 0, 4) == 3
+    assert field(types.SimpleNamespace(binstr="xxxx0011"), 1, 4) is None
+
+
+def test_loopback():
+    channels, data_width = 3, 8
+    bus = Bus(channels, data_width)
+    source = PackedStreamSource(bus, "axis", None, channels, data_width)
+    sink = PackedStreamSink(bus, "axis", None, channels, data_width)
+
+    frames = [list(range(ii * 10, ii * 10 + 5 + ii)) for ii in range(channels)]
+    for ii, frame in enumerate(frames):
+        source.set_pause_generator(ii, random_pause(ii))
+        sink.set_pause_generator(ii, random_pause(ii + channels))
+        source.send(ii, frame)
+
+    for _ in range(200):
+        # both sides sample the state before the edge
+        source.sample()
+        sink.sample()
+        bus.edge()
+
+    assert source.idle()
+    assert source.accepted == [len(frame) for frame in frames]
+    for ii, frame in enumerate(frames):
+        assert sink.beats[ii] == [(tdata, int(nn == len(frame) - 1)) for nn, tdata in enumerate(frame)]
+
+
+def test_full_rate():
+    bus = Bus(2, 8)
+    source = PackedStreamSource(bus, "axis", None, 2, 8)
+    sink = PackedStreamSink(bus, "axis", None, 2, 8)
+
+    source.send(0, range(16))
+    source.send(1, range(16))
+    for _ in range(20):
+        source.sample()
+        sink.sample()
+        bus.edge()
+
+    assert sink.beats_per_clock(0) == 1.0
+    assert sink.beats_per_clock(1) == 1.0
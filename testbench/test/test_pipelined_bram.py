@@ -0,0 +1,46 @@
+import pytest
+
+from testbench.bram import PipelinedBRAM
+
+from .conftest import Signal, Value
+
+
+class Port:
+    def __init__(self):
+        for name in ["bram_rddata", "bram_wrdata", "bram_addr", "bram_we", "bram_en"]:
+            setattr(self, name, Signal())
+
+
+def cycle(bram, port, **inputs):
+    for name, value in inputs.items():
+        getattr(port, f"bram_{name}").value = Value(value)
+    bram.tick()
+    return int(port.bram_rddata.value)
+
+
+@pytest.mark.parametrize("latency", [1, 2, 3])
+def test_read_latency(latency):
+    port = Port()
+    bram = PipelinedBRAM(port, None, latency=latency)
+    bram.set_contents({addr: 100 + addr for addr in range(16)})
+
+    # one read per cycle, then the enable low
+    outputs = [cycle(bram, port, en=1, addr=addr) for addr in range(8)]
+    outputs += [cycle(bram, port, en=0, addr=0) for _ in range(latency)]
+
+    assert outputs[latency-1:latency+7] == [100 + addr for addr in range(8)]
+    # the output registers drain while the first stage holds
+    assert outputs[-1] == 107
+
+
+def test_write():
+    port = Port()
+    bram = PipelinedBRAM(port, None, latency=2)
+    bram.set_contents({3: 0x11223344})
+
+    cycle(bram, port, en=1, addr=3, we=0b0101, wrdata=0xAABBCCDD)
+    assert cycle(bram, port, en=0, we=0) == 0x11223344
+
+    bram.verify({3: 0x11BB33DD})
+    with pytest.raises(AssertionError):
+        bram.verify({3: 0x11223344})
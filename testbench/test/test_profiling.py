@@ -0,0 +1,101 @@
+import cProfile
+import logging
+import pstats
+import types
+
+import cocotb
+from cocotb.scheduler import Scheduler
+
+from testbench import profiling
+from testbench.profiling import folded_stacks
+
+
+def leaf(n):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+def inner():
+    return leaf(200000)
+
+def outer():
+    return leaf(100000) + inner()
+
+def top():
+    inner()
+    outer()
+
+
+def test_folded_stacks():
+    profile = cProfile.Profile()
+    profile.enable()
+    top()
+    profile.disable()
+
+    stats = pstats.Stats(profile)
+    folded = folded_stacks(stats)
+
+    paths = {tuple(name.split(" (")[0] for name in stack.split(";")): count
+             for stack, count in folded.items()}
+
+    assert ("top", "inner", "leaf") in paths
+    assert ("top", "outer", "inner", "leaf") in paths
+    assert ("top", "outer", "leaf") in paths
+
+    # leaf is reached through inner twice as often as directly from outer,
+    # and each path into inner carries half of its time
+    direct = paths[("top", "outer", "leaf")]
+    assert 0.5 < paths[("top", "inner", "leaf")] / direct < 4
+    assert 0.5 < paths[("top", "outer", "inner", "leaf")] / direct < 4
+
+    # the stacks add up to the profiled time
+    total = sum(folded.values())
+    profiled = sum(entry[2] for entry in stats.stats.values()) * 1e6
+    assert abs(total - profiled) < 0.05 * profiled
+
+
+class FakeScheduler:
+    """The real Scheduler._react around an event loop that does some work."""
+
+    _react = Scheduler._react
+
+    def __init__(self):
+        self._is_reacting = False
+        self._pending_triggers = []
+
+    def _event_loop(self, trigger):
+        leaf(10000)
+        # a trigger fired from inside the loop is queued, as in cocotb
+        self._react(None)
+        self._pending_triggers.clear()
+
+    def fire(self, count):
+        for trigger in range(count):
+            # as Scheduler._coroutine_yielded primes triggers
+            callback = self._react
+            callback(trigger)
+
+
+def test_profiler_counts_callbacks(tmp_path, monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(cocotb, "scheduler", scheduler)
+    monkeypatch.setattr(profiling, "get_sim_time", lambda units: 0)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+    dut = types.SimpleNamespace(_log=logging.getLogger("dut"))
+    profiler = profiling.TestProfiler(dut, "run_test", "test_core")
+
+    profiler.start()
+    scheduler.fire(20)
+    profiler.stop()
+
+    # nested reactions are neither counted nor timed twice
+    assert profiler.callbacks == 20
+    assert profiler.python_time > 0
+    assert (tmp_path / "test_core.run_test.txt").exists()
+
+    # the scheduler is restored
+    assert "_react" not in vars(scheduler)
+    scheduler.fire(5)
+    assert profiler.callbacks == 20
@@ -0,0 +1,44 @@
+import itertools
+
+import pytest
+
+from testbench.regression import covering_rows
+
+
+def combinations(rows, strength):
+    width = len(rows[0])
+    return {(group, tuple(row[i] for i in group))
+            for row in rows
+            for group in itertools.combinations(range(width), strength)}
+
+
+@pytest.mark.parametrize("sizes", [(2, 2), (2, 3, 3), (2, 2, 2, 3, 3), (3, 3, 3, 3), (2, 4, 2, 5, 3, 2)])
+@pytest.mark.parametrize("strength", [1, 2, 3])
+def test_covering_rows(sizes, strength):
+    rows = list(itertools.product(*(range(n) for n in sizes)))
+    selected = covering_rows(rows, strength)
+
+    assert selected == sorted(set(selected))
+    assert selected[0] == 0
+    assert combinations([rows[i] for i in selected], min(strength, len(sizes))) == \
+        combinations(rows, min(strength, len(sizes)))
+
+    if strength < len(sizes):
+        assert len(selected) < len(rows)
+
+
+def test_covering_rows_pairwise_size():
+    # 2x2x2x3x3 options: the full product has 72 rows, pairwise needs at least 9
+    rows = list(itertools.product(range(2), range(2), range(2), range(3), range(3)))
+    selected = covering_rows(rows, 2)
+
+    assert 9 <= len(selected) <= 12
+
+
+def test_covering_rows_partial_product():
+    # only combinations present in the candidates need covering
+    rows = [(0, 0, 0), (0, 1, 1), (1, 0, 1), (1, 1, 0), (1, 1, 1)]
+    selected = covering_rows(rows, 2)
+
+    assert combinations([rows[i] for i in selected], 2) == combinations(rows, 2)
+    assert covering_rows([], 2) == []
@@ -0,0 +1,43 @@
+import types
+
+from testbench.seeding import derive_seed, reproduce_command, seed_module
+
+
+def pause(): pass
+
+
+def test_derive_seed(monkeypatch):
+    monkeypatch.delenv("TEST_SEED", raising=False)
+
+    seed = derive_seed("test_axis_packetizer", "run_test_003", {"nblocks": 1, "pause_generator": pause})
+
+    assert seed == derive_seed("test_axis_packetizer", "run_test_003", {"pause_generator": pause, "nblocks": 1})
+    assert seed != derive_seed("test_axis_packetizer", "run_test_004", {"nblocks": 1, "pause_generator": pause})
+    assert seed != derive_seed("test_axis_packetizer", "run_test_003", {"nblocks": 4, "pause_generator": pause})
+
+    monkeypatch.setenv("TEST_SEED", "0x1234")
+    assert derive_seed("test_axis_packetizer", "run_test_003", {}) == 0x1234
+
+
+def test_seed_module():
+    mod = types.ModuleType("test_module")
+
+    seed_module(mod, 42)
+    first = mod.rng.integers(0, 2**16, 8).tolist()
+    seed_module(mod, 42)
+    assert mod.rng.integers(0, 2**16, 8).tolist() == first
+
+
+def test_reproduce_command(monkeypatch):
+    monkeypatch.setenv("SIM", "icarus")
+    monkeypatch.setenv("PARAM_DATA_WIDTH", "32")
+
+    mod = types.ModuleType("test_axis_packetizer")
+    mod.__file__ = "/tmp/axis_packetizer/test/cocotb/test_axis_packetizer.py"
+
+    command = reproduce_command(mod, "run_test_003", 1234)
+
+    assert "TESTCASE=run_test_003" in command
+    assert "TEST_SEED=1234" in command
+    assert "PARAM_DATA_WIDTH=32" in command
+    assert command.endswith("axis_packetizer/test/cocotb")
@@ -0,0 +1,122 @@
+import asyncio
+import collections
+import itertools
+import random
+import types
+
+import pytest
+
+import testbench.soak
+from testbench.soak import StreamSoak, repeat_frame, sample_chunks, soak_beats, stream_beats
+
+from .conftest import Signal
+
+
+class Fifo:
+    """Two-entry FIFO with registered outputs, corrupting output beat `corrupt`."""
+
+    def __init__(self, corrupt=None):
+        self._log = types.SimpleNamespace(info=lambda message: None)
+        self.aclk = self
+
+        for name in ["s_axis_tdata", "s_axis_tvalid", "s_axis_tlast", "s_axis_tready",
+                     "m_axis_tdata", "m_axis_tvalid", "m_axis_tlast", "m_axis_tready"]:
+            setattr(self, name, Signal())
+
+        self.entries = collections.deque()
+        self.previous = None
+        self.corrupt = corrupt
+        self.outputs = 0
+        self.update()
+
+    def update(self):
+        self.s_axis_tready.value = int(len(self.entries) < 2)
+        self.m_axis_tvalid.value = int(bool(self.entries))
+        if self.entries:
+            tdata, tlast = self.entries[0]
+            self.m_axis_tdata.value = tdata ^ int(self.outputs == self.corrupt)
+            self.m_axis_tlast.value = tlast
+
+    def edge(self):
+        # the state visible after an edge is the state before it; the update
+        # with the inputs of the previous cycle is applied first
+        if self.previous:
+            accept, tdata, tlast, pop = self.previous
+            if pop:
+                self.entries.popleft()
+                self.outputs += 1
+            if accept:
+                self.entries.append((tdata, tlast))
+            self.update()
+
+        self.previous = (
+            self.s_axis_tvalid.value and self.s_axis_tready.value,
+            self.s_axis_tdata.value, self.s_axis_tlast.value,
+            self.m_axis_tvalid.value and self.m_axis_tready.value)
+
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    async def edge(clock):
+        clock.edge()
+
+    monkeypatch.setattr(testbench.soak, "RisingEdge", edge)
+
+
+def random_pause(seed):
+    rng = random.Random(seed)
+    while True:
+        yield int(rng.random() < 0.5)
+
+
+def test_stream_beats():
+    beats = stream_beats(sample_chunks(lambda size: range(size), size=3), frame_length=4)
+
+    assert list(itertools.islice(beats, 8)) == \
+        [(0, 0), (1, 0), (2, 0), (0, 1), (1, 0), (2, 0), (0, 0), (1, 1)]
+
+
+def test_repeat_frame():
+    assert list(itertools.islice(repeat_frame([5, 6, 7]), 5)) == [(5, 0), (6, 0), (7, 1), (5, 0), (6, 0)]
+
+
+def test_soak_beats(monkeypatch):
+    monkeypatch.setenv("SOAK_BEATS", "1e8")
+    assert soak_beats() == 100000000
+
+
+def test_soak_run():
+    dut = Fifo()
+    soak = StreamSoak(dut, dut.aclk, max_in_flight=4)
+
+    stats = asyncio.run(soak.run(
+        stimulus=stream_beats(sample_chunks(range, size=64), frame_length=16),
+        reference=lambda tdata, tlast: [(tdata, tlast)],
+        beats=1000, idle_generator=random_pause(1), backpressure_generator=random_pause(2)))
+
+    assert stats["beats"] == 1000
+    assert stats["inputs"] >= 1000
+    assert stats["cycles"] > 1000
+
+
+def test_soak_mismatch():
+    dut = Fifo(corrupt=123)
+    soak = StreamSoak(dut, dut.aclk)
+
+    with pytest.raises(AssertionError, match="at output beat 123"):
+        asyncio.run(soak.run(
+            stimulus=stream_beats(sample_chunks(range, size=64)),
+            reference=lambda tdata, tlast: [(tdata, None)],
+            beats=1000))
+
+
+def test_soak_unbounded():
+    dut = Fifo()
+    soak = StreamSoak(dut, dut.aclk, max_in_flight=4)
+
+    # a reference expecting more output than the core produces
+    with pytest.raises(AssertionError, match="in flight"):
+        asyncio.run(soak.run(
+            stimulus=stream_beats(sample_chunks(range, size=64)),
+            reference=lambda tdata, tlast: [(tdata, None)] * 8,
+            beats=1000))
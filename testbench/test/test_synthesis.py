@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import pytest
+
+from testbench import synthesis
+
+
+ROOT = synthesis.ROOT
+
+
+def path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def test_script():
+    job = synthesis.jobs(["axis_multichannel_accumulator"])[1]
+    assert job.parameters == dict(CHANNELS=4096)
+    assert path("axis_skid_buffer", "rtl", "axis_skid_buffer.sv") in job.sources
+    assert job.sources[-1] == path("axis_multichannel_accumulator", "rtl", "axis_multichannel_accumulator.sv")
+
+    name = synthesis.job_name(job)
+    assert name == "axis_multichannel_accumulator-CHANNELS4096"
+
+    script = synthesis.yosys_script(job, name)
+    assert "chparam -set CHANNELS 4096 axis_multichannel_accumulator\n" in script
+    assert "synth_xilinx -flatten -top axis_multichannel_accumulator\n" in script
+    assert f"tee -q -o {name}.ltp.log ltp t:* t:FD* %d t:$_DFF* %d " in script
+    assert script.endswith(" t:RAMB* %d\n")
+
+
+def test_resources():
+    cells = {"LUT2": 10, "LUT6": 5, "FDRE": 20, "FDSE": 1, "RAMB36E1": 2, "RAMB18E1": 1,
+             "RAM64M": 4, "DSP48E1": 1, "CARRY4": 6, "MUXF7": 3}
+    assert synthesis.resources(cells) == dict(luts=15, ffs=21, bram18=5, lutram=4, dsps=1, carry=6)
+
+    assert synthesis.resources({"$lut": 7, "$_DFFE_PP_": 3, "$_SDFF_PN0_": 2})["ffs"] == 5
+
+    log = "Longest topological path in top (length=7):\n    0: a\n"
+    assert synthesis.longest_path(log) == 7
+    assert synthesis.longest_path("") is None
+
+
+def test_compare():
+    base = {"a": dict(luts=10, ffs=4, longest_path=5), "b": dict(luts=1)}
+    report = {"a": dict(luts=12, ffs=4, longest_path=5), "c": dict(luts=2)}
+    assert synthesis.compare(base, report) == [
+        ("a", "luts", 10, 12),
+        ("b", "luts", 1, None),
+        ("c", "luts", None, 2),
+    ]
+
+
+PIPELINE = """
+module pipeline #(parameter STAGES = 1) (
+    input  wire        clk,
+    input  wire [15:0] a,
+    input  wire [15:0] b,
+    output wire [15:0] y
+);
+    wire [15:0] stage [0:STAGES];
+    assign stage[0] = a;
+
+    genvar i;
+    generate
+        for (i = 0; i < STAGES; i = i + 1) begin : stages
+            reg [15:0] q;
+            always @(posedge clk)
+                q <= (stage[i] + b) ^ {stage[i][7:0], stage[i][15:8]};
+            assign stage[i+1] = q;
+        end
+    endgenerate
+
+    assign y = stage[STAGES];
+endmodule
+"""
+
+
+@pytest.mark.skipif(shutil.which("yosys") is None, reason="yosys not found in PATH")
+@pytest.mark.parametrize("target", sorted(synthesis.TARGETS))
+def test_longest_path_stops_at_registers(tmp_path, target):
+    source = tmp_path / "pipeline.v"
+    source.write_text(PIPELINE)
+
+    def depth(stages):
+        job = synthesis.Job("pipeline", dict(STAGES=stages), target, [str(source)])
+        entry = synthesis.run_yosys(job, str(tmp_path))
+        assert entry["status"] == "OK"
+        assert entry["ffs"] >= 16 * stages
+        return entry["longest_path"]
+
+    # every stage is one adder between registers, however many there are
+    assert depth(1) > 0
+    assert depth(4) == depth(1)
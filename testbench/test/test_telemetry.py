@@ -0,0 +1,45 @@
+import json
+
+from testbench import telemetry
+
+
+def record_run(db, monkeypatch, run, times, cycles=1000):
+    monkeypatch.setenv("TELEMETRY_RUN", run)
+    for test, wall_time in times.items():
+        telemetry.record("cocotb", "axis_packetizer", test, {"DATA_WIDTH": "16", "pause_generator": None},
+            "icarus", "passed", wall_time, sim_time=10.0 * cycles, cycles=cycles, path=db)
+
+
+def test_report(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / "telemetry.sqlite")
+
+    for n in range(3):
+        record_run(db, monkeypatch, f"run{n}", {"run_test_001": 1.0, "run_test_002": 2.0})
+    record_run(db, monkeypatch, "run3", {"run_test_001": 1.05, "run_test_002": 4.0})
+
+    connection = telemetry.connect(db)
+    runs = telemetry.runs(connection)
+    assert runs == ["run0", "run1", "run2", "run3"]
+
+    slowest = telemetry.slowest(connection, "run3", 1)
+    assert slowest[0][0] == "run_test_002"
+    assert json.loads(slowest[0][1]) == {"DATA_WIDTH": "16", "pause_generator": None}
+
+    found = telemetry.regressions(connection, "run3", runs[:3], 0.25)
+    assert [(test, ratio) for test, _, _, _, ratio in found] == [("run_test_002", 2.0)]
+
+    trends = telemetry.trends(connection, runs)
+    assert trends[0][0] == "axis_packetizer"
+    assert trends[0][1] == 2000 / 3.0
+    assert trends[0][4] == 2000 / 5.05
+
+    connection.close()
+
+    assert telemetry.main(["--db", db, "--runs", "3"]) == 0
+    output = capsys.readouterr().out
+    assert "run run3" in output
+    assert "run_test_002" in output
+
+
+def test_report_empty(tmp_path):
+    assert telemetry.main(["--db", str(tmp_path / "missing.sqlite")]) == 1
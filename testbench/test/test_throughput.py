@@ -0,0 +1,31 @@
+from testbench.throughput import Throughput
+
+from .conftest import Signal, Value
+
+
+class Bus:
+    def __init__(self):
+        self.m_axis_tvalid = Signal()
+        self.m_axis_tready = Signal()
+
+
+def run(monitor, bus, valid, ready):
+    for v, r in zip(valid, ready):
+        bus.m_axis_tvalid.value = Value(v)
+        bus.m_axis_tready.value = Value(r)
+        monitor.sample()
+
+
+def test_throughput():
+    bus = Bus()
+    monitor = Throughput(bus, "m_axis", None)
+
+    run(monitor, bus, [0, 0, 1, 1, 1, 1, 0], [1, 1, 1, 1, 1, 1, 1])
+    assert monitor.beats == 4
+    assert monitor.beats_per_clock == 1.0
+
+    # a stall and an idle cycle between the handshakes
+    run(monitor, bus, [1, 1, 0, 1], [0, 1, 1, 1])
+    assert monitor.beats == 6
+    assert monitor.valid_cycles == 7
+    assert monitor.beats_per_clock == 6 / 9
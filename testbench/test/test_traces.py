@@ -0,0 +1,84 @@
+
+import numpy as np
+import pytest
+
+from testbench.traces import cached_reference, open_trace, trace_chunks, trace_path
+
+
+@pytest.fixture
+def samples():
+    return np.arange(-5000, 5000, dtype=np.int16)
+
+
+def test_open_trace(tmp_path, samples):
+    samples.tofile(tmp_path / "capture.bin")
+    np.save(tmp_path / "capture.npy", samples)
+    np.savez(tmp_path / "capture.npz", other=np.zeros(3), adc=samples)
+
+    for name, key in [("capture.bin", None), ("capture.npy", None), ("capture.npz", "adc")]:
+        trace = open_trace(str(tmp_path / name), key)
+        assert isinstance(trace, np.memmap)
+        assert np.all(trace == samples)
+
+    assert np.all(open_trace(str(tmp_path / "capture.npz")) == 0)
+
+
+def test_open_trace_compressed(tmp_path, samples):
+    np.savez_compressed(tmp_path / "capture.npz", adc=samples)
+
+    with pytest.raises(ValueError):
+        open_trace(str(tmp_path / "capture.npz"))
+
+
+def test_trace_chunks(samples):
+    chunks = list(trace_chunks(samples, size=4096, width=16, start=10))
+
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 1798]
+    assert np.all(np.concatenate(chunks) == samples[10:].astype(np.int64) % 2**16)
+
+
+def test_trace_path(monkeypatch):
+    monkeypatch.delenv("TRACE", raising=False)
+    assert trace_path() is None
+
+    monkeypatch.setenv("TRACE", "capture.npz:adc")
+    assert trace_path() == ("capture.npz", "adc")
+
+
+def test_cached_reference(tmp_path, samples):
+    path = str(tmp_path / "capture.npy")
+    np.save(path, samples)
+
+    calls = []
+    def compute():
+        calls.append(1)
+        for chunk in trace_chunks(samples, size=4096):
+            yield dict(tdata=chunk * 2, tlast=chunk % 8 == 7)
+
+    first = cached_reference(path, "core", dict(DATA_WIDTH=16), len(samples), compute)
+    second = cached_reference(path, "core", dict(DATA_WIDTH=16), len(samples), compute)
+    assert len(calls) == 1
+
+    # written and returned memory-mapped, never as whole arrays
+    assert isinstance(first["tdata"], np.memmap)
+    assert np.all(first["tdata"] == samples.astype(np.int64) * 2)
+    assert np.all(second["tlast"] == (samples % 8 == 7))
+
+    # other parameters are cached separately
+    cached_reference(path, "core", dict(DATA_WIDTH=24), len(samples), compute)
+    assert len(calls) == 2
+    assert len(list((tmp_path / "capture.npy.expected").iterdir())) == 2
+
+
+def test_cached_reference_length(tmp_path, samples):
+    path = str(tmp_path / "capture.npy")
+    np.save(path, samples)
+
+    def compute():
+        yield dict(tdata=samples[:100])
+
+    with pytest.raises(ValueError):
+        cached_reference(path, "core", {}, len(samples), compute)
+
+    # nothing is cached for a failed reference
+    assert list((tmp_path / "capture.npy.expected").iterdir()) == []
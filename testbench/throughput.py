@@ -0,0 +1,49 @@
+"""Handshake counting for throughput checks."""
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+
+class Throughput:
+    """Counts the handshakes of a VALID/READY pair.
+
+    `beats_per_clock` is measured from the first to the last handshake, so
+    it is 1 for an interface that never stalls once started.
+    `valid_cycles` counts the cycles with VALID, with or without READY.
+    """
+
+    def __init__(self, dut, prefix, clock, valid="tvalid", ready="tready"):
+        self.valid = getattr(dut, f"{prefix}_{valid}")
+        self.ready = getattr(dut, f"{prefix}_{ready}")
+
+        self.beats = 0
+        self.valid_cycles = 0
+        self.cycle = 0
+        self.first = None
+        self.last = None
+
+        cocotb.fork(self._run(clock))
+
+    @property
+    def beats_per_clock(self):
+        if not self.beats:
+            return 0.0
+        return self.beats / (self.last - self.first + 1)
+
+    def sample(self):
+        valid = self.valid.value.is_resolvable and bool(self.valid.value)
+        ready = self.ready.value.is_resolvable and bool(self.ready.value)
+
+        if valid:
+            self.valid_cycles += 1
+        if valid and ready:
+            self.beats += 1
+            if self.first is None:
+                self.first = self.cycle
+            self.last = self.cycle
+        self.cycle += 1
+
+    async def _run(self, clock):
+        while True:
+            await RisingEdge(clock)
+            self.sample()
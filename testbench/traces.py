@@ -0,0 +1,164 @@
+"""Replay of recorded sample traces.
+
+Captures are memory-mapped, never read in full: raw little-endian int16
+files (any extension other than .npy/.npz), .npy arrays and uncompressed
+.npz archives (np.savez, not np.savez_compressed). The trace used by the
+replay tests is selected with TRACE=<path>[:<array>], the array naming the
+member of an .npz archive.
+
+Expected outputs of a core for a trace are written chunk by chunk next to
+it, in <trace>.expected/, keyed by the core, its parameters and the source
+of the models package, so repeated regressions on a trace skip the
+reference.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from .telemetry import describe
+
+
+MODELS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+
+def trace_path():
+    """Trace file and .npz array selected with TRACE, or None."""
+    trace = os.environ.get("TRACE")
+    if not trace:
+        return None
+
+    path, _, key = trace.partition(":")
+    return path, key or None
+
+
+def _npz_member(path, key):
+    with zipfile.ZipFile(path) as archive:
+        names = [name[:-len(".npy")] for name in archive.namelist() if name.endswith(".npy")]
+        key = key or names[0]
+        if key not in names:
+            raise KeyError(f"no array {key} in {path}, only {', '.join(names)}")
+
+        info = archive.getinfo(f"{key}.npy")
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"array {key} of {path} is compressed and cannot be memory-mapped")
+
+    with open(path, "rb") as f:
+        # skip the local file header to the .npy data
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def open_trace(path, key=None, dtype="<i2"):
+    """Memory-mapped samples of a capture file."""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".npy":
+        return np.load(path, mmap_mode="r")
+    elif extension == ".npz":
+        return _npz_member(path, key)
+    else:
+        return np.memmap(path, dtype=dtype, mode="r")
+
+
+def trace_chunks(trace, size=65536, width=None, start=0, stop=None):
+    """Chunks of samples of a trace, as `width` bit TDATA if given.
+
+    Only the chunk being read is paged in.
+    """
+    stop = len(trace) if stop is None else min(stop, len(trace))
+
+    for n in range(start, stop, size):
+        chunk = np.asarray(trace[n:min(n + size, stop)], dtype=np.int64)
+        yield chunk & ((1 << width) - 1) if width else chunk
+
+
+def _models_digest():
+    digest = hashlib.sha256()
+    for directory, _, files in sorted(os.walk(MODELS)):
+        for name in sorted(files):
+            if name.endswith(".py"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _load_reference(directory):
+    return {name[:-len(".npy")]: np.load(os.path.join(directory, name), mmap_mode="r")
+            for name in sorted(os.listdir(directory)) if name.endswith(".npy")}
+
+
+def _write_reference(directory, chunks, length):
+    """Write dicts of array chunks, `length` rows in all, to .npy files."""
+    arrays = {}
+    row = 0
+    for chunk in chunks:
+        size = None
+        for name, values in chunk.items():
+            values = np.asarray(values)
+            if name not in arrays:
+                arrays[name] = np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"),
+                    mode="w+", dtype=values.dtype, shape=(length,) + values.shape[1:])
+            if size is not None and len(values) != size:
+                raise ValueError(f"chunk of {name} has {len(values)} rows, not {size}")
+            size = len(values)
+            arrays[name][row:row+size] = values
+        row += size or 0
+
+    if row != length:
+        raise ValueError(f"reference has {row} rows, not {length}")
+
+    for array in arrays.values():
+        array.flush()
+
+
+def cached_reference(path, core, parameters, length, compute):
+    """Expected output of `core` for the trace at `path`, computed once.
+
+    `compute()` yields dicts of array chunks, `length` rows in all, which
+    are written one by one to memory-mapped .npy files in <path>.expected/
+    under a key of the core, its `parameters` and the models source, so the
+    whole output is never held in memory. The arrays are returned
+    memory-mapped, by name.
+    """
+    key = json.dumps([core, {k: describe(v) for k, v in parameters.items()}, _models_digest()],
+                     sort_keys=True)
+    directory = f"{path}.expected"
+    entry = os.path.join(directory, f"{core}-{hashlib.sha256(key.encode()).hexdigest()[:16]}")
+
+    # a cache older than the trace is stale
+    if os.path.isdir(entry):
+        if os.path.getmtime(entry) >= os.path.getmtime(path):
+            return _load_reference(entry)
+        shutil.rmtree(entry, ignore_errors=True)
+
+    os.makedirs(directory, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=directory)
+    try:
+        _write_reference(temporary, compute(), length)
+        os.rename(temporary, entry)
+    except OSError:
+        # a concurrent regression wrote the same entry first
+        if not os.path.isdir(entry):
+            raise
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+    return _load_reference(entry)